@@ -0,0 +1,42 @@
+"""add hot query indexes
+
+Revision ID: cf49bbeb7b4c
+Revises: cf88c5a65698
+Create Date: 2026-10-18 12:27:37.540433
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "cf49bbeb7b4c"
+down_revision: Union[str, None] = "cf88c5a65698"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_focus_profile_id_due_date", "focus", ["profile_id", "due_date"])
+    op.create_index("ix_focus_profile_id_state", "focus", ["profile_id", "state"])
+    op.create_index("ix_messages_chat_id_created_at", "messages", ["chat_id", "created_at"])
+    op.create_index("ix_messages_profile_id_created_at", "messages", ["profile_id", "created_at"])
+    op.create_index(
+        "ix_chats_profile_id_created_at_active",
+        "chats",
+        ["profile_id", "created_at"],
+        postgresql_where=sa.text("state = 'ACTIVE'"),
+    )
+    op.create_index(op.f("ix_profiles_user_id"), "profiles", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_profiles_user_id"), table_name="profiles")
+    op.drop_index("ix_chats_profile_id_created_at_active", table_name="chats")
+    op.drop_index("ix_messages_profile_id_created_at", table_name="messages")
+    op.drop_index("ix_messages_chat_id_created_at", table_name="messages")
+    op.drop_index("ix_focus_profile_id_state", table_name="focus")
+    op.drop_index("ix_focus_profile_id_due_date", table_name="focus")
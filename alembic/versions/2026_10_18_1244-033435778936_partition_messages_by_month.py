@@ -0,0 +1,122 @@
+"""partition messages by month
+
+Revision ID: 033435778936
+Revises: cf49bbeb7b4c
+Create Date: 2026-10-18 12:44:43.097020
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "033435778936"
+down_revision: Union[str, None] = "cf49bbeb7b4c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keep in step with `MESSAGES_PARTITION_MONTHS_AHEAD`, the scheduler takes over from here
+MONTHS_AHEAD = 3
+
+MESSAGE_COLUMNS = "id, message, role, chat_id, profile_id, created_at, focus_ids"
+
+
+def create_messages_table(*constraints, **kwargs):
+    op.create_table(
+        "messages",
+        sa.Column("id", sa.UUID(), server_default=sa.text("uuid_generate_v4()"), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("chat_id", sa.UUID(), nullable=False),
+        sa.Column("profile_id", sa.UUID(), nullable=False),
+        # The partition key, which cannot be null
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("focus_ids", sa.ARRAY(sa.Integer()), nullable=True),
+        # Named explicitly, as the old table still holds the default names while the new one is created
+        sa.ForeignKeyConstraint(["chat_id"], ["chats.id"], name="messages_chat_id_fkey"),
+        sa.ForeignKeyConstraint(["profile_id"], ["profiles.id"], name="messages_profile_id_fkey"),
+        *constraints,
+        **kwargs,
+    )
+
+
+def upgrade() -> None:
+    op.rename_table("messages", "messages_unpartitioned")
+    op.execute("ALTER INDEX messages_pkey RENAME TO messages_unpartitioned_pkey")
+    op.drop_index("ix_messages_id", table_name="messages_unpartitioned")
+    op.drop_index("ix_messages_chat_id_created_at", table_name="messages_unpartitioned")
+    op.drop_index("ix_messages_profile_id_created_at", table_name="messages_unpartitioned")
+
+    # Messages without a date take the date of their chat, so that every one has a partition to go to
+    op.execute(
+        """
+        UPDATE messages_unpartitioned SET created_at = coalesce(
+            (SELECT chats.created_at FROM chats WHERE chats.id = messages_unpartitioned.chat_id),
+            now() AT TIME ZONE 'utc'
+        )
+        WHERE created_at IS NULL
+        """
+    )
+
+    # The partition key has to be part of the primary key
+    create_messages_table(
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+
+    # One partition per month from the oldest message through the months the scheduler keeps ready
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce(
+                        (SELECT min(created_at) FROM messages_unpartitioned),
+                        now() AT TIME ZONE 'utc'
+                    )),
+                    date_trunc('month', now() AT TIME ZONE 'utc') + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF messages FOR VALUES FROM (%L) TO (%L)',
+                    'messages_' || to_char(month, 'YYYY_MM'),
+                    month,
+                    month + interval '1 month'
+                );
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+
+    op.execute(
+        f"INSERT INTO messages ({MESSAGE_COLUMNS}) SELECT {MESSAGE_COLUMNS} FROM messages_unpartitioned"
+    )
+    op.drop_table("messages_unpartitioned")
+
+    # Created after the copy, which is faster than maintaining them row by row
+    op.create_index("ix_messages_chat_id_created_at", "messages", ["chat_id", "created_at"])
+    op.create_index("ix_messages_profile_id_created_at", "messages", ["profile_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.rename_table("messages", "messages_partitioned")
+    op.execute("ALTER INDEX messages_pkey RENAME TO messages_partitioned_pkey")
+    op.drop_index("ix_messages_chat_id_created_at", table_name="messages_partitioned")
+    op.drop_index("ix_messages_profile_id_created_at", table_name="messages_partitioned")
+
+    create_messages_table(sa.PrimaryKeyConstraint("id"))
+    op.execute(f"INSERT INTO messages ({MESSAGE_COLUMNS}) SELECT {MESSAGE_COLUMNS} FROM messages_partitioned")
+    # Drops the attached partitions too. Partitions detached by retention are left as plain tables.
+    op.drop_table("messages_partitioned")
+
+    op.create_index(op.f("ix_messages_id"), "messages", ["id"], unique=True)
+    op.create_index("ix_messages_chat_id_created_at", "messages", ["chat_id", "created_at"])
+    op.create_index("ix_messages_profile_id_created_at", "messages", ["profile_id", "created_at"])
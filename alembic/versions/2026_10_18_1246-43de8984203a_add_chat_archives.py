@@ -0,0 +1,37 @@
+"""add chat archives
+
+Revision ID: 43de8984203a
+Revises: 033435778936
+Create Date: 2026-10-18 12:46:51.212618
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "43de8984203a"
+down_revision: Union[str, None] = "033435778936"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("chats", sa.Column("ended_at", sa.DateTime(), nullable=True))
+    op.create_table(
+        "chat_archives",
+        sa.Column("chat_id", sa.UUID(), nullable=False),
+        sa.Column("message_count", sa.Integer(), nullable=False),
+        sa.Column("messages", sa.LargeBinary(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["chat_id"], ["chats.id"]),
+        sa.PrimaryKeyConstraint("chat_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chat_archives")
+    op.drop_column("chats", "ended_at")
@@ -0,0 +1,41 @@
+"""add profile agendas
+
+Revision ID: a8d621a9a214
+Revises: 43de8984203a
+Create Date: 2026-10-18 12:50:12.418322
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d621a9a214"
+down_revision: Union[str, None] = "43de8984203a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Agendas are built on the profile's first read or focus write, so there is nothing to backfill
+    op.create_table(
+        "profile_agendas",
+        sa.Column("profile_id", sa.UUID(), nullable=False),
+        sa.Column("timezone", sa.String(), nullable=False),
+        sa.Column("agenda_date", sa.Date(), nullable=False),
+        sa.Column("due_today", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("due_this_week", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("overdue", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("overdue_count", sa.Integer(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["profile_id"], ["profiles.id"]),
+        sa.PrimaryKeyConstraint("profile_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("profile_agendas")
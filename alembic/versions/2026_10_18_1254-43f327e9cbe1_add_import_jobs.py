@@ -0,0 +1,41 @@
+"""add import jobs
+
+Revision ID: 43f327e9cbe1
+Revises: a8d621a9a214
+Create Date: 2026-10-18 12:54:25.926346
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "43f327e9cbe1"
+down_revision: Union[str, None] = "a8d621a9a214"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("profile_id", sa.UUID(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("embedded", sa.Integer(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["profile_id"], ["profiles.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_import_jobs_profile_id"), "import_jobs", ["profile_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_import_jobs_profile_id"), table_name="import_jobs")
+    op.drop_table("import_jobs")
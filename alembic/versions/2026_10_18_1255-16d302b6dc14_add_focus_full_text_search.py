@@ -0,0 +1,39 @@
+"""add focus full text search
+
+Revision ID: 16d302b6dc14
+Revises: 43f327e9cbe1
+Create Date: 2026-10-18 12:55:34.910446
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "16d302b6dc14"
+down_revision: Union[str, None] = "43f327e9cbe1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A stored generated column, so adding it rewrites `focus` once
+    op.add_column(
+        "focus",
+        sa.Column(
+            "text_search",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', text)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_focus_text_search", "focus", ["text_search"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_focus_text_search", table_name="focus", postgresql_using="gin")
+    op.drop_column("focus", "text_search")
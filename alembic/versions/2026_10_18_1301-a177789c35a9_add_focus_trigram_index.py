@@ -0,0 +1,34 @@
+"""add focus trigram index
+
+Revision ID: a177789c35a9
+Revises: 16d302b6dc14
+Create Date: 2026-10-18 13:01:28.946056
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a177789c35a9"
+down_revision: Union[str, None] = "16d302b6dc14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_focus_text_trgm",
+        "focus",
+        ["text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_focus_text_trgm", table_name="focus", postgresql_using="gin")
+    op.execute("DROP EXTENSION IF EXISTS pg_trgm")
@@ -0,0 +1,71 @@
+"""Tombstone deleted focus items
+
+Revision ID: 5edbe68d0602
+Revises: a177789c35a9
+Create Date: 2026-10-18 13:03:49.315402
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5edbe68d0602"
+down_revision: Union[str, None] = "a177789c35a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+LIVE = sa.text("deleted_at IS NULL")
+READ_INDEXES = [
+    "ix_focus_profile_id_due_date",
+    "ix_focus_profile_id_state",
+    "ix_focus_text_search",
+    "ix_focus_text_trgm",
+]
+
+
+def _create_read_indexes(where) -> None:
+    op.create_index(
+        "ix_focus_profile_id_due_date", "focus", ["profile_id", "due_date"], postgresql_where=where
+    )
+    op.create_index("ix_focus_profile_id_state", "focus", ["profile_id", "state"], postgresql_where=where)
+    op.create_index(
+        "ix_focus_text_search", "focus", ["text_search"], postgresql_using="gin", postgresql_where=where
+    )
+    op.create_index(
+        "ix_focus_text_trgm",
+        "focus",
+        ["text"],
+        postgresql_using="gin",
+        postgresql_ops={"text": "gin_trgm_ops"},
+        postgresql_where=where,
+    )
+
+
+def _drop_read_indexes() -> None:
+    for name in READ_INDEXES:
+        op.drop_index(name, table_name="focus")
+
+
+def upgrade() -> None:
+    op.add_column("focus", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    # Items already marked deleted become tombstones, purged once the grace period has passed
+    op.execute("UPDATE focus SET deleted_at = updated_at WHERE state = 'deleted'")
+
+    _drop_read_indexes()
+    _create_read_indexes(LIVE)
+    op.create_index(
+        "ix_focus_deleted_at", "focus", ["deleted_at"], postgresql_where=sa.text("deleted_at IS NOT NULL")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_focus_deleted_at", table_name="focus")
+    _drop_read_indexes()
+    _create_read_indexes(None)
+
+    op.drop_column("focus", "deleted_at")
@@ -0,0 +1,42 @@
+"""Store focus due dates as timestamptz
+
+Revision ID: 17c428b22cc1
+Revises: 5edbe68d0602
+Create Date: 2026-10-18 13:09:52.942575
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "17c428b22cc1"
+down_revision: Union[str, None] = "5edbe68d0602"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing due dates are naive UTC. Changing the type rewrites `focus` and rebuilds its indexes.
+    op.alter_column(
+        "focus",
+        "due_date",
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        existing_nullable=True,
+        postgresql_using="due_date AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "focus",
+        "due_date",
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=True,
+        postgresql_using="due_date AT TIME ZONE 'UTC'",
+    )
@@ -0,0 +1,113 @@
+"""Store focus and chat enums natively
+
+Revision ID: b57e0f161225
+Revises: 17c428b22cc1
+Create Date: 2026-10-18 13:17:13.592431
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b57e0f161225"
+down_revision: Union[str, None] = "17c428b22cc1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Table, column, enum type, values, and the value that rows holding anything else are set to
+COLUMNS = [
+    ("focus", "state", "focusstate", ["backlog", "active", "completed", "deleted"], "backlog"),
+    (
+        "focus",
+        "category",
+        "category",
+        [
+            "career",
+            "personal_development",
+            "physical_health",
+            "mental_health",
+            "finance",
+            "education",
+            "relationships",
+            "home",
+            "shopping",
+            "interests",
+            "adventure",
+            "technology",
+            "spirituality",
+            "productivity",
+            "creativity",
+            "culture",
+            "legal",
+            "events",
+            "projects",
+            "general",
+        ],
+        "general",
+    ),
+    ("focus", "type", "itemtype", ["event", "task", "goal", "reminder"], "task"),
+    ("focus", "task_size", "tasksize", ["small", "medium", "large", "epic"], "medium"),
+    ("focus", "sentiment", "sentiment", ["positive", "neutral", "negative"], "neutral"),
+    # Not the default, so that no chat becomes the profile's active one
+    ("chats", "state", "chatstate", ["ACTIVE", "INACTIVE", "ENDED", "ARCHIVED"], "ENDED"),
+    ("messages", "role", "messagerole", ["system", "assistant", "user"], "user"),
+]
+
+ACTIVE_CHATS_INDEX = "ix_chats_profile_id_created_at_active"
+
+
+def upgrade() -> None:
+    # Left over from when chat states were an enum before, without the ARCHIVED state
+    op.alter_column("chats", "state", server_default=None)
+    op.execute("DROP TYPE chatstate")
+    # Its predicate compares the state as text, so it is rebuilt against the enum
+    op.drop_index(ACTIVE_CHATS_INDEX, table_name="chats")
+
+    for table, column, type_name, values, fallback in COLUMNS:
+        postgresql.ENUM(*values, name=type_name).create(op.get_bind())
+        # The models handed any string through, so values outside the enum are matched to one of its
+        # values ignoring case, or else fall back, as the cast would fail on them
+        op.execute(
+            sa.text(
+                f"""
+                UPDATE {table}
+                SET {column} = coalesce(
+                    (SELECT value FROM unnest(CAST(:values AS text[])) AS value WHERE lower(value) = lower({column})),
+                    :fallback
+                )
+                WHERE {column} <> ALL(:values)
+                """
+            ).bindparams(fallback=fallback, values=values)
+        )
+        # Rewrites the table, and rebuilds the indexes on the column
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}")
+
+    op.create_index(
+        ACTIVE_CHATS_INDEX,
+        "chats",
+        ["profile_id", "created_at"],
+        postgresql_where=sa.text("state = 'ACTIVE'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(ACTIVE_CHATS_INDEX, table_name="chats")
+
+    for table, column, type_name, _, _ in COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar USING {column}::text")
+        op.execute(f"DROP TYPE {type_name}")
+
+    op.create_index(
+        ACTIVE_CHATS_INDEX,
+        "chats",
+        ["profile_id", "created_at"],
+        postgresql_where=sa.text("state = 'ACTIVE'"),
+    )
+    postgresql.ENUM("ACTIVE", "INACTIVE", "ENDED", name="chatstate").create(op.get_bind())
+    op.alter_column("chats", "state", server_default=sa.text("'ACTIVE'::chatstate"))
@@ -0,0 +1,51 @@
+"""Drop indexes duplicating primary keys
+
+Revision ID: 0efbb80760c5
+Revises: b57e0f161225
+Create Date: 2026-10-18 13:18:49.586766
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.data.online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "0efbb80760c5"
+down_revision: Union[str, None] = "b57e0f161225"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Tables whose `id` primary key was also declared `index=True, unique=True`, giving a second unique
+# index on the same column that every insert had to maintain
+TABLES = [
+    "actions",
+    "chats",
+    "context",
+    "entities",
+    "entity_memories",
+    "memories",
+    "notes",
+    "profiles",
+    "queues",
+    "refresh_tokens",
+    "relationships",
+    "system_state",
+    "tags",
+    "users",
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            drop_index_concurrently(op.get_bind(), f"ix_{table}_id")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            create_index_concurrently(op.get_bind(), f"ix_{table}_id", table, "id", unique=True)
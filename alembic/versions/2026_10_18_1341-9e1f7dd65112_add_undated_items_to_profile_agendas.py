@@ -0,0 +1,36 @@
+"""add undated items to profile agendas
+
+Revision ID: 9e1f7dd65112
+Revises: 0efbb80760c5
+Create Date: 2026-10-18 13:41:45.919885
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e1f7dd65112"
+down_revision: Union[str, None] = "0efbb80760c5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left offline on purpose: `profile_agendas` holds one small row per profile and is emptied first, so
+    # the NOT NULL columns are added to an empty table and the lock is only held for a moment.
+    # Agendas are rebuilt on the profile's next read or focus write, with their undated items this time
+    op.execute("DELETE FROM profile_agendas")
+    op.add_column(
+        "profile_agendas", sa.Column("undated", postgresql.JSONB(astext_type=sa.Text()), nullable=False)
+    )
+    op.add_column("profile_agendas", sa.Column("undated_count", sa.Integer(), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("profile_agendas", "undated_count")
+    op.drop_column("profile_agendas", "undated")
@@ -0,0 +1,66 @@
+"""link focus items to their import
+
+Revision ID: 636feab6ca28
+Revises: 9e1f7dd65112
+Create Date: 2026-10-18 13:59:17.138575
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+from src.data.online_migrations import backfill, create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "636feab6ca28"
+down_revision: Union[str, None] = "9e1f7dd65112"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+IMPORTED = "import_job_id IS NOT NULL"
+
+# The latest of the profile's unfinished imports created before the focus item being updated
+LATEST_UNFINISHED_IMPORT = """
+    SELECT import_jobs.id FROM import_jobs
+    WHERE import_jobs.profile_id = focus.profile_id
+        AND import_jobs.created_at <= focus.created_at
+        AND import_jobs.state <> 'completed'
+    ORDER BY import_jobs.created_at DESC
+    LIMIT 1
+"""
+
+
+def upgrade() -> None:
+    op.add_column("focus", sa.Column("import_job_id", sa.UUID(), nullable=True))
+    # Checked against the existing rows after the backfill, which does not block writes to `focus`
+    op.execute(
+        "ALTER TABLE focus ADD CONSTRAINT focus_import_job_id_fkey "
+        "FOREIGN KEY (import_job_id) REFERENCES import_jobs (id) NOT VALID"
+    )
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        # The items of unfinished imports still need resuming, so they are matched to the latest of the
+        # profile's unfinished imports created before them, as resuming did until now
+        backfill(
+            connection,
+            "focus",
+            f"import_job_id = ({LATEST_UNFINISHED_IMPORT})",
+            where=f"import_job_id IS NULL AND NOT in_vector_store AND EXISTS ({LATEST_UNFINISHED_IMPORT})",
+        )
+        connection.execute(sa.text("ALTER TABLE focus VALIDATE CONSTRAINT focus_import_job_id_fkey"))
+        create_index_concurrently(
+            connection, "ix_focus_import_job_id", "focus", "import_job_id", where=IMPORTED
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_index_concurrently(op.get_bind(), "ix_focus_import_job_id")
+
+    op.drop_constraint("focus_import_job_id_fkey", "focus", type_="foreignkey")
+    op.drop_column("focus", "import_job_id")
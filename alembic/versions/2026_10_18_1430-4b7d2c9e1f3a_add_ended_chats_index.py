@@ -0,0 +1,31 @@
+"""add ended chats index
+
+Revision ID: 4b7d2c9e1f3a
+Revises: 636feab6ca28
+Create Date: 2026-10-18 14:30:12.482913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.data.online_migrations import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7d2c9e1f3a"
+down_revision: Union[str, None] = "636feab6ca28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        create_index_concurrently(
+            op.get_bind(), "ix_chats_ended_at_ended", "chats", "ended_at, id", where="state = 'ENDED'"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        drop_index_concurrently(op.get_bind(), "ix_chats_ended_at_ended")
@@ -0,0 +1,118 @@
+"""
+Measures `create_focus_items` latency for batches of 1, 10 and 100 tasks.
+
+The vector store is stubbed out so that only the database path is timed. Statements are counted
+per call, with those of the agenda refresh that follows every write also shown on their own.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.create_focus_items [--iterations 50]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from src.data.agenda_repository import refresh_profile_agenda  # noqa: E402
+from src.data.db import SessionLocal  # noqa: E402
+from src.data.focus_repository import create_focus_items  # noqa: E402
+from src.data.models.agenda import ProfileAgenda  # noqa: E402
+from src.data.models.focus import Focus, FocusState, UserIntentTask  # noqa: E402
+from src.data.models.user import Profile, User  # noqa: E402
+from src.data.query_stats import QueryStats, track_queries  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+BATCH_SIZES = (1, 10, 100)
+
+
+def make_tasks(count: int) -> list[UserIntentTask]:
+    return [
+        UserIntentTask(
+            id=str(i),
+            category="career",
+            priority=3,
+            state=FocusState.backlog,
+            location=None,
+            keywords=["benchmark", f"task {i}"],
+            sentiment="neutral",
+            task_size="small",
+            text=f"Benchmark task {i}",
+            type="task",
+        )
+        for i in range(count)
+    ]
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    logger.logger.setLevel(logging.WARNING)
+
+    vector_store = MagicMock()
+    vector_store.add_documents.side_effect = lambda documents, ids: ids
+
+    session = SessionLocal()
+    user = User(id=uuid.uuid4(), email=f"benchmark-{uuid.uuid4()}@example.com", provider="benchmark")
+    profile = Profile(id=uuid.uuid4(), user_id=user.id, provider="benchmark")
+    session.add_all([user, profile])
+    session.commit()
+    user_id, profile_id = user.id, profile.id
+    # The benchmark tasks have no due date, so every call rebuilds the agenda once it exists
+    refresh_profile_agenda(session, profile_id)
+    session.commit()
+
+    # Tracked on their own, which takes them out of the call's count
+    agenda_stats = QueryStats()
+
+    def tracked_refresh_profile_agenda(*args, **kwargs):
+        with track_queries() as stats:
+            agenda = refresh_profile_agenda(*args, **kwargs)
+        agenda_stats.count = stats.count
+        return agenda
+
+    try:
+        print(f"{'tasks':>6} {'p50 ms':>9} {'p95 ms':>9} {'queries':>8} {'agenda':>7}")
+        with (
+            patch("src.data.focus_repository.chroma_service.vector_store", vector_store),
+            patch("src.data.agenda_repository.refresh_profile_agenda", tracked_refresh_profile_agenda),
+        ):
+            for batch_size in BATCH_SIZES:
+                tasks = make_tasks(batch_size)
+                durations = []
+                for _ in range(args.iterations):
+                    agenda_stats.count = 0
+                    with track_queries() as stats:
+                        start = time.perf_counter()
+                        create_focus_items(focus_items=tasks, profile_id=profile_id, session=session)
+                        durations.append((time.perf_counter() - start) * 1000)
+
+                print(
+                    f"{batch_size:>6} {statistics.median(durations):>9.2f} "
+                    f"{percentile(durations, 0.95):>9.2f} {stats.count + agenda_stats.count:>8} "
+                    f"{agenda_stats.count:>7}"
+                )
+    finally:
+        session.rollback()
+        session.query(Focus).filter(Focus.profile_id == profile_id).delete()
+        session.query(ProfileAgenda).filter(ProfileAgenda.profile_id == profile_id).delete()
+        session.query(Profile).filter(Profile.id == profile_id).delete()
+        session.query(User).filter(User.id == user_id).delete()
+        session.commit()
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measures `GET /user/export` on a synthetic profile with a million messages, streaming the export
+through server-side cursors, and compares its peak memory with loading the same messages at once.
+
+The process' peak RSS only ever grows, so the streamed export runs first and each line reports how
+much the peak grew during that run.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.export_profile [--messages 1000000]
+"""
+
+import argparse
+import asyncio
+import logging
+import resource
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import select, text  # noqa: E402
+
+from src.data.db import AsyncSessionLocal, SessionLocal, async_engine  # noqa: E402
+from src.data.export_repository import stream_profile_export  # noqa: E402
+from src.data.models.chat import Chat, ChatState, Message  # noqa: E402
+from src.data.models.user import Profile, User  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+
+def peak_rss_mb() -> float:
+    # Kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def seed_profile(message_count: int) -> tuple[uuid.UUID, uuid.UUID]:
+    session = SessionLocal()
+    try:
+        user = User(id=uuid.uuid4(), email=f"benchmark-{uuid.uuid4()}@example.com", provider="benchmark")
+        profile = Profile(id=uuid.uuid4(), user_id=user.id, provider="benchmark")
+        chat = Chat(profile_id=profile.id, title="Benchmark", state=ChatState.ENDED.value)
+        session.add_all([user, profile])
+        session.flush()
+        session.add(chat)
+        session.flush()
+        # A millisecond apart from the start of the month, which keeps them all in one partition
+        session.execute(
+            text(
+                "INSERT INTO messages (id, message, role, chat_id, profile_id, created_at) "
+                "SELECT uuid_generate_v4(), 'Benchmark message ' || i, 'user', :chat_id, :profile_id, "
+                "date_trunc('month', now() AT TIME ZONE 'utc') + i * interval '1 millisecond' "
+                "FROM generate_series(1, :count) AS i"
+            ),
+            {"chat_id": chat.id, "profile_id": profile.id, "count": message_count},
+        )
+        session.commit()
+        return user.id, profile.id
+    finally:
+        session.close()
+
+
+def delete_profile(user_id: uuid.UUID, profile_id: uuid.UUID):
+    session = SessionLocal()
+    try:
+        session.query(Message).filter(Message.profile_id == profile_id).delete()
+        session.query(Chat).filter(Chat.profile_id == profile_id).delete()
+        session.query(Profile).filter(Profile.id == profile_id).delete()
+        session.query(User).filter(User.id == user_id).delete()
+        session.commit()
+    finally:
+        session.close()
+
+
+async def export_streamed(profile_id: uuid.UUID) -> tuple[int, int]:
+    lines = size = 0
+    async with AsyncSessionLocal() as session:
+        async for chunk in stream_profile_export(session, profile_id):
+            lines += chunk.count("\n")
+            size += len(chunk)
+
+    return lines, size
+
+
+async def export_all_at_once(profile_id: uuid.UUID) -> tuple[int, int]:
+    async with AsyncSessionLocal() as session:
+        messages = (await session.scalars(select(Message).where(Message.profile_id == profile_id))).all()
+        return len(messages), 0
+
+
+async def run(profile_id: uuid.UUID):
+    print(f"{'export':<14} {'seconds':>8} {'lines':>9} {'MB out':>8} {'peak RSS +MB':>13}")
+    for name, export in [("streamed", export_streamed), ("all at once", export_all_at_once)]:
+        rss = peak_rss_mb()
+        start = time.perf_counter()
+        lines, size = await export(profile_id)
+        duration = time.perf_counter() - start
+        print(f"{name:<14} {duration:>8.2f} {lines:>9} {size / 1024**2:>8.1f} {peak_rss_mb() - rss:>13.1f}")
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    args = parser.parse_args()
+    logger.logger.setLevel(logging.WARNING)
+
+    user_id, profile_id = seed_profile(args.messages)
+    try:
+        asyncio.run(run(profile_id))
+    finally:
+        delete_profile(user_id, profile_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures the per-call Python overhead of the per-request lookup queries, comparing statements built
+on every call (as they were) with the prebuilt statements they now use.
+
+Both forms send identical SQL, so any difference in the round trip is Python time spent building
+the statement and generating its cache key.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.lookup_statements [--iterations 2000]
+"""
+
+import argparse
+import logging
+import timeit
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+
+from src.data import chat_repository  # noqa: E402
+from src.data.db import SessionLocal  # noqa: E402
+from src.data.models import focus, user  # noqa: E402
+from src.data.models.chat import Chat, ChatState  # noqa: E402
+from src.data.models.focus import Focus  # noqa: E402
+from src.data.models.user import Profile, User  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+USER_ID = uuid.uuid4()
+PROFILE_ID = uuid.uuid4()
+
+# Lookup name -> (statement built per call, prebuilt statement, its parameters)
+LOOKUPS = {
+    "get_user_by_user_id": (
+        lambda: select(User).where(User.id == USER_ID),
+        user._select_user_by_id,
+        {"user_id": USER_ID},
+    ),
+    "get_profile": (
+        lambda: select(Profile).options(joinedload(Profile.user)).where(Profile.user_id == USER_ID),
+        user._select_profile_with_user_by_user_id,
+        {"user_id": USER_ID},
+    ),
+    "get_active_chat": (
+        lambda: select(Chat)
+        .where(Chat.profile_id == PROFILE_ID)
+        .where(Chat.state == ChatState.ACTIVE.value)
+        .order_by(Chat.created_at.desc())
+        .limit(1),
+        chat_repository._select_active_chat,
+        {"profile_id": PROFILE_ID},
+    ),
+    "get_focus_by_id": (
+        lambda: select(Focus).where(Focus.id == 1),
+        focus._select_focus_by_id,
+        {"focus_id": 1},
+    ),
+}
+
+
+def per_call_us(fn, iterations: int) -> float:
+    fn()
+    return timeit.timeit(fn, number=iterations) / iterations * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    logger.logger.setLevel(logging.WARNING)
+
+    session = SessionLocal()
+    try:
+        # Microseconds per call: building the statement and its cache key, then the full round trip
+        print(
+            f"{'lookup':<22} {'key inline':>11} {'key prebuilt':>13} {'call inline':>12} {'call prebuilt':>14}"
+        )
+        for name, (build, prebuilt, parameters) in LOOKUPS.items():
+            build_us = per_call_us(lambda: build()._generate_cache_key(), args.iterations)
+            prebuilt_build_us = per_call_us(lambda: prebuilt._generate_cache_key(), args.iterations)
+            call_us = per_call_us(lambda: session.scalar(build()), args.iterations)
+            prebuilt_call_us = per_call_us(lambda: session.scalar(prebuilt, parameters), args.iterations)
+            print(
+                f"{name:<22} {build_us:>11.1f} {prebuilt_build_us:>13.1f} "
+                f"{call_us:>12.1f} {prebuilt_call_us:>14.1f}"
+            )
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Rehearses schema changes on a `focus` table seeded with millions of rows, and measures how long
+concurrent writes stall while each one runs: a plain `CREATE INDEX` against
+`create_index_concurrently`, and a single `UPDATE` against a batched `backfill`.
+
+Seeded rows belong to a scratch profile, and are deleted afterwards unless `--keep` is passed, in
+which case later runs reuse them.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.online_migrations [--rows 2000000] [--keep]
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+import uuid
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text  # noqa: E402
+
+from src.data.db import engine  # noqa: E402
+from src.data.online_migrations import (  # noqa: E402
+    backfill,
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+from src.utils.logger import logger  # noqa: E402
+
+BENCHMARK_USER_ID = uuid.UUID("00000000-0000-7000-8000-00000000b001")
+BENCHMARK_PROFILE_ID = uuid.UUID("00000000-0000-7000-8000-00000000b002")
+SEED_BATCH = 500_000
+
+INSERT_FOCUS = text(
+    "INSERT INTO focus (profile_id, text, category, priority, sentiment, state, task_size, type, "
+    "in_vector_store, created_at, updated_at, due_date) "
+    "SELECT :profile_id, 'Benchmark task ' || n, 'general', n % 5 + 1, 'neutral', 'backlog', 'medium', "
+    "'task', false, now(), now(), now() + n * interval '1 minute' "
+    "FROM generate_series(1, :count) AS n"
+)
+
+
+def autocommit():
+    return engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def seed(rows: int) -> None:
+    with engine.connect() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO users (id, email, provider, created_at) "
+                "VALUES (:id, 'online-migrations@example.com', 'benchmark', now()) ON CONFLICT DO NOTHING"
+            ),
+            {"id": BENCHMARK_USER_ID},
+        )
+        connection.execute(
+            text(
+                "INSERT INTO profiles (id, user_id, provider, created_at, updated_at) "
+                "VALUES (:id, :user_id, 'benchmark', now(), now()) ON CONFLICT DO NOTHING"
+            ),
+            {"id": BENCHMARK_PROFILE_ID, "user_id": BENCHMARK_USER_ID},
+        )
+        connection.commit()
+
+        existing = connection.scalar(
+            text("SELECT count(*) FROM focus WHERE profile_id = :id"), {"id": BENCHMARK_PROFILE_ID}
+        )
+        for offset in range(existing, rows, SEED_BATCH):
+            count = min(SEED_BATCH, rows - offset)
+            connection.execute(INSERT_FOCUS, {"profile_id": BENCHMARK_PROFILE_ID, "count": count})
+            connection.commit()
+            print(f"Seeded {offset + count} of {rows} rows")
+
+    with autocommit() as connection:
+        connection.execute(text("VACUUM ANALYZE focus"))
+
+
+def clean_up() -> None:
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM focus WHERE profile_id = :id"), {"id": BENCHMARK_PROFILE_ID})
+        connection.execute(text("DELETE FROM profiles WHERE id = :id"), {"id": BENCHMARK_PROFILE_ID})
+        connection.execute(text("DELETE FROM users WHERE id = :id"), {"id": BENCHMARK_USER_ID})
+
+
+class Writer(threading.Thread):
+    """
+    Updates a random seeded row and inserts a new one, over and over, timing each write.
+    """
+
+    def __init__(self, ids: tuple[int, int]):
+        super().__init__(daemon=True)
+        self.ids = ids
+        self.latencies: list[float] = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        with autocommit() as connection:
+            while not self.stopped.is_set():
+                start = time.perf_counter()
+                connection.execute(
+                    text("UPDATE focus SET updated_at = now() WHERE id = :id"),
+                    {"id": random.randint(*self.ids)},
+                )
+                connection.execute(INSERT_FOCUS, {"profile_id": BENCHMARK_PROFILE_ID, "count": 1})
+                self.latencies.append((time.perf_counter() - start) * 1000)
+
+    def stop(self) -> list[float]:
+        self.stopped.set()
+        self.join()
+        return self.latencies
+
+
+def plain_index():
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX ix_focus_benchmark ON focus (profile_id, priority)"))
+
+
+def concurrent_index():
+    with autocommit() as connection:
+        create_index_concurrently(connection, "ix_focus_benchmark", "focus", "profile_id, priority")
+
+
+def drop_index():
+    with autocommit() as connection:
+        drop_index_concurrently(connection, "ix_focus_benchmark")
+
+
+def plain_update():
+    with engine.begin() as connection:
+        connection.execute(
+            text("UPDATE focus SET benchmark_priority = priority WHERE profile_id = :id"),
+            {"id": BENCHMARK_PROFILE_ID},
+        )
+
+
+def batched_backfill():
+    with autocommit() as connection:
+        backfill(
+            connection,
+            "focus",
+            "benchmark_priority = priority",
+            where=f"profile_id = '{BENCHMARK_PROFILE_ID}' AND benchmark_priority IS NULL",
+            pause=0.01,
+        )
+
+
+def add_column():
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE focus ADD COLUMN benchmark_priority integer"))
+
+
+def drop_column():
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE focus DROP COLUMN benchmark_priority"))
+
+
+# Name -> (set up, schema change, clean up)
+CHANGES = {
+    "CREATE INDEX": (None, plain_index, drop_index),
+    "create_index_concurrently": (None, concurrent_index, drop_index),
+    "UPDATE": (add_column, plain_update, drop_column),
+    "backfill": (add_column, batched_backfill, drop_column),
+}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    return sorted(samples)[min(int(len(samples) * fraction), len(samples) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded rows for later runs")
+    args = parser.parse_args()
+    logger.logger.setLevel(logging.WARNING)
+
+    seed(args.rows)
+    try:
+        with engine.connect() as connection:
+            ids = connection.execute(
+                text("SELECT min(id), max(id) FROM focus WHERE profile_id = :id"),
+                {"id": BENCHMARK_PROFILE_ID},
+            ).one()
+
+        print(f"{'change':<26} {'seconds':>8} {'writes':>7} {'p99 ms':>8} {'max ms':>9}")
+        for name, (set_up, change, tear_down) in CHANGES.items():
+            if set_up:
+                set_up()
+
+            writer = Writer(tuple(ids))
+            writer.start()
+            start = time.perf_counter()
+            try:
+                change()
+            finally:
+                duration = time.perf_counter() - start
+                latencies = writer.stop()
+                tear_down()
+
+            print(
+                f"{name:<26} {duration:>8.1f} {len(latencies):>7} "
+                f"{percentile(latencies, 0.99):>8.1f} {max(latencies):>9.1f}"
+            )
+    finally:
+        if not args.keep:
+            clean_up()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compares random (version 4) and time-ordered (version 7) primary keys on a synthetic `messages`
+table: insert throughput, and the size of the primary key index once every row is in.
+
+Each run creates a scratch copy of the `messages` columns with its `(id, created_at)` primary key,
+fills it in batches, and drops it afterwards. Ids are generated by Postgres, in the same layout as
+`src.utils.ids.uuid7`, so the comparison measures the index and not the client.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.uuid_keys [--rows 10000000] [--batch 100000]
+"""
+
+import argparse
+import logging
+import time
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text  # noqa: E402
+
+from src.data.db import engine  # noqa: E402
+from src.utils.logger import logger  # noqa: E402
+
+# Overwrites the first 48 bits of a random UUID with the millisecond timestamp, and its version with 7
+UUID7_SQL = (
+    "encode(set_bit(set_bit(overlay(uuid_send(gen_random_uuid()) placing "
+    "substring(int8send((extract(epoch FROM {timestamp}) * 1000)::bigint) FROM 3) FROM 1 FOR 6), "
+    "52, 1), 53, 1), 'hex')::uuid"
+)
+
+ID_GENERATORS = {
+    "uuid4": lambda timestamp: "gen_random_uuid()",
+    "uuid7": lambda timestamp: UUID7_SQL.format(timestamp=timestamp),
+}
+
+
+def run(name: str, rows: int, batch: int) -> tuple[float, int]:
+    table = f"benchmark_messages_{name}"
+    # A millisecond apart, like a busy table
+    created_at = "TIMESTAMP '2030-01-01' + (:start + i) * interval '1 millisecond'"
+    insert = text(
+        f"INSERT INTO {table} (id, message, role, chat_id, profile_id, created_at) "
+        f"SELECT {ID_GENERATORS[name](created_at)}, 'Benchmark message', 'user', "
+        f"gen_random_uuid(), gen_random_uuid(), {created_at} "
+        "FROM generate_series(1, :count) AS i"
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text(f"DROP TABLE IF EXISTS {table}"))
+        connection.execute(
+            text(
+                f"CREATE TABLE {table} (id uuid NOT NULL, message varchar, role varchar NOT NULL, "
+                "chat_id uuid, profile_id uuid, created_at timestamp NOT NULL, focus_ids integer[], "
+                "PRIMARY KEY (id, created_at))"
+            )
+        )
+        connection.commit()
+
+        try:
+            start = time.perf_counter()
+            for offset in range(0, rows, batch):
+                connection.execute(insert, {"start": offset, "count": min(batch, rows - offset)})
+                connection.commit()
+            duration = time.perf_counter() - start
+
+            index_size = connection.scalar(text(f"SELECT pg_relation_size('{table}_pkey')"))
+            return duration, index_size
+        finally:
+            connection.rollback()
+            connection.execute(text(f"DROP TABLE {table}"))
+            connection.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    args = parser.parse_args()
+    logger.logger.setLevel(logging.WARNING)
+
+    print(f"{'ids':<6} {'seconds':>8} {'rows/s':>10} {'pkey MB':>8}")
+    for name in ID_GENERATORS:
+        duration, index_size = run(name, args.rows, args.batch)
+        print(f"{name:<6} {duration:>8.1f} {args.rows / duration:>10.0f} {index_size / 1024**2:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
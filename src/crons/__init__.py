@@ -1,5 +1,10 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 
+from src.crons.chat_crons import archive_ended_chats
+from src.crons.focus_crons import purge_deleted_focus
+from src.crons.import_crons import resume_imports
+from src.crons.partition_crons import maintain_message_partitions
+
 scheduler = BackgroundScheduler()
 
 
@@ -7,6 +12,14 @@ def start_scheduler():
     # scheduler.add_job(delete_none_ids_from_chroma, "interval", minutes=5)
     # scheduler.add_job(func=lambda: refresh_focus_from_chroma(next(get_db())), trigger="interval", minutes=5)
     # scheduler.add_job(func=lambda: notify_due_tasks(next(get_db())), trigger="interval", minutes=15)
+    scheduler.add_job(
+        maintain_message_partitions, "cron", hour=3, id="maintain_message_partitions", replace_existing=True
+    )
+    scheduler.add_job(archive_ended_chats, "cron", hour=4, id="archive_ended_chats", replace_existing=True)
+    scheduler.add_job(
+        purge_deleted_focus, "interval", minutes=30, id="purge_deleted_focus", replace_existing=True
+    )
+    scheduler.add_job(resume_imports, "interval", minutes=15, id="resume_imports", replace_existing=True)
     scheduler.start()
 
 
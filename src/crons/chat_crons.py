@@ -0,0 +1,45 @@
+import traceback
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from src.data.chat_repository import archive_chat
+from src.data.db import SessionLocal
+from src.data.models.chat import Chat, ChatState
+from src.utils.config import settings
+from src.utils.logger import logger
+
+
+def archive_ended_chats() -> int:
+    """
+    Archives the chats that ended more than `CHAT_ARCHIVE_AFTER_DAYS` ago, in batches of
+    `CHAT_ARCHIVE_BATCH_SIZE`. Chats ended before `ended_at` was recorded are aged by when they started.
+    """
+    archived = 0
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=settings.CHAT_ARCHIVE_AFTER_DAYS)
+        with SessionLocal() as session:
+            while True:
+                chats = session.scalars(
+                    select(Chat)
+                    .where(Chat.state == ChatState.ENDED.value)
+                    .where(func.coalesce(Chat.ended_at, Chat.created_at) < cutoff)
+                    # Oldest first, along `ix_chats_ended_at_ended`, so that every run takes the same batches
+                    .order_by(Chat.ended_at, Chat.id)
+                    .limit(settings.CHAT_ARCHIVE_BATCH_SIZE)
+                ).all()
+
+                # One transaction per chat keeps the locks on `messages` short
+                for chat in chats:
+                    archive = archive_chat(session, chat)
+                    session.commit()
+                    archived += 1
+                    logger.info(f"Archived chat {chat.id} with {archive.message_count} messages")
+
+                if len(chats) < settings.CHAT_ARCHIVE_BATCH_SIZE:
+                    break
+    except Exception as e:
+        traceback.print_exc()
+        logger.error(f"Error archiving ended chats: {e}")
+
+    return archived
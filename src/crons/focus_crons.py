@@ -1,11 +1,15 @@
 import traceback
+from datetime import datetime, timedelta
 
 from langchain_core.documents import Document
 from sqlalchemy.orm import Session
 
+from src.data.db import SessionLocal
+from src.data.focus_repository import purge_deleted_focus_items
 from src.data.models.focus import Focus
 from src.services import chroma_service
 from src.services.keywords.keywords_service import get_query_keywords
+from src.utils.config import settings
 from src.utils.logger import logger
 
 
@@ -32,7 +36,9 @@ def delete_none_ids_from_chroma():
 
 def refresh_focus_from_chroma(session: Session):
     try:
-        focus_items = session.query(Focus).filter(Focus.in_vector_store.is_(False)).all()
+        focus_items = (
+            session.query(Focus).filter(Focus.in_vector_store.is_(False), Focus.deleted_at.is_(None)).all()
+        )
         if not focus_items:
             return
 
@@ -75,3 +81,28 @@ def refresh_focus_from_chroma(session: Session):
     except Exception as e:
         traceback.print_exc()
         logger.error(f"Error refreshing focus items from vector store: {e}")
+
+
+def purge_deleted_focus() -> int:
+    """
+    Removes focus items tombstoned more than `FOCUS_PURGE_AFTER_HOURS` ago, along with their vectors,
+    in batches of `FOCUS_PURGE_BATCH_SIZE` committed one at a time.
+    """
+    purged = 0
+    try:
+        deleted_before = datetime.utcnow() - timedelta(hours=settings.FOCUS_PURGE_AFTER_HOURS)
+        with SessionLocal() as session:
+            while True:
+                count = purge_deleted_focus_items(session, deleted_before, settings.FOCUS_PURGE_BATCH_SIZE)
+                session.commit()
+                purged += count
+                if count < settings.FOCUS_PURGE_BATCH_SIZE:
+                    break
+
+        if purged:
+            logger.info(f"Purged {purged} deleted focus items")
+    except Exception as e:
+        traceback.print_exc()
+        logger.error(f"Error purging deleted focus items: {e}")
+
+    return purged
@@ -0,0 +1,34 @@
+import traceback
+
+from src.data.db import SessionLocal
+from src.data.import_repository import (
+    embed_imported_focus_items,
+    get_resumable_import_jobs,
+    get_unembedded_import_items,
+)
+from src.data.models.import_job import ImportJobState
+from src.utils.logger import logger
+
+
+def resume_imports() -> int:
+    """
+    Adds the items of failed or stalled imports that are not in the vector store yet, one import
+    at a time. Returns the number of resumed imports.
+    """
+    resumed = 0
+    try:
+        with SessionLocal() as session:
+            for job in get_resumable_import_jobs(session):
+                focus_ids = get_unembedded_import_items(session, job)
+                job.state = ImportJobState.embedding.value
+                job.error = None
+                session.commit()
+
+                logger.info(f"Resuming import {job.id} with {len(focus_ids)} items left")
+                embed_imported_focus_items(job.id, focus_ids)
+                resumed += 1
+    except Exception as e:
+        traceback.print_exc()
+        logger.error(f"Error resuming imports: {e}")
+
+    return resumed
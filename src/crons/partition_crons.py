@@ -0,0 +1,36 @@
+import traceback
+from datetime import datetime
+
+from sqlalchemy import text
+
+from src.data.db import engine
+from src.data.partitions import add_months, create_message_partitions, expire_message_partitions, month_start
+from src.utils.config import settings
+from src.utils.logger import logger
+
+
+def maintain_message_partitions():
+    try:
+        this_month = month_start(datetime.utcnow().date())
+        with engine.begin() as connection:
+            # Partition DDL locks `messages`, so give up rather than queue requests behind a long query
+            connection.execute(text("SET LOCAL lock_timeout = '5s'"))
+
+            created = create_message_partitions(
+                connection, start=this_month, months_ahead=settings.MESSAGES_PARTITION_MONTHS_AHEAD
+            )
+            if created:
+                logger.info("Created message partitions", {"partitions": created})
+
+            if settings.MESSAGES_RETENTION_MONTHS is not None:
+                expired = expire_message_partitions(
+                    connection,
+                    before=add_months(this_month, -settings.MESSAGES_RETENTION_MONTHS),
+                    drop=settings.MESSAGES_RETENTION_DROP,
+                )
+                if expired:
+                    action = "Dropped" if settings.MESSAGES_RETENTION_DROP else "Detached"
+                    logger.info(f"{action} expired message partitions", {"partitions": expired})
+    except Exception as e:
+        traceback.print_exc()
+        logger.error(f"Error maintaining message partitions: {e}")
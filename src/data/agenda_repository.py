@@ -0,0 +1,253 @@
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+import pytz
+from sqlalchemy import UUID, Row, Text, bindparam, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.data.models.agenda import ProfileAgenda
+from src.data.models.focus import Focus, FocusState
+
+# "This week" is the days after today, up to a week from today
+AGENDA_WEEK_DAYS = 7
+# Overdue items kept on the agenda, most recently due first
+AGENDA_OVERDUE_LIMIT = 20
+# Items without a due date kept on the agenda, most recently created first
+AGENDA_UNDATED_LIMIT = 20
+# Seeds the hash of the profile id taken as the agenda's advisory lock key
+AGENDA_LOCK_SEED = 0x61676E64
+
+OPEN_STATES = [FocusState.backlog.value, FocusState.active.value]
+
+_open_items = (
+    Focus.profile_id == bindparam("profile_id"),
+    Focus.deleted_at.is_(None),
+    Focus.state.in_(OPEN_STATES),
+)
+_overdue = Focus.due_date < bindparam("today_start")
+_undated = Focus.due_date.is_(None)
+
+# Open items due from the start of today to the end of the week, a range of ix_focus_profile_id_due_date
+_select_upcoming_items = (
+    select(Focus)
+    .where(*_open_items, Focus.due_date >= bindparam("today_start"), Focus.due_date < bindparam("week_end"))
+    .order_by(Focus.due_date, Focus.id)
+)
+_select_overdue_items = (
+    select(Focus)
+    .where(*_open_items, _overdue)
+    .order_by(Focus.due_date.desc(), Focus.id.desc())
+    .limit(AGENDA_OVERDUE_LIMIT)
+)
+_select_undated_items = (
+    select(Focus)
+    .where(*_open_items, _undated)
+    .order_by(Focus.created_at.desc(), Focus.id.desc())
+    .limit(AGENDA_UNDATED_LIMIT)
+)
+# Held until the transaction ends, so that rebuilds of one profile's agenda run one after another
+_lock_agenda = select(
+    func.pg_advisory_xact_lock(
+        func.hashtextextended(cast(bindparam("profile_id", type_=UUID), Text), AGENDA_LOCK_SEED)
+    )
+)
+_count_agenda_items = select(
+    func.count().filter(_overdue).label("overdue_count"),
+    func.count().filter(_undated).label("undated_count"),
+).where(*_open_items, or_(_overdue, _undated))
+
+
+@dataclass(frozen=True)
+class AgendaWindow:
+    agenda_date: date
+    # In UTC, like `Focus.due_date`
+    today_start: datetime
+    today_end: datetime
+    week_end: datetime
+
+
+def get_agenda_window(timezone: str, now: Optional[datetime] = None) -> AgendaWindow:
+    client_tz = pytz.timezone(timezone)
+    local_now = (now or datetime.now(pytz.UTC)).astimezone(client_tz)
+    agenda_date = local_now.date()
+
+    def local_midnight(day: date) -> datetime:
+        return client_tz.localize(datetime.combine(day, datetime.min.time())).astimezone(pytz.UTC)
+
+    return AgendaWindow(
+        agenda_date=agenda_date,
+        today_start=local_midnight(agenda_date),
+        today_end=local_midnight(agenda_date + timedelta(days=1)),
+        week_end=local_midnight(agenda_date + timedelta(days=AGENDA_WEEK_DAYS + 1)),
+    )
+
+
+def build_agenda_values(
+    profile_id: uuid.UUID,
+    timezone: str,
+    window: AgendaWindow,
+    upcoming_items: Iterable[Focus],
+    overdue_items: Iterable[Focus],
+    undated_items: Iterable[Focus],
+    counts: Row,
+) -> dict:
+    """
+    Splits the open items due in the window, ordered by due date, into the agenda's columns, alongside
+    the latest overdue and undated items and how many of each there are.
+    """
+    due_today, due_this_week = [], []
+    for item in upcoming_items:
+        if item.due_date < window.today_end:
+            due_today.append(item)
+        else:
+            due_this_week.append(item)
+
+    def serialize(items: Iterable[Focus]) -> list:
+        return [item.to_model().model_dump(mode="json") for item in items]
+
+    return {
+        "profile_id": profile_id,
+        "timezone": timezone,
+        "agenda_date": window.agenda_date,
+        "due_today": serialize(due_today),
+        "due_this_week": serialize(due_this_week),
+        "overdue": serialize(overdue_items),
+        "overdue_count": counts.overdue_count,
+        "undated": serialize(undated_items),
+        "undated_count": counts.undated_count,
+        "refreshed_at": datetime.utcnow(),
+    }
+
+
+def _agenda_parameters(profile_id: uuid.UUID, window: AgendaWindow) -> dict:
+    return {"profile_id": profile_id, "today_start": window.today_start, "week_end": window.week_end}
+
+
+def _upsert_agenda(values: dict):
+    statement = insert(ProfileAgenda).values(values)
+    return (
+        statement.on_conflict_do_update(
+            index_elements=[ProfileAgenda.profile_id],
+            set_={key: statement.excluded[key] for key in values if key != "profile_id"},
+        )
+        .returning(ProfileAgenda)
+        # The session may hold the row from before the refresh
+        .execution_options(populate_existing=True)
+    )
+
+
+def is_agenda_current(agenda: Optional[ProfileAgenda], timezone: Optional[str]) -> bool:
+    if agenda is None:
+        return False
+
+    if timezone and timezone != agenda.timezone:
+        return False
+
+    return agenda.agenda_date == get_agenda_window(agenda.timezone).agenda_date
+
+
+def refresh_profile_agenda(
+    session: Session, profile_id: uuid.UUID, timezone: Optional[str] = None
+) -> ProfileAgenda:
+    """
+    Rebuilds the profile's agenda from `focus`. Writes to focus items go through
+    `update_profile_agenda`, which skips this when they cannot change the agenda. Without a
+    `timezone`, the one the agenda was last built for is kept.
+
+    Concurrent rebuilds of the same agenda wait for each other's transaction, so that the last one
+    to write it sees the focus items the others committed.
+    """
+    session.execute(_lock_agenda, {"profile_id": profile_id})
+    if timezone is None:
+        agenda = session.get(ProfileAgenda, profile_id, populate_existing=True)
+        timezone = agenda.timezone if agenda else "UTC"
+
+    window = get_agenda_window(timezone)
+    parameters = _agenda_parameters(profile_id, window)
+    values = build_agenda_values(
+        profile_id,
+        timezone,
+        window,
+        session.scalars(_select_upcoming_items, parameters).all(),
+        session.scalars(_select_overdue_items, parameters).all(),
+        session.scalars(_select_undated_items, parameters).all(),
+        session.execute(_count_agenda_items, parameters).one(),
+    )
+    return session.scalars(_upsert_agenda(values)).one()
+
+
+async def refresh_profile_agenda_async(
+    session: AsyncSession, profile_id: uuid.UUID, timezone: Optional[str] = None
+) -> ProfileAgenda:
+    await session.execute(_lock_agenda, {"profile_id": profile_id})
+    if timezone is None:
+        agenda = await session.get(ProfileAgenda, profile_id, populate_existing=True)
+        timezone = agenda.timezone if agenda else "UTC"
+
+    window = get_agenda_window(timezone)
+    parameters = _agenda_parameters(profile_id, window)
+    values = build_agenda_values(
+        profile_id,
+        timezone,
+        window,
+        (await session.scalars(_select_upcoming_items, parameters)).all(),
+        (await session.scalars(_select_overdue_items, parameters)).all(),
+        (await session.scalars(_select_undated_items, parameters)).all(),
+        (await session.execute(_count_agenda_items, parameters)).one(),
+    )
+    return (await session.scalars(_upsert_agenda(values))).one()
+
+
+def is_agenda_affected(agenda: Optional[ProfileAgenda], due_dates: Iterable[Optional[datetime]]) -> bool:
+    """
+    Returns whether a write to focus items that were, or are now, due at `due_dates` can change
+    `agenda`. Only items due after the end of its week never show on it. A missing or stale agenda
+    is rebuilt on its next read instead.
+    """
+    if agenda is None or not is_agenda_current(agenda, None):
+        return False
+
+    week_end = get_agenda_window(agenda.timezone).week_end
+    return any(due_date is None or due_date < week_end for due_date in due_dates)
+
+
+def update_profile_agenda(session: Session, profile_id: uuid.UUID, due_dates: Iterable[Optional[datetime]]):
+    """
+    Rebuilds the profile's agenda after a write to its focus items, unless the write cannot change
+    it. `due_dates` are those of the written items, both before and after the write.
+    """
+    agenda = session.get(ProfileAgenda, profile_id)
+    if is_agenda_affected(agenda, due_dates):
+        refresh_profile_agenda(session, profile_id, agenda.timezone)
+
+
+async def update_profile_agenda_async(
+    session: AsyncSession, profile_id: uuid.UUID, due_dates: Iterable[Optional[datetime]]
+):
+    agenda = await session.get(ProfileAgenda, profile_id)
+    if is_agenda_affected(agenda, due_dates):
+        await refresh_profile_agenda_async(session, profile_id, agenda.timezone)
+
+
+def get_profile_agenda(session: Session, profile_id: uuid.UUID) -> ProfileAgenda:
+    """
+    Returns the profile's agenda, rebuilding it first when it was built on an earlier day or
+    has not been built yet.
+    """
+    agenda = session.get(ProfileAgenda, profile_id)
+    if is_agenda_current(agenda, None):
+        return agenda
+
+    return refresh_profile_agenda(session, profile_id, agenda.timezone if agenda else "UTC")
+
+
+async def get_profile_agenda_async(session: AsyncSession, profile_id: uuid.UUID) -> Optional[ProfileAgenda]:
+    """
+    Returns the profile's agenda as stored, which may be stale or missing. Callers rebuild it on
+    the primary with `refresh_profile_agenda_async` when `is_agenda_current` says so.
+    """
+    return await session.get(ProfileAgenda, profile_id)
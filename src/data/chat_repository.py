@@ -1,9 +1,13 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import bindparam, delete, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.data.models.chat import Message
+from src.data.models.chat import Chat, ChatArchive, ChatState, Message
+from src.data.pagination import PageInfo, paginate_async, paginate_items
 
 
 def get_user_chat_messages(session: Session, profile_id: UUID) -> List[Message]:
@@ -34,6 +38,116 @@ def insert_message(
         message=message, chat_id=chat_id, profile_id=profile_id, role=role, focus_ids=focus_ids
     )
     session.add(new_message)
-    session.commit()
+    session.flush()
 
     return new_message
+
+
+async def get_user_chat_messages_async(session: AsyncSession, profile_id: UUID) -> List[Message]:
+    messages = await session.scalars(
+        select(Message).where(Message.profile_id == profile_id).order_by(Message.created_at.desc())
+    )
+
+    return list(messages)
+
+
+async def get_chat_history_async(session: AsyncSession, chat_id: UUID) -> List[Message]:
+    messages = await session.scalars(select(Message).where(Message.chat_id == chat_id))
+    return list(messages)
+
+
+async def get_chat_messages_page_async(
+    session: AsyncSession,
+    chat_id: UUID,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+) -> Tuple[List[Message], PageInfo]:
+    """
+    Returns a page of a chat's messages in chronological order, starting from the latest messages.
+    """
+    return await paginate_async(
+        session,
+        select(Message).where(Message.chat_id == chat_id),
+        keys=[Message.created_at, Message.id],
+        key_types=[datetime, UUID],
+        limit=limit,
+        before=before,
+        after=after,
+        from_end=True,
+    )
+
+
+async def get_archived_chat_messages_page_async(
+    session: AsyncSession,
+    chat_id: UUID,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+) -> Tuple[List[Message], PageInfo]:
+    """
+    Same as `get_chat_messages_page_async`, for a chat whose messages were moved to `chat_archives`.
+    """
+    archive = await session.get(ChatArchive, chat_id)
+    return paginate_items(
+        archive.to_messages() if archive else [],
+        keys=[Message.created_at, Message.id],
+        key_types=[datetime, UUID],
+        limit=limit,
+        before=before,
+        after=after,
+        from_end=True,
+    )
+
+
+def archive_chat(session: Session, chat: Chat) -> ChatArchive:
+    """
+    Moves the messages of an ended chat out of `messages` into a single compressed `chat_archives` row.
+    """
+    messages = session.scalars(
+        select(Message).where(Message.chat_id == chat.id).order_by(Message.created_at, Message.id)
+    ).all()
+
+    archive = ChatArchive.from_messages(chat.id, messages)
+    session.add(archive)
+    session.execute(delete(Message).where(Message.chat_id == chat.id))
+    chat.state = ChatState.ARCHIVED.value
+    session.flush()
+    return archive
+
+
+async def insert_message_async(
+    session: AsyncSession,
+    chat_id: UUID,
+    message: str,
+    profile_id: UUID,
+    role: str,
+    focus_ids: Optional[List[int]] = None,
+) -> Message:
+    new_message = Message(
+        message=message, chat_id=chat_id, profile_id=profile_id, role=role, focus_ids=focus_ids
+    )
+    session.add(new_message)
+    await session.flush()
+
+    return new_message
+
+
+# Hot lookups, prebuilt and executed with bound parameters
+_select_chat_by_id = select(Chat).where(Chat.id == bindparam("chat_id"))
+_select_active_chat = (
+    select(Chat)
+    .where(Chat.profile_id == bindparam("profile_id"))
+    # Rendered inline so that generic plans of the prepared statement can still match the partial index
+    .where(Chat.state == literal(ChatState.ACTIVE.value, literal_execute=True))
+    .order_by(Chat.created_at.desc())
+    .limit(1)
+)
+
+
+async def get_chat_by_id_async(session: AsyncSession, chat_id: UUID) -> Chat | None:
+    return await session.scalar(_select_chat_by_id, {"chat_id": chat_id})
+
+
+async def get_active_chat_async(session: AsyncSession, profile_id: UUID) -> Chat | None:
+    return await session.scalar(_select_active_chat, {"profile_id": profile_id})
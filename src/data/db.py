@@ -1,26 +1,133 @@
-from sqlalchemy import create_engine
+import enum
+
+from sqlalchemy import Enum, create_engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from src.data.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from src.data.query_stats import instrument_engine
+from src.data.slow_queries import log_slow_queries
 from src.utils.config import settings
 from src.utils.logger import logger
 
-engine = create_engine(settings.DATABASE_URL, echo=settings.ENVIRONMENT == "local")
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Points a `postgresql://` URL at the asyncpg driver.
+
+    asyncpg does not understand libpq's `sslmode` parameter, so it is passed through as `ssl`.
+    """
+    url = make_url(database_url)
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+
+_pool_options = dict(
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+)
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.ENVIRONMENT == "local",
+    poolclass=InstrumentedQueuePool,
+    **_pool_options,
+)
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.ENVIRONMENT == "local",
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **_pool_options,
+)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+log_slow_queries(engine, settings.DATABASE_URL)
+log_slow_queries(async_engine.sync_engine, settings.DATABASE_URL)
+
+replica_async_engine = (
+    create_async_engine(
+        get_async_database_url(settings.DATABASE_REPLICA_URL),
+        echo=settings.ENVIRONMENT == "local",
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **_pool_options,
+    )
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+if replica_async_engine is not None:
+    instrument_engine(replica_async_engine.sync_engine)
+    log_slow_queries(replica_async_engine.sync_engine, settings.DATABASE_REPLICA_URL)
 
 Base = declarative_base()
 
+
+def values_enum(enum_class: type[enum.Enum]) -> Enum:
+    """
+    A native Postgres enum of the values of `enum_class`, named after it. Columns of this type take
+    four bytes however long the value, and still read and write plain strings.
+    """
+    return Enum(
+        *(member.value for member in enum_class), name=enum_class.__name__.lower(), validate_strings=True
+    )
+
+
 # Session
 Session = sessionmaker(engine)
-SessionLocal = sessionmaker(bind=engine)
+# Objects stay readable after commit, so serializing them afterwards does not reload each one,
+# and async sessions cannot lazy load expired attributes at all
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+ReplicaAsyncSessionLocal = (
+    async_sessionmaker(bind=replica_async_engine, expire_on_commit=False) if replica_async_engine else None
+)
 
 
+# Request sessions are a unit of work: repositories only flush, and the request commits once
+# when the route returns. An exception raised by the route skips the commit, and closing the
+# session rolls everything back.
 def get_db():
     db = SessionLocal()
     try:
         yield db
+        db.commit()
     finally:
         db.close()
 
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+        await db.commit()
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns live connection pool usage for each engine.
+
+    Each engine may hold up to `DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW` connections,
+    so a worker can open twice that against Postgres' `max_connections`.
+    """
+    engines = {
+        "sync": engine.pool.stats(),  # type: ignore[attr-defined]
+        "async": async_engine.pool.stats(),  # type: ignore[attr-defined]
+    }
+    if replica_async_engine is not None:
+        engines["replica"] = replica_async_engine.pool.stats()  # type: ignore[attr-defined]
+
+    return {
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "engines": engines,
+    }
+
+
 def connect_to_db():
     try:
         connection = engine.connect()
@@ -0,0 +1,84 @@
+import datetime
+import json
+import uuid
+from typing import Any, AsyncIterator, Mapping
+
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data.models.chat import Chat, ChatArchive, Message
+from src.data.models.focus import Focus
+from src.data.models.memory import Memory
+from src.data.models.note import Note
+
+# Rows fetched per round trip from each server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Record type, table and sort order of each table exported. Every table has a `profile_id` column.
+EXPORT_TABLES: list[tuple[str, Table, list[str]]] = [
+    ("focus", Focus.__table__, ["id"]),
+    ("chat", Chat.__table__, ["created_at", "id"]),
+    ("message", Message.__table__, ["created_at", "id"]),
+    ("note", Note.__table__, ["created_at", "id"]),
+    ("memory", Memory.__table__, ["created_at", "id"]),
+]
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+
+    if isinstance(value, uuid.UUID):
+        return str(value)
+
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def _export_line(record_type: str, row: Mapping[str, Any]) -> str:
+    return json.dumps({"type": record_type, "data": dict(row)}, default=_to_json) + "\n"
+
+
+async def stream_profile_export(session: AsyncSession, profile_id: uuid.UUID) -> AsyncIterator[str]:
+    """
+    Yields the profile's focus items, chats, messages, notes and memories as NDJSON, one
+    `{"type": ..., "data": {...}}` object per line, in chunks of up to `EXPORT_BATCH_SIZE` lines.
+
+    Tables are read as plain rows through server-side cursors, a batch at a time, so memory use
+    stays flat however large the account is. Messages of archived chats are exported from their
+    archive, in the same shape as the others.
+    """
+    # One snapshot for the whole export, so that rows written meanwhile cannot leave it inconsistent
+    await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+    for record_type, table, order_by in EXPORT_TABLES:
+        # Generated columns, like the full-text search vector of focus items, are derived data
+        columns = [column for column in table.columns if column.computed is None]
+        statement = select(*columns).where(table.c.profile_id == profile_id)
+        # Tombstoned rows are waiting to be purged, and no longer part of the user's data
+        if "deleted_at" in table.c:
+            statement = statement.where(table.c.deleted_at.is_(None))
+
+        result = await session.stream(
+            statement.order_by(*(table.c[column] for column in order_by)).execution_options(
+                yield_per=EXPORT_BATCH_SIZE
+            )
+        )
+        async for rows in result.mappings().partitions():
+            yield "".join(_export_line(record_type, row) for row in rows)
+
+    # Archives are decompressed one chat at a time
+    archives = await session.stream_scalars(
+        select(ChatArchive)
+        .join(Chat, Chat.id == ChatArchive.chat_id)
+        .where(Chat.profile_id == profile_id)
+        .order_by(Chat.created_at, Chat.id)
+        .execution_options(yield_per=1)
+    )
+    async for archive in archives:
+        yield "".join(
+            _export_line(
+                "message",
+                {column.key: getattr(message, column.key) for column in Message.__table__.columns},
+            )
+            for message in archive.to_messages()
+        )
@@ -1,39 +1,60 @@
+import re
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.documents import Document
-from sqlalchemy.orm import Session
-
-from src.data.db import SessionLocal
+from sqlalchemy import Date, DateTime, Text, cast, delete, event, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    Query as SQQuery,
+    Session,
+    SessionTransaction,
+)
+
+from src.data.agenda_repository import update_profile_agenda
 from src.data.models.focus import Focus, FocusState, UserIntentTask
+from src.data.pagination import PageInfo, paginate_async
 from src.services import chroma_service
+from src.utils.config import settings
+from src.utils.date_tools import parse_due_date
 from src.utils.logger import logger
 
 NON_TASK_TYPES = ["chat", "feeling", "request", "question"]
 
+# Keywords of up to three plain words, which full-text search answers as well as the vector store
+_LITERAL_KEYWORD = re.compile(r"^[\w'-]+(?: [\w'-]+){0,2}$")
+
+# Documents of focus items created in a session's transaction, added to the vector store once it commits
+_PENDING_VECTOR_DOCUMENTS = "pending_vector_documents"
+
+# Runs vector searches, so that a slow vector store can be timed out
+_vector_search_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vector-search")
+
 
 def get_focus_vector_documents(
     focus_items: List[Focus], base_items: Optional[List[UserIntentTask]] = None
 ) -> List[Document]:
-    documents: List[Document] = []
-
-    for item in focus_items:
-        if base_items:
-            keywords = next(base_item for base_item in base_items if base_item.text == item.text).keywords
-            keywords_str = ",".join(keywords)
-        else:
-            keywords_str = ""
-
-        documents.append(
-            Document(
-                page_content=f"{item.text} \n\n {keywords_str}",
-                metadata=item.to_json(),
-            )
+    """
+    Builds a vector store document for each focus item.
+
+    When given, `base_items` must be the tasks the focus items were created from, in the same order.
+    """
+    if base_items:
+        keywords = [",".join(base_item.keywords) for base_item in base_items]
+    else:
+        keywords = [""] * len(focus_items)
+
+    return [
+        Document(
+            page_content=f"{item.text} \n\n {keywords_str}",
+            metadata=item.to_json(),
         )
-
-    return documents
+        for item, keywords_str in zip(focus_items, keywords, strict=True)
+    ]
 
 
 def get_focus_item_by_id(focus_items: List[Focus], id: str) -> Focus:
@@ -61,6 +82,52 @@ def add_focus_items_to_vector_store(
         return None
 
 
+def add_focus_items_to_vector_store_on_commit(
+    session: Session, focus_items: List[Focus], base_items: List[UserIntentTask]
+):
+    """
+    Adds the focus items to the vector store once `session` commits the transaction that created
+    them, so that a rolled back transaction leaves no vectors behind for items that never existed.
+    """
+    documents = get_focus_vector_documents(focus_items, base_items)
+    session.info.setdefault(_PENDING_VECTOR_DOCUMENTS, []).extend(
+        (item.id, document) for item, document in zip(focus_items, documents)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _add_committed_documents_to_vector_store(session: Session):
+    # Releasing a savepoint commits nothing yet
+    if session.in_nested_transaction():
+        return
+
+    pending = session.info.pop(_PENDING_VECTOR_DOCUMENTS, None)
+    if not pending:
+        return
+
+    focus_ids = [focus_id for focus_id, _ in pending]
+    try:
+        logger.info(f"Adding {len(pending)} committed focus items to vector store...")
+        chroma_service.vector_store.add_documents(
+            documents=[document for _, document in pending], ids=[str(focus_id) for focus_id in focus_ids]
+        )
+        # The committed session cannot run statements until its next transaction
+        with Session(bind=session.get_bind(Focus)) as flag_session:
+            flag_session.execute(update(Focus).where(Focus.id.in_(focus_ids)).values(in_vector_store=True))
+            flag_session.commit()
+    except Exception as e:
+        # The items stay out of the vector store, as `in_vector_store` says
+        traceback.print_exc()
+        logger.error(f"Error adding committed focus items {focus_ids} to the vector store: {e}")
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_documents(session: Session, transaction: SessionTransaction):
+    # Runs after `after_commit`, which took the documents already when the transaction committed
+    if transaction.parent is None:
+        session.info.pop(_PENDING_VECTOR_DOCUMENTS, None)
+
+
 def delete_focus_item_from_vector_store(focus_item: Focus):
     if not focus_item.in_vector_store:
         return
@@ -83,31 +150,79 @@ def create_focus_items(
     if len(filtered_items) == 0:
         return []
 
-    created_items = [
-        Focus(
-            text=item.text,
-            type=item.type,
-            task_size=item.task_size,
-            category=item.category,
-            priority=item.priority,
-            sentiment=item.sentiment,
-            due_date=item.due_date,
-            profile_id=profile_id,
-            state=item.state.value,
+    # A single multi-row INSERT ... RETURNING, with rows returned in the order of `filtered_items`
+    statement = insert(Focus).returning(Focus, sort_by_parameter_order=True)
+    created_items = list(
+        session.scalars(
+            statement,
+            [
+                {
+                    "text": item.text,
+                    "type": item.type,
+                    "task_size": item.task_size,
+                    "category": item.category,
+                    "priority": item.priority,
+                    "sentiment": item.sentiment,
+                    "due_date": parse_due_date(item.due_date),
+                    "profile_id": profile_id,
+                    "state": item.state.value,
+                }
+                for item in filtered_items
+            ],
         )
-        for item in focus_items
-    ]
+    )
 
-    session.add_all(created_items)
-    session.flush()
-    session.commit()
-
-    add_focus_items_to_vector_store(focus_items=created_items, base_items=focus_items)
+    add_focus_items_to_vector_store_on_commit(session, focus_items=created_items, base_items=filtered_items)
+    update_profile_agenda(session, profile_id, [item.due_date for item in created_items])
 
     return created_items
 
 
+def is_literal_keyword(keyword: str) -> bool:
+    return _LITERAL_KEYWORD.match(keyword) is not None
+
+
+def _full_text_search(query: SQQuery, keyword: str, match_any: bool = False) -> SQQuery:
+    """
+    Filters `query` to the items matching every word of `keyword`, or any of them with `match_any`,
+    best matches first.
+    """
+    ts_query = func.websearch_to_tsquery("english", keyword)
+    if match_any:
+        ts_query = cast(func.replace(func.plainto_tsquery("english", keyword).cast(Text), "&", "|"), TSQUERY)
+    return query.filter(Focus.text_search.op("@@")(ts_query)).order_by(
+        func.ts_rank(Focus.text_search, ts_query).desc(), Focus.id
+    )
+
+
+def _vector_search_ids(keyword: str, profile_id: uuid.UUID) -> Optional[List[str]]:
+    """
+    Returns the ids of the focus items most similar to `keyword`, or None when the vector store
+    fails or does not answer within `VECTOR_SEARCH_TIMEOUT_SECONDS`.
+    """
+    future = _vector_search_executor.submit(
+        chroma_service.vector_store.similarity_search_with_relevance_scores,
+        query=keyword,
+        filter={"profile_id": str(profile_id)},
+        score_threshold=0,
+    )
+    try:
+        results = future.result(timeout=settings.VECTOR_SEARCH_TIMEOUT_SECONDS)
+    except Exception as e:
+        # A timed out search is left to finish in its thread, as it cannot be cancelled
+        logger.error(f"Vector search failed, falling back to full-text search: {e!r}")
+        return None
+
+    ids = []
+    for res, score in results:
+        logger.info(f"Found {res.metadata['text']} with score {score}")
+        ids.append(res.metadata["id"])
+
+    return ids
+
+
 def search_focus_items(
+    session: Session,
     keyword: str,
     due_on: Optional[datetime],
     due_after: Optional[datetime],
@@ -115,47 +230,177 @@ def search_focus_items(
     status: Optional[FocusState],
     profile_id: uuid.UUID,
 ) -> List[Focus]:
-    session = SessionLocal()
-    ids = []
-
-    if len(keyword) > 0:
-        results = chroma_service.vector_store.similarity_search_with_relevance_scores(
-            query=keyword,
-            filter={"profile_id": str(profile_id)},
-            score_threshold=0,
-        )
-        ids = []
-        for res, score in results:
-            logger.info(f"Found {res.metadata['text']} with score {score}")
-            ids.append(res.metadata["id"])
-        if len(ids) == 0:
-            return []
-
+    """
+    Searches the profile's focus items. Short literal keywords, like "dentist", are looked up with
+    Postgres full-text search first, and only go to the vector store when that finds nothing.
+    Full-text search also stands in for the vector store when it is slow or down.
+    """
     try:
-        query = session.query(Focus).filter(Focus.profile_id == profile_id)
+        # A failed search is rolled back to here, leaving the rest of the session's transaction intact
+        with session.begin_nested():
+            query = session.query(Focus).filter(Focus.profile_id == profile_id, Focus.deleted_at.is_(None))
+
+            if due_on:
+                query = query.filter(Focus.due_date == due_on)
+            else:
+                # `due_after` and `due_before` can be used together because
+                # the user may want to search for tasks that are due between two dates
+                if due_after is not None:
+                    query = query.filter(Focus.due_date >= due_after)
+
+                if due_before is not None:
+                    query = query.filter(Focus.due_date <= due_before)
+
+            if status == "active" or status == FocusState.backlog.value:
+                query = query.filter(Focus.state.in_([FocusState.backlog.value, FocusState.active.value]))
+            elif status:
+                query = query.filter(Focus.state == status.value)
+
+            if len(keyword) == 0:
+                return query.limit(10).all()
+
+            if is_literal_keyword(keyword):
+                focus_items = _full_text_search(query, keyword).limit(10).all()
+                if focus_items:
+                    return focus_items
+
+            ids = _vector_search_ids(keyword, profile_id)
+            if ids is None:
+                # Keywords meant for the vector store are often questions, which no item matches word for word
+                return _full_text_search(query, keyword, match_any=True).limit(10).all()
+            if len(ids) == 0:
+                return []
+
+            return query.filter(Focus.id.in_(ids)).limit(10).all()
+    except Exception as e:
+        logger.error(f"Error searching focus items: {e}")
+        return []
 
-        if len(ids) > 0:
-            query = query.filter(Focus.id.in_(ids))
 
-        if due_on:
-            query = query.filter(Focus.due_date == due_on)
-        else:
-            # `due_after` and `due_before` can be used together because
-            # the user may want to search for tasks that are due between two dates
-            if due_after is not None:
-                query = query.filter(Focus.due_date >= due_after)
+def edit_focus_item(
+    session: Session, profile_id: uuid.UUID, task_query: str, values: Dict[str, Any]
+) -> Optional[Focus]:
+    """
+    Applies `values` to the profile's focus item that best matches `task_query`, resolving and
+    updating it in one UPDATE ... RETURNING. Items are matched on the trigram word similarity of
+    their text, served by `ix_focus_text_trgm`. Returns None when nothing matches.
+    """
+    best_match = (
+        select(Focus.id, Focus.due_date)
+        .where(
+            Focus.profile_id == profile_id,
+            Focus.deleted_at.is_(None),
+            literal(task_query).op("<%")(Focus.text),
+        )
+        .order_by(func.word_similarity(task_query, Focus.text).desc(), Focus.id)
+        .limit(1)
+        .subquery()
+    )
+    statement = (
+        update(Focus)
+        .where(Focus.id == best_match.c.id)
+        .values(**values, updated_at=datetime.utcnow())
+        # The subquery still holds the due date from before the update
+        .returning(Focus, best_match.c.due_date)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    row = session.execute(statement).one_or_none()
+    if row is None:
+        return None
 
-            if due_before is not None:
-                query = query.filter(Focus.due_date <= due_before)
+    focus_item, previous_due_date = row
+    update_profile_agenda(session, profile_id, [previous_due_date, focus_item.due_date])
+    return focus_item
 
-        if status == "active" or status == FocusState.backlog.value:
-            query = query.filter(Focus.state.in_([FocusState.backlog.value, FocusState.active.value]))
-        elif status:
-            query = query.filter(Focus.state == status.value)
 
-        focus_items = query.limit(10).all()
+def local_midnight(timezone: str, days: int = 0):
+    """
+    Postgres expression for midnight in `timezone`, `days` after the current day there. It is
+    evaluated once per statement, so comparing `Focus.due_date` to it is still an index range scan.
+    """
+    local_today = cast(func.timezone(timezone, func.now()), Date)
+    # Cast to a plain timestamp, which `timezone()` reads as local time in `timezone`
+    return func.timezone(timezone, cast(local_today + days, DateTime))
 
-        return focus_items
-    except Exception as e:
-        logger.error(f"Error searching focus items: {e}")
-        return []
+
+async def get_focus_items_due_between_async(
+    session: AsyncSession,
+    profile_id: uuid.UUID,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    limit: int,
+    category: Optional[str] = None,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    timezone: str = "UTC",
+) -> Tuple[List[Focus], PageInfo]:
+    """
+    Returns a page of the profile's focus items due within the window, ordered by due date.
+    Either end of the window defaults to the bounds of the current day in `timezone`.
+    """
+    query = select(Focus).where(
+        Focus.profile_id == profile_id,
+        Focus.deleted_at.is_(None),
+        Focus.due_date >= (start_date if start_date is not None else local_midnight(timezone)),
+    )
+    if end_date is not None:
+        query = query.where(Focus.due_date <= end_date)
+    else:
+        query = query.where(Focus.due_date < local_midnight(timezone, days=1))
+
+    # Apply category filter if provided
+    if category:
+        query = query.where(Focus.category == category)
+
+    return await paginate_async(
+        session,
+        query,
+        keys=[Focus.due_date, Focus.id],
+        key_types=[datetime, int],
+        limit=limit,
+        before=before,
+        after=after,
+    )
+
+
+async def delete_focus_item_async(
+    session: AsyncSession, profile_id: uuid.UUID, focus_id: int
+) -> Optional[Focus]:
+    """
+    Tombstones the focus item in a single UPDATE. The row and its vector are removed later, a batch
+    at a time, by `purge_deleted_focus_items`. Returns the tombstoned item, or None when the profile
+    has no such item.
+    """
+    now = datetime.utcnow()
+    return await session.scalar(
+        update(Focus)
+        .where(Focus.id == focus_id, Focus.profile_id == profile_id, Focus.deleted_at.is_(None))
+        .values(state=FocusState.deleted.value, deleted_at=now, updated_at=now)
+        .returning(Focus)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+
+
+def purge_deleted_focus_items(session: Session, deleted_before: datetime, limit: int) -> int:
+    """
+    Removes up to `limit` focus items tombstoned before `deleted_before`, deleting their vectors
+    first. Rows stay in place when the vector store fails, so that the next run retries them.
+    Returns the number of rows removed. The caller commits.
+    """
+    rows = session.execute(
+        select(Focus.id, Focus.in_vector_store)
+        .where(Focus.deleted_at < deleted_before)
+        .order_by(Focus.deleted_at)
+        .limit(limit)
+        # Concurrent purges take different batches
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+
+    vector_ids = [str(row.id) for row in rows if row.in_vector_store]
+    if vector_ids:
+        chroma_service.vector_store.delete(ids=vector_ids)
+
+    session.execute(delete(Focus).where(Focus.id.in_([row.id for row in rows])))
+    return len(rows)
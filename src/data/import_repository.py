@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+import traceback
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, List, Tuple
+
+import pydantic
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.data.agenda_repository import update_profile_agenda_async
+from src.data.db import SessionLocal
+from src.data.focus_repository import add_focus_items_to_vector_store
+from src.data.models.focus import Focus, FocusItemBase
+from src.data.models.import_job import ImportJob, ImportJobState
+from src.utils.date_tools import parse_due_date
+from src.utils.logger import logger
+
+IMPORT_MAX_ITEMS = 10_000
+# Rows per multi-row INSERT
+IMPORT_INSERT_BATCH_SIZE = 1000
+# Documents per call to the vector store, which embeds each call's documents in one request
+IMPORT_EMBED_BATCH_SIZE = 500
+# Imports that failed, or stalled along with the process embedding them, are resumed until this old
+IMPORT_RETRY_HOURS = 24
+# An import still embedding whose progress has not moved for this long has stalled
+IMPORT_STALLED_AFTER_MINUTES = 15
+
+# Apps that tasks are imported from rarely have more than the text, so the rest falls back to
+# the same defaults as `Focus`
+IMPORT_DEFAULTS = {
+    "category": "general",
+    "priority": 4,
+    "sentiment": "neutral",
+    "task_size": "medium",
+    "type": "task",
+}
+
+
+class ImportValidationError(ValueError):
+    def __init__(self, errors: List[dict]):
+        super().__init__(f"{len(errors)} invalid rows")
+        self.errors = errors
+
+
+def parse_import_rows(body: bytes, content_type: str) -> List[dict]:
+    """
+    Reads the rows of an import, sent either as CSV with a header row, or as a JSON list of
+    objects, optionally wrapped as `{"items": [...]}`.
+    """
+    if content_type.startswith("text/csv"):
+        reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+        # Empty cells fall back to the defaults, like missing columns
+        return [{key: value for key, value in row.items() if value} for row in reader]
+
+    try:
+        rows: Any = json.loads(body)
+    except ValueError:
+        raise ImportValidationError([{"row": None, "errors": ["Body is not valid JSON"]}])
+
+    if isinstance(rows, dict):
+        rows = rows.get("items")
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ImportValidationError([{"row": None, "errors": ["Expected a list of objects"]}])
+
+    return rows
+
+
+def validate_import_rows(rows: List[dict]) -> List[FocusItemBase]:
+    """
+    Validates every row, and raises `ImportValidationError` with the errors of each invalid row,
+    numbered from 1, so that an import is saved in full or not at all.
+    """
+    if len(rows) == 0 or len(rows) > IMPORT_MAX_ITEMS:
+        raise ImportValidationError(
+            [{"row": None, "errors": [f"Expected between 1 and {IMPORT_MAX_ITEMS} rows"]}]
+        )
+
+    items, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        try:
+            item = FocusItemBase.model_validate({**IMPORT_DEFAULTS, **row})
+            parse_due_date(item.due_date)
+            items.append(item)
+        except pydantic.ValidationError as e:
+            errors.append({"row": number, "errors": [error["msg"] for error in e.errors()]})
+        except ValueError:
+            errors.append({"row": number, "errors": ["Invalid due_date"]})
+
+    if errors:
+        raise ImportValidationError(errors)
+
+    return items
+
+
+async def create_import_job_async(
+    session: AsyncSession, profile_id: uuid.UUID, items: List[FocusItemBase]
+) -> Tuple[ImportJob, List[int]]:
+    """
+    Inserts the imported items a batch at a time, and records the job that adds them to the
+    vector store. Returns the job and the ids of the inserted items, in the order of `items`.
+    """
+    job = ImportJob(profile_id=profile_id, total=len(items))
+    session.add(job)
+    # The job is inserted before the items that reference it
+    await session.flush()
+
+    statement = insert(Focus).returning(Focus.id, sort_by_parameter_order=True)
+    due_dates = [parse_due_date(item.due_date) for item in items]
+    focus_ids: List[int] = []
+    for start in range(0, len(items), IMPORT_INSERT_BATCH_SIZE):
+        end = start + IMPORT_INSERT_BATCH_SIZE
+        result = await session.scalars(
+            statement,
+            [
+                {
+                    **item.model_dump(exclude={"due_date"}),
+                    "due_date": due_date,
+                    "profile_id": profile_id,
+                    "import_job_id": job.id,
+                }
+                for item, due_date in zip(items[start:end], due_dates[start:end])
+            ],
+        )
+        focus_ids.extend(result)
+
+    await update_profile_agenda_async(session, profile_id, due_dates)
+
+    return job, focus_ids
+
+
+def embed_imported_focus_items(job_id: uuid.UUID, focus_ids: List[int]):
+    """
+    Adds the items of an import to the vector store in batches, committing the job's progress
+    after each one. Runs after the import request has returned.
+    """
+    with SessionLocal() as session:
+        job = session.get(ImportJob, job_id)
+        try:
+            for start in range(0, len(focus_ids), IMPORT_EMBED_BATCH_SIZE):
+                focus_items = list(
+                    session.scalars(
+                        select(Focus)
+                        .where(Focus.id.in_(focus_ids[start : start + IMPORT_EMBED_BATCH_SIZE]))
+                        .order_by(Focus.id)
+                    )
+                )
+                if add_focus_items_to_vector_store(focus_items=focus_items, base_items=[]) is None:
+                    raise RuntimeError("Error adding focus items to the vector store")
+
+                job.embedded += len(focus_items)
+                session.commit()
+
+            job.state = ImportJobState.completed.value
+            session.commit()
+            logger.info(f"Import {job_id} completed with {job.embedded} items")
+        except Exception as e:
+            traceback.print_exc()
+            logger.error(f"Error embedding import {job_id}: {e}")
+            session.rollback()
+            job.state = ImportJobState.failed.value
+            job.error = str(e)
+            session.commit()
+
+
+def get_resumable_import_jobs(session: Session) -> List[ImportJob]:
+    """
+    Returns the imports from the last `IMPORT_RETRY_HOURS` that failed, or that stalled, most
+    likely because the process embedding them was restarted.
+    """
+    now = datetime.utcnow()
+    return list(
+        session.scalars(
+            select(ImportJob)
+            .where(ImportJob.created_at > now - timedelta(hours=IMPORT_RETRY_HOURS))
+            .where(
+                or_(
+                    ImportJob.state == ImportJobState.failed.value,
+                    and_(
+                        ImportJob.state == ImportJobState.embedding.value,
+                        ImportJob.updated_at < now - timedelta(minutes=IMPORT_STALLED_AFTER_MINUTES),
+                    ),
+                )
+            )
+            .order_by(ImportJob.created_at)
+        )
+    )
+
+
+def get_unembedded_import_items(session: Session, job: ImportJob) -> List[int]:
+    """
+    Returns the ids of the live items of an import that are not in the vector store yet.
+    """
+    return list(
+        session.scalars(
+            select(Focus.id)
+            .where(
+                Focus.import_job_id == job.id,
+                Focus.in_vector_store.is_(False),
+                Focus.deleted_at.is_(None),
+            )
+            .order_by(Focus.id)
+        )
+    )
@@ -0,0 +1,116 @@
+"""
+Finds indexes that cost writes without serving reads: duplicates of another index, and indexes that
+no query has used.
+
+Usage:
+    DATABASE_URL=postgresql://... python -m src.data.index_audit
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+from sqlalchemy import Connection, text
+
+# Indexes of the same table with the same method, columns, operator classes, expressions and
+# predicate, listed with the one to keep first: the primary key, then constraints, then unique indexes
+_DUPLICATE_INDEXES = text(
+    """
+    SELECT
+        table_class.relname AS table_name,
+        array_agg(
+            index_class.relname
+            ORDER BY index.indisprimary DESC, constraint_oid IS NOT NULL DESC, index.indisunique DESC,
+                index_class.relname
+        ) AS index_names
+    FROM pg_index AS index
+    JOIN pg_class AS index_class ON index_class.oid = index.indexrelid
+    JOIN pg_class AS table_class ON table_class.oid = index.indrelid
+    LEFT JOIN LATERAL (
+        SELECT oid AS constraint_oid FROM pg_constraint WHERE conindid = index.indexrelid LIMIT 1
+    ) AS index_constraint ON true
+    WHERE table_class.relnamespace = current_schema()::regnamespace
+    GROUP BY
+        table_class.relname,
+        index_class.relam,
+        index.indkey::text,
+        index.indclass::text,
+        index.indcollation::text,
+        coalesce(pg_get_expr(index.indexprs, index.indrelid), ''),
+        coalesce(pg_get_expr(index.indpred, index.indrelid), '')
+    HAVING count(*) > 1
+    ORDER BY table_class.relname
+    """
+)
+
+# Indexes no scan has used since statistics were last reset. Indexes that enforce uniqueness are left
+# out, as they do their job without being scanned.
+_UNUSED_INDEXES = text(
+    """
+    SELECT
+        stats.relname AS table_name,
+        stats.indexrelname AS index_name,
+        pg_relation_size(stats.indexrelid) AS size
+    FROM pg_stat_user_indexes AS stats
+    JOIN pg_index AS index ON index.indexrelid = stats.indexrelid
+    WHERE stats.schemaname = current_schema() AND stats.idx_scan = 0 AND NOT index.indisunique
+    ORDER BY size DESC, stats.indexrelname
+    """
+)
+
+
+@dataclass(frozen=True)
+class DuplicateIndexes:
+    table_name: str
+    kept: str
+    redundant: List[str]
+
+
+@dataclass(frozen=True)
+class UnusedIndex:
+    table_name: str
+    index_name: str
+    size: int
+
+
+def find_duplicate_indexes(connection: Connection) -> List[DuplicateIndexes]:
+    """
+    Returns each set of identical indexes in the current schema, with the index to keep and those
+    that can be dropped.
+    """
+    return [
+        DuplicateIndexes(table_name=row.table_name, kept=row.index_names[0], redundant=row.index_names[1:])
+        for row in connection.execute(_DUPLICATE_INDEXES)
+    ]
+
+
+def find_unused_indexes(connection: Connection) -> List[UnusedIndex]:
+    """
+    Returns the indexes of the current schema that have not been scanned, largest first.
+
+    Scans are counted per server since statistics were last reset, so run this against the primary
+    and each replica, after they have served a representative amount of traffic.
+    """
+    return [
+        UnusedIndex(table_name=row.table_name, index_name=row.index_name, size=row.size)
+        for row in connection.execute(_UNUSED_INDEXES)
+    ]
+
+
+def main():
+    from src.data.db import engine
+
+    with engine.connect() as connection:
+        duplicates = find_duplicate_indexes(connection)
+        unused = find_unused_indexes(connection)
+
+    print("Duplicate indexes:")
+    for duplicate in duplicates:
+        print(f"  {duplicate.table_name}: {', '.join(duplicate.redundant)} duplicate {duplicate.kept}")
+
+    print("Unused indexes:")
+    for index in unused:
+        print(f"  {index.table_name}: {index.index_name} ({index.size / 1024**2:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
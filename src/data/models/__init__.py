@@ -1,9 +1,11 @@
 from src.data.models.action import Action
-from src.data.models.chat import Chat, ChatState, Message
+from src.data.models.agenda import ProfileAgenda
+from src.data.models.chat import Chat, ChatArchive, ChatState, Message
 from src.data.models.context import Context, SystemState
 from src.data.models.entity import Entity
 from src.data.models.entity_memory import EntityMemory
 from src.data.models.focus import Focus
+from src.data.models.import_job import ImportJob
 from src.data.models.memory import Memory
 from src.data.models.memory_tags import memory_tags
 from src.data.models.note import Note
@@ -16,15 +18,18 @@ from src.data.models.user import Profile, User
 __all__ = [
     "Action",
     "Chat",
+    "ChatArchive",
     "ChatState",
     "Context",
     "Entity",
     "EntityMemory",
     "Focus",
+    "ImportJob",
     "Memory",
     "Message",
     "Note",
     "Profile",
+    "ProfileAgenda",
     "Queue",
     "Relationship",
     "SystemState",
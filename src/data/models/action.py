@@ -5,6 +5,7 @@ from sqlalchemy import UUID, Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.data.db import Base
+from src.utils.ids import uuid7
 
 
 class Action(Base):
@@ -12,9 +13,7 @@ class Action(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
-        unique=True,
+        default=uuid7,
     )
     queue_id = Column(UUID(as_uuid=True), ForeignKey("queues.id"))
     type = Column(String, nullable=False)
@@ -0,0 +1,63 @@
+import uuid
+from datetime import date, datetime
+from typing import List
+
+import pydantic
+from sqlalchemy import UUID, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.data.db import Base
+from src.data.models.focus import FocusItem
+
+
+class FocusAgenda(pydantic.BaseModel):
+    agenda_date: date
+    timezone: str
+    due_today: List[FocusItem]
+    due_this_week: List[FocusItem]
+    overdue: List[FocusItem]
+    overdue_count: int
+    undated: List[FocusItem]
+    undated_count: int
+
+
+class ProfileAgenda(Base):
+    """
+    A profile's open focus items due today and over the coming week, and the latest of those overdue
+    and of those without a due date.
+    Rebuilt on the focus writes that can change it, so the home screen and the chat context read
+    one row instead of scanning `focus`.
+    """
+
+    __tablename__ = "profile_agendas"
+
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("profiles.id"), primary_key=True
+    )
+    # The day boundaries are those of this timezone, as last requested by the client
+    timezone: Mapped[str] = mapped_column(String, nullable=False, default="UTC")
+    # The local day the agenda was built for. An agenda built on an earlier day is stale.
+    agenda_date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Serialized `FocusItem`s, ordered by due date
+    due_today: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    due_this_week: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    # The most recently due of the overdue items. `overdue_count` counts all of them.
+    overdue: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    overdue_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # The most recently created of the items without a due date. `undated_count` counts all of them.
+    undated: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    undated_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_model(self) -> FocusAgenda:
+        return FocusAgenda(
+            agenda_date=self.agenda_date,
+            timezone=self.timezone,
+            due_today=self.due_today,
+            due_this_week=self.due_this_week,
+            overdue=self.overdue,
+            overdue_count=self.overdue_count,
+            undated=self.undated,
+            undated_count=self.undated_count,
+        )
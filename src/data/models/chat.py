@@ -1,14 +1,32 @@
 import datetime
 import enum
+import json
 import traceback
 import uuid
+import zlib
+from typing import Iterable, Sequence
 
 from pydantic import BaseModel
-from sqlalchemy import ARRAY, UUID, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    ARRAY,
+    DDL,
+    UUID,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    event,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
-from src.data.db import Base
+from src.data.db import Base, values_enum
 from src.data.models import focus
+from src.utils.ids import uuid7
 
 
 class MessageRole(enum.Enum):
@@ -21,25 +39,36 @@ class ChatState(enum.Enum):
     ACTIVE = "ACTIVE"
     INACTIVE = "INACTIVE"
     ENDED = "ENDED"
+    # Ended, with the messages moved into `chat_archives`
+    ARCHIVED = "ARCHIVED"
 
 
 class Chat(Base):
     __tablename__ = "chats"
+    __table_args__ = (
+        # Serves `get_active_chat`, which only ever looks for the latest active chat
+        Index(
+            "ix_chats_profile_id_created_at_active",
+            "profile_id",
+            "created_at",
+            postgresql_where=text("state = 'ACTIVE'"),
+        ),
+        # Serves `archive_ended_chats`, which takes the ended chats in batches, oldest first
+        Index("ix_chats_ended_at_ended", "ended_at", "id", postgresql_where=text("state = 'ENDED'")),
+    )
+
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
-        unique=True,
+        default=uuid7,
     )
     title: Mapped[str] = mapped_column(String, nullable=False)
     profile_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("profiles.id"))
-    state: Mapped[str] = mapped_column(String, nullable=False, default=ChatState.ACTIVE.value)
+    state: Mapped[str] = mapped_column(values_enum(ChatState), nullable=False, default=ChatState.ACTIVE.value)
 
     # Metadata
-    created_at: Mapped[datetime.datetime] = mapped_column(
-        DateTime, default=datetime.datetime.now(datetime.UTC)
-    )
+    created_at: Mapped[datetime.datetime] = mapped_column(DateTime, default=datetime.datetime.utcnow)
+    ended_at: Mapped[datetime.datetime | None] = mapped_column(DateTime, nullable=True)
 
     def to_json(self):
         return {
@@ -67,35 +96,37 @@ class MessageOutput(BaseModel):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_chat_id_created_at", "chat_id", "created_at"),
+        Index("ix_messages_profile_id_created_at", "profile_id", "created_at"),
+        # Monthly partitions are created ahead of time and expired by `src/crons/partition_crons.py`
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # Postgres requires the partition key in the table's primary key, but messages are still identified by id
+    __mapper_args__ = {"primary_key": ["id"]}
+
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
-        unique=True,
+        default=uuid7,
     )
     message: Mapped[str] = mapped_column(String)
-    role: Mapped[str] = mapped_column(String, nullable=False)
+    role: Mapped[str] = mapped_column(values_enum(MessageRole), nullable=False)
     chat_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("chats.id"))
     profile_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("profiles.id"))
     created_at: Mapped[datetime.datetime] = mapped_column(
-        DateTime, default=datetime.datetime.now(datetime.UTC)
+        DateTime, primary_key=True, default=datetime.datetime.utcnow
     )
 
     focus_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=True)
 
-    def get_focus_items(self, session) -> list[focus.FocusItem]:
-        if self.focus_ids:
-            focus_items = session.query(focus.Focus).filter(focus.Focus.id.in_(self.focus_ids)).all()
-            return [item.to_model() for item in focus_items]
-        return []
-
     def to_model(self, session: Session) -> MessageOutput:
-        if self.focus_ids:
-            focus_items = self.get_focus_items(session)
-        else:
-            focus_items = []
+        return messages_to_models(session, [self])[0]
 
+    async def to_model_async(self, session: AsyncSession) -> MessageOutput:
+        return (await messages_to_models_async(session, [self]))[0]
+
+    def _to_output(self, focus_items: list[focus.FocusItem]) -> MessageOutput:
         try:
             return MessageOutput(
                 id=self.id,
@@ -115,6 +146,101 @@ class Message(Base):
         return f"<Message(id={self.id}, message={self.message})>"
 
 
+class ChatArchive(Base):
+    """
+    The messages of an ended chat, moved out of `messages` as one compressed blob once the chat
+    is old enough that it is rarely read.
+    """
+
+    __tablename__ = "chat_archives"
+
+    chat_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("chats.id"), primary_key=True)
+    message_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    # zlib-compressed JSON list of the messages, oldest first
+    messages: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    archived_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.datetime.utcnow
+    )
+
+    @classmethod
+    def from_messages(cls, chat_id: uuid.UUID, messages: Sequence[Message]) -> "ChatArchive":
+        payload = [
+            {
+                "id": str(message.id),
+                "message": message.message,
+                "role": message.role,
+                "profile_id": str(message.profile_id),
+                "created_at": message.created_at.isoformat(),
+                "focus_ids": message.focus_ids,
+            }
+            for message in messages
+        ]
+        return cls(
+            chat_id=chat_id,
+            message_count=len(payload),
+            messages=zlib.compress(json.dumps(payload).encode()),
+        )
+
+    def to_messages(self) -> list[Message]:
+        """
+        Rebuilds the archived messages as transient `Message` objects, which are never added to a session.
+        """
+        return [
+            Message(
+                id=uuid.UUID(item["id"]),
+                message=item["message"],
+                role=item["role"],
+                chat_id=self.chat_id,
+                profile_id=uuid.UUID(item["profile_id"]),
+                created_at=datetime.datetime.fromisoformat(item["created_at"]),
+                focus_ids=item["focus_ids"],
+            )
+            for item in json.loads(zlib.decompress(self.messages))
+        ]
+
+
+# Catches rows for months that have no partition yet
+event.listen(
+    Message.__table__, "after_create", DDL("CREATE TABLE messages_default PARTITION OF messages DEFAULT")
+)
+
 Chat.messages = relationship("Message", back_populates="chat")
 Chat.profile = relationship("Profile", back_populates="chats")
 Message.chat = relationship("Chat", back_populates="messages")
+
+
+def _collect_focus_ids(messages: Sequence[Message]) -> set[int]:
+    return {focus_id for message in messages for focus_id in message.focus_ids or []}
+
+
+def _assemble_outputs(messages: Sequence[Message], focus_items: Iterable[focus.Focus]) -> list[MessageOutput]:
+    focus_by_id = {item.id: item.to_model() for item in focus_items}
+    return [
+        message._to_output(
+            [focus_by_id[focus_id] for focus_id in message.focus_ids or [] if focus_id in focus_by_id]
+        )
+        for message in messages
+    ]
+
+
+def _select_message_focus_items(focus_ids: Iterable[int]):
+    # Deleted items drop out of the messages that reference them
+    return select(focus.Focus).where(focus.Focus.id.in_(focus_ids), focus.Focus.deleted_at.is_(None))
+
+
+def messages_to_models(session: Session, messages: Sequence[Message]) -> list[MessageOutput]:
+    """
+    Serializes a page of messages, loading every focus item they reference in a single query.
+    """
+    focus_ids = _collect_focus_ids(messages)
+    focus_items = session.scalars(_select_message_focus_items(focus_ids)).all() if focus_ids else []
+    return _assemble_outputs(messages, focus_items)
+
+
+async def messages_to_models_async(session: AsyncSession, messages: Sequence[Message]) -> list[MessageOutput]:
+    """
+    Serializes a page of messages, loading every focus item they reference in a single query.
+    """
+    focus_ids = _collect_focus_ids(messages)
+    focus_items = (await session.scalars(_select_message_focus_items(focus_ids))).all() if focus_ids else []
+    return _assemble_outputs(messages, focus_items)
@@ -13,8 +13,6 @@ class Context(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     name = Column(String, nullable=False)
     content = Column(String, nullable=False)
@@ -32,8 +30,6 @@ class SystemState(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     current_focus = Column(String)
     mood = Column(String)
@@ -13,8 +13,6 @@ class Entity(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     name = Column(String, nullable=False)
     type = Column(String, nullable=False)
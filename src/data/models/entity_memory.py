@@ -12,8 +12,6 @@ class EntityMemory(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     entity_id = Column(UUID(as_uuid=True), ForeignKey("entities.id"))
     memory_id = Column(UUID(as_uuid=True), ForeignKey("memories.id"))
@@ -1,15 +1,29 @@
 import uuid
-from datetime import UTC, datetime
+from datetime import datetime
 from enum import Enum
 from typing import List, Optional
 
 import pydantic
-from langchain.pydantic_v1 import BaseModel, Field
-from sqlalchemy import UUID, Boolean, ForeignKey, Integer, String
+from langchain.pydantic_v1 import BaseModel, Field, validator
+from sqlalchemy import (
+    DDL,
+    UUID,
+    Boolean,
+    Computed,
+    ForeignKey,
+    Index,
+    Integer,
+    bindparam,
+    event,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, Session, mapped_column
 from sqlalchemy.types import DateTime
 
-from src.data.db import Base
+from src.data.db import Base, values_enum
 from src.utils.date_tools import date_to_iso
 
 
@@ -54,6 +68,8 @@ class Category(str, Enum):
     legal = "legal"
     events = "events"
     projects = "projects"
+    # Items that fit no other category, and the default of imported items
+    general = "general"
 
 
 class Sentiment(str, Enum):
@@ -64,7 +80,7 @@ class Sentiment(str, Enum):
 
 class UserIntentTask(BaseModel):
     id: str
-    category: str = Field(description="The category of the life management task.")
+    category: Category = Field(description="The category of the life management task.")
     due_date: Optional[str] = Field(
         None,
         description="The deadline for completing the item in YYYY-MM-DDTHH:MM format. Example: due_date: 2023-01-01T12:00",
@@ -82,15 +98,23 @@ class UserIntentTask(BaseModel):
     text: str
     type: ItemType
 
+    @validator("category", pre=True)
+    def fall_back_to_general(cls, category):
+        # A category off the list would otherwise fail the whole batch of tasks the model returned
+        try:
+            return Category(category.lower() if isinstance(category, str) else category)
+        except ValueError:
+            return Category.general
+
 
 class FocusItemBase(pydantic.BaseModel):
-    category: str
+    category: Category
     due_date: Optional[str] = None
     priority: int
-    sentiment: str
-    task_size: str
+    sentiment: Sentiment
+    task_size: TaskSize
     text: str
-    type: str
+    type: ItemType
 
 
 class FocusItem(FocusItemBase):
@@ -101,25 +125,74 @@ class FocusItem(FocusItemBase):
     updated_at: datetime
 
 
+# Predicate of the partial indexes on focus items that have not been deleted
+LIVE_ITEMS = text("deleted_at IS NULL")
+
+
 class Focus(Base):
     __tablename__ = "focus"
+    __table_args__ = (
+        # Deleted items are tombstoned until they are purged, and left out of every index that reads
+        # use. Queries must filter on `deleted_at IS NULL` to use them.
+        Index("ix_focus_profile_id_due_date", "profile_id", "due_date", postgresql_where=LIVE_ITEMS),
+        Index("ix_focus_profile_id_state", "profile_id", "state", postgresql_where=LIVE_ITEMS),
+        Index(
+            "ix_focus_text_search",
+            "text_search",
+            postgresql_using="gin",
+            postgresql_where=LIVE_ITEMS,
+        ),
+        # Trigram similarity, which resolves the tasks users refer to in their own words
+        Index(
+            "ix_focus_text_trgm",
+            "text",
+            postgresql_using="gin",
+            postgresql_ops={"text": "gin_trgm_ops"},
+            postgresql_where=LIVE_ITEMS,
+        ),
+        # Finds the tombstones due for purging
+        Index("ix_focus_deleted_at", "deleted_at", postgresql_where=text("deleted_at IS NOT NULL")),
+        # Finds the items of an import that is resumed
+        Index("ix_focus_import_job_id", "import_job_id", postgresql_where=text("import_job_id IS NOT NULL")),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    category: Mapped[str] = mapped_column(String, nullable=False, default="general")
-    due_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    # Native enums, which take four bytes in the row and in `ix_focus_profile_id_state`
+    category: Mapped[str] = mapped_column(
+        values_enum(Category), nullable=False, default=Category.general.value
+    )
+    # Stored as `timestamptz`, so Postgres can bucket due dates by any client's local day
+    due_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     priority: Mapped[int] = mapped_column(Integer, nullable=False, default=4)
-    sentiment: Mapped[str] = mapped_column(String, nullable=False, default="neutral")
-    state: Mapped[FocusState] = mapped_column(String, nullable=False, default=FocusState.backlog.value)
-    task_size: Mapped[str] = mapped_column(String, nullable=False, default="medium")
+    sentiment: Mapped[str] = mapped_column(
+        values_enum(Sentiment), nullable=False, default=Sentiment.neutral.value
+    )
+    state: Mapped[str] = mapped_column(
+        values_enum(FocusState), nullable=False, default=FocusState.backlog.value
+    )
+    task_size: Mapped[str] = mapped_column(
+        values_enum(TaskSize), nullable=False, default=TaskSize.medium.value
+    )
     text: Mapped[str] = mapped_column(nullable=False)
-    type: Mapped[str] = mapped_column(nullable=False, default="task")
+    type: Mapped[str] = mapped_column(values_enum(ItemType), nullable=False, default=ItemType.task.value)
     in_vector_store: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Maintained by Postgres for full-text search. Deferred, as it is only ever filtered on.
+    text_search: Mapped[str] = mapped_column(
+        TSVECTOR, Computed("to_tsvector('english', text)", persisted=True), deferred=True
+    )
 
     # Relationships
     profile_id: Mapped[uuid.UUID] = mapped_column(UUID, ForeignKey("profiles.id"), nullable=False)
+    # The bulk import that created the item, if any
+    import_job_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID, ForeignKey("import_jobs.id"), nullable=True
+    )
 
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now(UTC))
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now(UTC))
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    # Set along with the `deleted` state. The row and its vector are removed later by the purge job.
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     def to_model(self) -> FocusItem:
         return FocusItem(
@@ -158,18 +231,25 @@ class Focus(Base):
         }
 
 
+# The trigram index needs the extension, which migrations create for real databases
+event.listen(Focus.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 def get_focus_by_profile_id(session: Session, profile_id: uuid.UUID):
-    return session.query(Focus).filter(Focus.profile_id == profile_id).all()
+    return session.query(Focus).filter(Focus.profile_id == profile_id, Focus.deleted_at.is_(None)).all()
+
+
+# Prebuilt, like the per-request user lookups in `models/user.py`
+_select_focus_by_id = select(Focus).where(Focus.id == bindparam("focus_id"), Focus.deleted_at.is_(None))
 
 
 def get_focus_by_id(session: Session, focus_id: int) -> Focus | None:
-    return session.query(Focus).filter(Focus.id == focus_id).first()
+    return session.scalar(_select_focus_by_id, {"focus_id": focus_id})
 
 
 def create_focus(session: Session, text: str, profile_id: uuid.UUID) -> Focus:
     focus = Focus(text=text, profile_id=profile_id)
     session.add(focus)
-    session.commit()
     session.flush()
     return focus
 
@@ -177,6 +257,23 @@ def create_focus(session: Session, text: str, profile_id: uuid.UUID) -> Focus:
 def complete_focus(session: Session, focus_id: int) -> Focus:
     focus = get_focus_by_id(session, focus_id)
     focus.state = FocusState.completed.value  # type: ignore
-    session.commit()
     session.flush()
     return focus
+
+
+async def get_focus_by_profile_id_async(session: AsyncSession, profile_id: uuid.UUID) -> List[Focus]:
+    focus_items = await session.scalars(
+        select(Focus).where(Focus.profile_id == profile_id, Focus.deleted_at.is_(None))
+    )
+    return list(focus_items)
+
+
+async def get_focus_by_id_async(session: AsyncSession, focus_id: int) -> Focus | None:
+    return await session.scalar(_select_focus_by_id, {"focus_id": focus_id})
+
+
+async def complete_focus_async(session: AsyncSession, focus_id: int) -> Focus:
+    focus = await get_focus_by_id_async(session, focus_id)
+    focus.state = FocusState.completed.value  # type: ignore
+    await session.flush()
+    return focus
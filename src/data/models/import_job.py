@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+import pydantic
+from sqlalchemy import UUID, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.data.db import Base
+
+
+class ImportJobState(Enum):
+    # The items are saved and waiting to be added to the vector store
+    embedding = "embedding"
+    completed = "completed"
+    # Adding to the vector store failed. `resume_imports` retries the remaining items for a day.
+    failed = "failed"
+
+
+class ImportJobOutput(pydantic.BaseModel):
+    id: uuid.UUID
+    state: ImportJobState
+    total: int
+    embedded: int
+    error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
+
+
+class ImportJob(Base):
+    """
+    A bulk import of focus items. The items are inserted when the import is accepted, and
+    added to the vector store in batches afterwards, with progress recorded here.
+    """
+
+    __tablename__ = "import_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("profiles.id"), nullable=False, index=True
+    )
+    state: Mapped[str] = mapped_column(String, nullable=False, default=ImportJobState.embedding.value)
+    total: Mapped[int] = mapped_column(Integer, nullable=False)
+    embedded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def to_model(self) -> ImportJobOutput:
+        return ImportJobOutput(
+            id=self.id,
+            state=self.state,
+            total=self.total,
+            embedded=self.embedded,
+            error=self.error,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
@@ -5,6 +5,7 @@ from sqlalchemy import UUID, DateTime, ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.data.db import Base
+from src.utils.ids import uuid7
 
 
 class Note(Base):
@@ -12,9 +13,7 @@ class Note(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
-        unique=True,
+        default=uuid7,
     )
     content: Mapped[str] = mapped_column(String, nullable=False)
     profile_id: Mapped[str] = mapped_column(UUID(as_uuid=True), ForeignKey("profiles.id"))
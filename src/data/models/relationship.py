@@ -12,8 +12,6 @@ class Relationship(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     entity1_id = Column(UUID(as_uuid=True), ForeignKey("entities.id"))
     entity2_id = Column(UUID(as_uuid=True), ForeignKey("entities.id"))
@@ -13,8 +13,6 @@ class Tag(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     name = Column(String, nullable=False)
     profile_id = Column(UUID(as_uuid=True), ForeignKey("profiles.id"))
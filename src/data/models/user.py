@@ -2,8 +2,9 @@ import uuid
 from datetime import UTC, datetime, timedelta
 from typing import Optional
 
-from sqlalchemy import UUID, Boolean, Column, DateTime, ForeignKey, String
-from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
+from sqlalchemy import UUID, Boolean, Column, DateTime, ForeignKey, String, bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapped, Session, joinedload, mapped_column, relationship
 
 from src.data.db import Base
 from src.utils.security import REFRESH_TOKEN_EXPIRE_DAYS
@@ -16,8 +17,6 @@ class User(Base):
         UUID(as_uuid=True),
         primary_key=True,
         nullable=False,
-        index=True,
-        unique=True,
     )
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -38,8 +37,6 @@ class RefreshToken(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True)
     user = relationship("User", back_populates="refresh_tokens")
@@ -62,19 +59,17 @@ class Profile(Base):
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
-        unique=True,
     )
     full_name: Mapped[str | None] = mapped_column(String, nullable=True)
     provider: Mapped[str] = mapped_column(String, nullable=False)
 
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+    )
     user = relationship("User", back_populates="profile")
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now(UTC))
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.now(UTC), onupdate=datetime.now(UTC)
-    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<Profile(id={self.id}, full_name={self.full_name})>"
@@ -103,8 +98,7 @@ def create_user(
         provider=provider,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    session.flush()
     return user
 
 
@@ -113,23 +107,70 @@ def create_profile(
 ) -> Profile:
     profile = Profile(full_name=name, provider=provider, user_id=user_id)
     session.add(profile)
-    session.commit()
+    session.flush()
     return profile
 
 
+# Lookups run on every authenticated request. Building a select() and generating its cache key
+# costs about as much Python time as the round trip itself, so these are built once and executed
+# with bound parameters.
+_select_user_by_id = select(User).where(User.id == bindparam("user_id"))
+_select_user_by_email = select(User).where(User.email == bindparam("email"))
+_select_profile_by_user_id = select(Profile).where(Profile.user_id == bindparam("user_id")).limit(1)
+# `Profile.user` is read by most profile routes and cannot be lazy loaded from an async session
+_select_profile_with_user_by_user_id = _select_profile_by_user_id.options(joinedload(Profile.user))
+
+
 def get_user_by_user_id(session: Session, user_id: uuid.UUID) -> User | None:
-    user = session.query(User).filter(User.id == user_id).first()
-    return user
+    return session.scalar(_select_user_by_id, {"user_id": user_id})
 
 
 def get_profile_by_user_id(session: Session, user_id: uuid.UUID) -> Profile | None:
-    profile = session.query(Profile).filter(Profile.user_id == user_id).first()
+    return session.scalar(_select_profile_by_user_id, {"user_id": user_id})
+
+
+async def create_user_async(
+    session: AsyncSession,
+    user_id: str,
+    email: str,
+    name: Optional[str] = None,
+    provider: Optional[str] = None,
+) -> User:
+    user = User(
+        id=user_id,
+        email=email,
+        name=name,
+        provider=provider,
+    )
+    session.add(user)
+    await session.flush()
+    return user
+
+
+async def create_profile_async(
+    session: AsyncSession, user_id: uuid.UUID, name: Optional[str] = None, provider: Optional[str] = "apple"
+) -> Profile:
+    profile = Profile(full_name=name, provider=provider, user_id=user_id)
+    session.add(profile)
+    await session.flush()
     return profile
 
 
+async def get_user_by_user_id_async(session: AsyncSession, user_id: uuid.UUID) -> User | None:
+    return await session.scalar(_select_user_by_id, {"user_id": user_id})
+
+
+async def get_user_by_email_async(session: AsyncSession, email: str) -> User | None:
+    return await session.scalar(_select_user_by_email, {"email": email})
+
+
+async def get_profile_by_user_id_async(session: AsyncSession, user_id: uuid.UUID) -> Profile | None:
+    return await session.scalar(_select_profile_with_user_by_user_id, {"user_id": user_id})
+
+
 def migrate_profile_to_user(session: Session, user: User, profile: Profile) -> User:
     user.name = profile.full_name
     user.provider = profile.provider
     session.add(user)
-    session.commit()
+    session.flush()
     return user
@@ -11,7 +11,7 @@ def create_note(session: Session, content: str, profile_id: uuid.UUID) -> Note |
     try:
         note = Note(content=content, profile_id=profile_id)
         session.add(note)
-        session.commit()
+        session.flush()
         return note
     except Exception as e:
         logger.error(f"Error saving note: {e}")
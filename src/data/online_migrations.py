@@ -0,0 +1,176 @@
+"""
+Schema changes that keep large tables writable while they run.
+
+A plain `CREATE INDEX` holds a lock that blocks every write to the table until the index is built,
+and a single `UPDATE` of a whole table holds its row locks until the migration commits. The helpers
+here build indexes `CONCURRENTLY` and backfill in short transactions instead. They need a connection
+outside of a transaction, which migrations get from an autocommit block:
+
+    def upgrade() -> None:
+        op.add_column("focus", sa.Column("due_day", sa.Date(), nullable=True))
+
+        with op.get_context().autocommit_block():
+            connection = op.get_bind()
+            backfill(connection, "focus", "due_day = due_date::date", where="due_day IS NULL")
+            create_index_concurrently(connection, "ix_focus_due_day", "focus", "profile_id, due_day")
+
+Everything before the block is committed when it starts, so a migration that fails inside the block
+is left partly applied. Each helper can be run again and picks up where it stopped.
+
+Migrations that only touch small tables, like `profile_agendas`, or that rewrite a table anyway, like
+changing a column's type, run in their transaction as before.
+
+`python -m benchmarks.online_migrations` rehearses them against millions of seeded rows.
+"""
+
+import time
+from typing import Optional
+
+from sqlalchemy import Connection, text
+
+from src.utils.logger import logger
+
+# Seconds between progress reports of a backfill
+BACKFILL_LOG_INTERVAL = 10
+
+
+def _require_autocommit(connection: Connection) -> None:
+    # Inside a transaction, concurrent builds fail and batches would all commit together at the end
+    if connection.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        raise ValueError("Online migrations need a connection in autocommit mode")
+
+
+def _relkind(connection: Connection, name: str) -> Optional[str]:
+    return connection.scalar(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": name}
+    )
+
+
+def _build_index(connection: Connection, name: str, table: str, definition: str, unique: bool) -> None:
+    """
+    Builds the index `name` on `table` without blocking writes. An invalid index, left behind by an
+    interrupted build, is dropped and built again.
+    """
+    valid = connection.scalar(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+    if valid:
+        return
+    if valid is False:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY {name}"))
+
+    connection.execute(
+        text(f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY {name} ON {table} {definition}")
+    )
+
+
+def create_index_concurrently(
+    connection: Connection,
+    name: str,
+    table: str,
+    columns: str,
+    unique: bool = False,
+    using: str = "btree",
+    where: Optional[str] = None,
+) -> None:
+    """
+    Creates the index `name` on `columns` of `table` without blocking writes, unless it already
+    exists. `connection` must be in autocommit mode.
+
+    Partitioned tables, like `messages`, cannot be indexed concurrently. Their index is created on
+    the parent table alone, then built concurrently on each partition and attached to it. Partitions
+    created afterwards get the index along with the table.
+    """
+    _require_autocommit(connection)
+    definition = f"USING {using} ({columns})" + (f" WHERE {where}" if where else "")
+
+    if _relkind(connection, table) != "p":
+        _build_index(connection, name, table, definition, unique)
+        return
+
+    # Stays invalid, and unused by the planner, until every partition has its index attached
+    connection.execute(
+        text(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON ONLY {table} {definition}")
+    )
+
+    partitions = connection.scalars(
+        text(
+            "SELECT inhrelid::regclass::text FROM pg_inherits "
+            "WHERE inhparent = to_regclass(:table) ORDER BY 1"
+        ),
+        {"table": table},
+    )
+    for partition in partitions.all():
+        partition_index = f"{partition}_{name}"[:63]
+        _build_index(connection, partition_index, partition, definition, unique)
+        # Does nothing when the index is already attached
+        connection.execute(text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+def drop_index_concurrently(connection: Connection, name: str) -> None:
+    """
+    Drops the index `name`, if it exists, without blocking reads or writes of its table.
+    `connection` must be in autocommit mode.
+
+    Indexes of partitioned tables cannot be dropped concurrently, and briefly lock the table and
+    every partition instead.
+    """
+    _require_autocommit(connection)
+    relkind = _relkind(connection, name)
+    if relkind is None:
+        return
+
+    concurrently = "" if relkind == "I" else "CONCURRENTLY "
+    connection.execute(text(f"DROP INDEX {concurrently}{name}"))
+
+
+def backfill(
+    connection: Connection,
+    table: str,
+    assignments: str,
+    where: str,
+    key: str = "id",
+    batch_size: int = 5000,
+    pause: float = 0.05,
+) -> int:
+    """
+    Runs `UPDATE table SET assignments` on the rows matching `where`, in batches of `batch_size`
+    rows taken in order of `key`, each committed on its own. `connection` must be in autocommit
+    mode. Returns the number of updated rows.
+
+    Each batch locks its rows for a moment only, and `pause` seconds between batches leave room for
+    other writes, autovacuum and replicas to keep up. `where` should exclude rows that are already
+    backfilled, so that a backfill that stopped part way resumes where it was.
+    """
+    _require_autocommit(connection)
+    update = f"UPDATE {table} SET {assignments} WHERE {key} IN (SELECT {key} FROM {table} WHERE ({where})"
+    first_batch = text(f"{update} ORDER BY {key} LIMIT :batch_size) RETURNING {key}")
+    next_batch = text(f"{update} AND {key} > :last ORDER BY {key} LIMIT :batch_size) RETURNING {key}")
+
+    updated = 0
+    last = None
+    started = reported = time.monotonic()
+    while True:
+        if last is None:
+            keys = connection.scalars(first_batch, {"batch_size": batch_size}).all()
+        else:
+            # Sent as text, which Postgres reads as the type of `key`
+            keys = connection.scalars(next_batch, {"last": str(last), "batch_size": batch_size}).all()
+        if not keys:
+            break
+
+        updated += len(keys)
+        last = max(keys)
+
+        if time.monotonic() - reported >= BACKFILL_LOG_INTERVAL:
+            reported = time.monotonic()
+            rate = int(updated / (reported - started))
+            logger.info(
+                "Backfilling", {"table": table, "rows": updated, "last": str(last), "rows_per_second": rate}
+            )
+        time.sleep(pause)
+
+    logger.info(
+        "Backfilled", {"table": table, "rows": updated, "seconds": round(time.monotonic() - started, 1)}
+    )
+    return updated
@@ -0,0 +1,135 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class PageInfo(BaseModel):
+    limit: int
+    has_more: bool
+    """Whether more items exist past this page in the direction it was fetched."""
+    before: Optional[str] = None
+    """Cursor for the items preceding this page."""
+    after: Optional[str] = None
+    """Cursor for the items following this page."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else str(value) for value in values]
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Unexpected cursor shape")
+
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(values, types)
+        )
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+async def paginate_async(
+    session: AsyncSession,
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    key_types: Sequence[type],
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    from_end: bool = False,
+) -> Tuple[List[Any], PageInfo]:
+    """
+    Fetches one page of `query` using keyset pagination over `keys`, which must uniquely order the rows.
+
+    Items are always returned in ascending key order. Without a cursor the first page is returned,
+    or the last page when `from_end` is set.
+
+    Raises:
+        ValueError: If both cursors are given, or a cursor cannot be decoded.
+    """
+    if before and after:
+        raise ValueError("Only one of `before` and `after` can be given")
+
+    key = tuple_(*keys)
+    if before:
+        query = query.where(key < decode_cursor(before, key_types))
+    elif after:
+        query = query.where(key > decode_cursor(after, key_types))
+
+    backwards = bool(before) or (from_end and not after)
+    order_by = [column.desc() for column in keys] if backwards else [column.asc() for column in keys]
+
+    items = list(await session.scalars(query.order_by(*order_by).limit(limit + 1)))
+    return _to_page(items, [column.key for column in keys], limit, backwards)
+
+
+def paginate_items(
+    items: Sequence[Any],
+    keys: Sequence[InstrumentedAttribute],
+    key_types: Sequence[type],
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    from_end: bool = False,
+) -> Tuple[List[Any], PageInfo]:
+    """
+    Same as `paginate_async`, over items already in memory, so that both share cursors.
+    """
+    if before and after:
+        raise ValueError("Only one of `before` and `after` can be given")
+
+    attributes = [column.key for column in keys]
+
+    def item_key(item) -> tuple:
+        return tuple(getattr(item, attribute) for attribute in attributes)
+
+    items = sorted(items, key=item_key)
+    if before:
+        cursor = decode_cursor(before, key_types)
+        items = [item for item in items if item_key(item) < cursor]
+    elif after:
+        cursor = decode_cursor(after, key_types)
+        items = [item for item in items if item_key(item) > cursor]
+
+    backwards = bool(before) or (from_end and not after)
+    items = items[::-1][: limit + 1] if backwards else items[: limit + 1]
+    return _to_page(items, attributes, limit, backwards)
+
+
+def _to_page(
+    items: List[Any], attributes: Sequence[str], limit: int, backwards: bool
+) -> Tuple[List[Any], PageInfo]:
+    """
+    Builds a page from up to `limit + 1` items fetched in the direction of travel.
+    """
+    has_more = len(items) > limit
+    items = items[:limit]
+    if backwards:
+        items.reverse()
+
+    def item_cursor(item) -> str:
+        return encode_cursor([getattr(item, attribute) for attribute in attributes])
+
+    return items, PageInfo(
+        limit=limit,
+        has_more=has_more,
+        before=item_cursor(items[0]) if items else None,
+        after=item_cursor(items[-1]) if items else None,
+    )
@@ -0,0 +1,86 @@
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import Connection, text
+
+# Monthly partitions of `messages` are named after the month they hold, e.g. `messages_2024_09`
+_MESSAGE_PARTITION_NAME = re.compile(r"^messages_(\d{4})_(\d{2})$")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def message_partition_name(month: date) -> str:
+    return f"messages_{month:%Y_%m}"
+
+
+def create_message_partitions(connection: Connection, start: date, months_ahead: int) -> List[str]:
+    """
+    Creates the monthly partitions of `messages` from the month of `start` through `months_ahead`
+    months later, skipping any that already exist. Returns the names of the created partitions.
+
+    Partitions must exist before rows for their month arrive. Rows that land in the default
+    partition first block the creation of their month's partition.
+    """
+    created = []
+    month = month_start(start)
+    for _ in range(months_ahead + 1):
+        name = message_partition_name(month)
+        if connection.scalar(text("SELECT to_regclass(:name)"), {"name": name}) is None:
+            connection.execute(
+                text(
+                    f"CREATE TABLE {name} PARTITION OF messages "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+            created.append(name)
+        month = add_months(month, 1)
+
+    return created
+
+
+def get_message_partitions(connection: Connection) -> List[tuple[str, date]]:
+    """
+    Returns the monthly partitions of `messages` with the month each one holds, oldest first.
+    """
+    names = connection.scalars(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = 'messages'::regclass"
+        )
+    )
+
+    partitions = []
+    for name in names:
+        match = _MESSAGE_PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def expire_message_partitions(connection: Connection, before: date, drop: bool = False) -> List[str]:
+    """
+    Detaches the monthly partitions of `messages` that hold months before `before`, and drops them
+    when `drop` is set. Detached partitions stay in the database as plain tables for archiving.
+    The default partition is never touched. Returns the names of the expired partitions.
+    """
+    expired = []
+    for name, month in get_message_partitions(connection):
+        if month >= month_start(before):
+            break
+
+        connection.execute(text(f"ALTER TABLE messages DETACH PARTITION {name}"))
+        if drop:
+            connection.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+
+    return expired
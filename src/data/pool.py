@@ -0,0 +1,81 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds, in milliseconds, of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class CheckoutWaitHistogram:
+    """
+    Records how long callers waited for a pooled connection.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = CHECKOUT_WAIT_BUCKETS_MS):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.timeouts = 0
+
+    def observe(self, wait_ms: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, wait_ms)] += 1
+            self.count += 1
+            self.total_ms += wait_ms
+            self.max_ms = max(self.max_ms, wait_ms)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            bounds = [str(bucket) for bucket in self.buckets] + ["+Inf"]
+            return {
+                "count": self.count,
+                "timeouts": self.timeouts,
+                "mean_ms": self.total_ms / self.count if self.count else 0.0,
+                "max_ms": self.max_ms,
+                "buckets": dict(zip(bounds, self.counts)),
+            }
+
+
+class _CheckoutWaitMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = CheckoutWaitHistogram()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.checkout_wait.record_timeout()
+            raise
+        finally:
+            self.checkout_wait.observe((time.perf_counter() - start) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),  # type: ignore[attr-defined]
+            "checked_out": self.checkedout(),  # type: ignore[attr-defined]
+            "checked_in": self.checkedin(),  # type: ignore[attr-defined]
+            # `overflow()` counts up from `-pool_size` until the pool is full
+            "overflow": max(self.overflow(), 0),  # type: ignore[attr-defined]
+            "checkout_wait_ms": self.checkout_wait.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(_CheckoutWaitMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutWaitMixin, AsyncAdaptedQueuePool):
+    pass
@@ -0,0 +1,68 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import Engine, event
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL statements executed, and the time spent in them, while tracking is active.
+    """
+
+    count: int = 0
+    duration_ms: float = 0.0
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Accumulates every statement executed in the current context, including threadpool
+    dependencies and async sessions started from it, into the yielded `QueryStats`.
+    """
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _record(conn.info["query_start_time"].pop())
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        _record(connection.info["query_start_time"].pop())
+
+
+def _record(start: float):
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration_ms += (time.perf_counter() - start) * 1000
+
+
+def instrument_engine(engine: Engine):
+    """
+    Registers the query counting hooks on `engine`. Pass `AsyncEngine.sync_engine` for async engines.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def format_server_timing(stats: QueryStats, total_ms: float) -> str:
+    return f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries", total;dur={total_ms:.2f}'
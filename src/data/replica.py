@@ -0,0 +1,99 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from src.utils.config import settings
+
+
+@dataclass
+class RequestWrites:
+    """
+    Whether any session of the current request committed a write.
+    """
+
+    committed: bool = False
+
+
+class ReadYourWritesTracker:
+    """
+    Remembers when a client last committed a write, so that its reads can skip the replica until it
+    has had time to replay them.
+
+    The time travels with the client in a cookie rather than staying in the process, so that whichever
+    worker serves its next request sees it.
+    """
+
+    cookie_name = "last_write_at"
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+
+    def wrote_recently(self, last_write_at: Optional[str]) -> bool:
+        """
+        Returns whether `last_write_at`, the cookie sent with a request, is within the window.
+        """
+        try:
+            written_at = float(last_write_at or "")
+        except ValueError:
+            return False
+        return 0 <= time.time() - written_at < self.window_seconds
+
+    def cookie(self) -> dict:
+        """
+        Returns the arguments of `Response.set_cookie` that record a write committed now.
+        """
+        return {
+            "key": self.cookie_name,
+            "value": f"{time.time():.3f}",
+            "max_age": math.ceil(self.window_seconds),
+            "httponly": True,
+            "samesite": "lax",
+        }
+
+
+read_your_writes = ReadYourWritesTracker(settings.DATABASE_REPLICA_READ_YOUR_WRITES_SECONDS)
+
+_request_writes: ContextVar[Optional[RequestWrites]] = ContextVar("request_writes", default=None)
+
+
+@contextmanager
+def track_request_writes() -> Iterator[RequestWrites]:
+    """
+    Records into the yielded `RequestWrites` whether any session started in the current context,
+    including threadpool dependencies, commits a write.
+    """
+    writes = RequestWrites()
+    token = _request_writes.set(writes)
+    try:
+        yield writes
+    finally:
+        _request_writes.reset(token)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session: Session):
+    writes = _request_writes.get()
+    if session.info.pop("has_writes", False) and writes is not None:
+        writes.committed = True
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session: Session):
+    session.info.pop("has_writes", None)
@@ -0,0 +1,59 @@
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from src.data.db import SessionLocal
+
+# The session of the request being served, for code that runs within it but is not handed it directly,
+# like the tools of the intent agent
+_request_session: ContextVar[Optional[Session]] = ContextVar("request_session", default=None)
+# The profile the request acts for, which tools take from here rather than from the model's arguments
+_request_profile_id: ContextVar[Optional[uuid.UUID]] = ContextVar("request_profile_id", default=None)
+
+
+@contextmanager
+def bind_request_session(
+    session: Optional[Session], profile_id: Optional[uuid.UUID] = None
+) -> Iterator[None]:
+    """
+    Makes `session` the one `request_session` yields, and `profile_id` the one `request_profile_id`
+    returns, until the block exits.
+    """
+    session_token = _request_session.set(session)
+    profile_token = _request_profile_id.set(profile_id)
+    try:
+        yield
+    finally:
+        _request_profile_id.reset(profile_token)
+        _request_session.reset(session_token)
+
+
+def request_profile_id() -> uuid.UUID:
+    """
+    Returns the id of the profile bound to the request, and raises `RuntimeError` when there is none.
+    """
+    profile_id = _request_profile_id.get()
+    if profile_id is None:
+        raise RuntimeError("No profile is bound to the request")
+    return profile_id
+
+
+@contextmanager
+def request_session() -> Iterator[Session]:
+    """
+    Yields the bound request session, which the request commits along with the rest of its work.
+
+    Outside of a request, a session of its own is opened instead. It is committed when the block
+    succeeds, and closed either way, so that its connection goes back to the pool straight away.
+    """
+    session = _request_session.get()
+    if session is not None:
+        yield session
+        return
+
+    with SessionLocal() as session:
+        yield session
+        session.commit()
@@ -0,0 +1,230 @@
+import datetime as dt
+import random
+import re
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from threading import Lock
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.pool import NullPool
+
+from src.utils.config import settings
+from src.utils.logger import logger
+
+# Plans are captured by running the statement again, which is cut short after this long
+EXPLAIN_TIMEOUT_MS = 10_000
+# Slow statements waiting for their plan. Beyond this, plans are skipped rather than queued.
+MAX_PENDING_EXPLAINS = 8
+
+# Only plain reads are explained, in a read-only transaction that is rolled back. `WITH` may start
+# data-modifying statements, so it is left out along with everything else.
+_EXPLAINABLE = "SELECT"
+# Row locks would be taken again, and held until the plan is captured
+_LOCKING_CLAUSE = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+# Functions that act beyond returning rows, which the read-only transaction does not stop. Slow calls of
+# lock functions are slow because the lock is contended, so running them again would wait as long.
+_SIDE_EFFECTING_FUNCTION = re.compile(
+    r"\b(pg_(try_)?advisory_\w+|pg_sleep\w*|pg_notify|pg_cancel_backend|pg_terminate_backend|set_config"
+    r"|nextval|setval|dblink\w*)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def is_explainable(statement: str) -> bool:
+    """
+    Whether running `statement` again under `EXPLAIN ANALYZE` only reads, without taking locks.
+    """
+    return (
+        statement.lstrip().upper().startswith(_EXPLAINABLE)
+        and not _LOCKING_CLAUSE.search(statement)
+        and not _SIDE_EFFECTING_FUNCTION.search(statement)
+    )
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    # Values that could hold user content are replaced by a description of them
+    parameters: Any
+    duration_ms: float
+    # The route whose request ran the statement, e.g. `GET /focus`, or None outside of requests
+    route: Optional[str]
+    occurred_at: dt.datetime = field(default_factory=lambda: dt.datetime.now(dt.timezone.utc))
+    # Output of `EXPLAIN (ANALYZE, BUFFERS)`, filled in later for sampled statements
+    plan: Optional[str] = None
+
+
+_slow_queries: deque[SlowQuery] = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+_explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+_pending_explains = 0
+_pending_explains_lock = Lock()
+
+_request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+@contextmanager
+def track_route(scope: dict) -> Iterator[None]:
+    """
+    Attributes slow statements executed in the current context to the request of `scope`.
+    """
+    token = _request_scope.set(scope)
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+def current_route() -> Optional[str]:
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+
+    # Set once the request has been routed. Its path template keeps ids out of the route, unless the
+    # template is relative to a router prefix, as with routes of included routers on some versions.
+    route = scope.get("route")
+    path = scope["path"]
+    if route is not None and getattr(route, "path_regex", None) and route.path_regex.match(path):
+        path = route.path
+    return f"{scope['method']} {path}"
+
+
+def _redact(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (dt.date, dt.datetime, dt.time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__} of length {len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Returns the bound parameters of a statement with text, and anything else that could hold user
+    content, replaced by its type and length. Ids, numbers and dates are kept.
+    """
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {name: _redact(value) for name, value in parameters.items()}
+    return [_redact(value) for value in parameters or ()]
+
+
+def get_slow_queries() -> List[dict]:
+    """
+    Returns the most recent slow statements, newest first.
+    """
+    return [asdict(slow_query) for slow_query in reversed(_slow_queries)]
+
+
+def clear_slow_queries():
+    _slow_queries.clear()
+
+
+def _explain(explain_engine: Engine, slow_query: SlowQuery, statement: str, parameters, positional: bool):
+    global _pending_explains
+
+    connection = explain_engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SET TRANSACTION READ ONLY")
+        cursor.execute(f"SET LOCAL statement_timeout = {EXPLAIN_TIMEOUT_MS}")
+        if positional:
+            # Statements of the async engines use `$1` placeholders, which Postgres itself understands
+            cursor.execute(f"PREPARE slow_query AS {statement}")
+            if parameters:
+                arguments = ", ".join(["%s"] * len(parameters))
+                cursor.execute(
+                    f"EXPLAIN (ANALYZE, BUFFERS) EXECUTE slow_query({arguments})", tuple(parameters)
+                )
+            else:
+                cursor.execute("EXPLAIN (ANALYZE, BUFFERS) EXECUTE slow_query")
+        else:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        slow_query.plan = "\n".join(row[0] for row in cursor.fetchall())
+    except Exception as e:
+        slow_query.plan = f"EXPLAIN failed: {e}"
+    finally:
+        connection.rollback()
+        connection.close()
+        with _pending_explains_lock:
+            _pending_explains -= 1
+
+
+def _schedule_explain(
+    explain_engine: Engine, slow_query: SlowQuery, statement: str, parameters, positional: bool
+):
+    global _pending_explains
+
+    with _pending_explains_lock:
+        if _pending_explains >= MAX_PENDING_EXPLAINS:
+            return
+        _pending_explains += 1
+
+    _explain_executor.submit(_explain, explain_engine, slow_query, statement, parameters, positional)
+
+
+def log_slow_queries(engine: Engine, explain_url: str):
+    """
+    Logs the statements of `engine` that take longer than `SLOW_QUERY_THRESHOLD_MS`, and keeps the
+    most recent ones for `/admin/db/slow-queries`. Pass `AsyncEngine.sync_engine` for async engines.
+
+    A sample of slow reads is explained with `EXPLAIN (ANALYZE, BUFFERS)` in the background, over a
+    connection of its own to `explain_url`, a `postgresql://` URL for the database `engine` uses.
+    """
+    explain_engine = create_engine(explain_url, poolclass=NullPool)
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start_time", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["slow_query_start_time"].pop()) * 1000
+        threshold_ms = settings.SLOW_QUERY_THRESHOLD_MS
+        if threshold_ms is None or duration_ms < threshold_ms:
+            return
+
+        slow_query = SlowQuery(
+            statement=statement,
+            parameters=redact_parameters(parameters, executemany),
+            duration_ms=round(duration_ms, 2),
+            route=current_route(),
+        )
+        _slow_queries.append(slow_query)
+        logger.warning(
+            "Slow query",
+            {
+                "statement": statement,
+                "parameters": slow_query.parameters,
+                "duration_ms": slow_query.duration_ms,
+                "route": slow_query.route,
+            },
+        )
+
+        if (
+            not executemany
+            and is_explainable(statement)
+            and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+        ):
+            _schedule_explain(explain_engine, slow_query, statement, parameters, conn.dialect.positional)
+
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("slow_query_start_time"):
+            connection.info["slow_query_start_time"].pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
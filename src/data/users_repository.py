@@ -6,16 +6,19 @@ from uuid import UUID
 
 import jwt
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.data.agenda_repository import get_profile_agenda
 from src.data.chat_repository import get_user_chat_messages
-from src.data.models.focus import get_focus_by_profile_id
 from src.data.models.user import (
     User,
-    create_profile,
-    create_user,
-    get_user_by_user_id,
+    create_profile_async,
+    create_user_async,
+    get_user_by_email_async,
+    get_user_by_user_id_async,
 )
 from src.services.supabase import supabase_client
 from src.utils import security
@@ -30,24 +33,31 @@ class AuthPayload(BaseModel):
     refresh_token: str
 
 
-def get_user_by_token(session: Session, token: str) -> User:
+async def get_user_by_token(session: AsyncSession, token: str, create_missing: bool = True) -> User | None:
+    """
+    Returns the user the token belongs to. Without `create_missing`, a user missing from `session` is
+    returned as None rather than created, which lets read-only sessions look it up first.
+    """
     try:
         if settings.ENVIRONMENT == "test":
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.JWT_ALGORITHM])
             sub = json.loads(payload["sub"])
             email = sub["email"]
-            user = session.query(User).filter(User.email == email).first()
+            user = await get_user_by_email_async(session, email)
         else:
-            response = supabase_client.auth.get_user(token)
+            # The Supabase client is blocking, so keep it off the event loop
+            response = await run_in_threadpool(supabase_client.auth.get_user, token)
             if response is None or response.user is None:
                 raise HTTPException(status_code=403, detail="Invalid authentication credentials")
             user_id = response.user.id
-            user = get_user_by_user_id(session, uuid.UUID(user_id))
+            user = await get_user_by_user_id_async(session, uuid.UUID(user_id))
             # If the user has Supabase auth but not a local user, create a local user and profile
-            if not user and response.user.email is not None:
-                user = create_user(session, user_id=user_id, email=response.user.email)
-                profile = create_profile(session, user_id=user.id, provider="apple")
+            if not user and create_missing and response.user.email is not None:
+                user = await create_user_async(session, user_id=user_id, email=response.user.email)
+                profile = await create_profile_async(session, user_id=user.id, provider="apple")
 
+        if not user and not create_missing:
+            return None
         if not user:
             raise HTTPException(status_code=400, detail="User not found")
         elif not user.is_active:
@@ -74,10 +84,10 @@ def get_user_by_token(session: Session, token: str) -> User:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Unauthorized: {str(e)}")
 
 
-async def refresh_token(db: Session, refresh_token: str) -> AuthPayload:
+async def refresh_token(db: AsyncSession, refresh_token: str) -> AuthPayload:
     payload = TokenService.decode_access_token(refresh_token)
 
-    user = db.query(User).filter(User.id == payload.sub.id).first()
+    user = await get_user_by_user_id_async(db, uuid.UUID(payload.sub.id))
 
     if user is None:
         raise ValueError("User not found")
@@ -97,10 +107,22 @@ class UserContext:
 
 def get_user_context(session: Session, profile_id: UUID) -> UserContext:
     chat_history = get_user_chat_messages(session, profile_id=profile_id)
-    focus_items = get_focus_by_profile_id(profile_id=profile_id, session=session)
+    agenda = get_profile_agenda(session, profile_id).to_model()
     chat_history_contents = [str(message.message) for message in chat_history]
 
-    return UserContext(
-        chat_history=chat_history_contents,
-        focus_items=[f"{str(item.text)} - State: {str(item.state)}" for item in focus_items],
-    )
+    focus_items = [
+        f"{label}: {item.text} - State: {item.state.value}"
+        for label, items in [
+            ("Overdue", agenda.overdue),
+            ("Due today", agenda.due_today),
+            ("Due this week", agenda.due_this_week),
+            ("No due date", agenda.undated),
+        ]
+        for item in items
+    ]
+    if agenda.overdue_count > len(agenda.overdue):
+        focus_items.append(f"{agenda.overdue_count - len(agenda.overdue)} more overdue items")
+    if agenda.undated_count > len(agenda.undated):
+        focus_items.append(f"{agenda.undated_count - len(agenda.undated)} more items without a due date")
+
+    return UserContext(chat_history=chat_history_contents, focus_items=focus_items)
@@ -5,6 +5,8 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from pydantic import BaseModel
 
+from src.data.db import get_pool_stats
+from src.data.slow_queries import clear_slow_queries, get_slow_queries
 from src.services import chroma_service
 from src.services.file_service import get_file_contents
 from src.services.keywords.keywords_service import get_query_keywords
@@ -113,6 +115,22 @@ def get_vector_collection(
     return collection.peek(10)
 
 
+@admin_router.get("/db/pool", dependencies=[Depends(admin_route)])
+def get_database_pool_stats():
+    return get_pool_stats()
+
+
+@admin_router.get("/db/slow-queries", dependencies=[Depends(admin_route)])
+def get_database_slow_queries():
+    return {"threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS, "queries": get_slow_queries()}
+
+
+@admin_router.delete("/db/slow-queries", dependencies=[Depends(admin_route)])
+def clear_database_slow_queries():
+    clear_slow_queries()
+    return True
+
+
 class UserIntentResponse(BaseModel):
     result: dict  # You might want to create a more specific Pydantic model for this
 
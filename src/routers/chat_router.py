@@ -1,17 +1,30 @@
 import logging
-import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from pydantic.main import BaseModel
-from sqlalchemy.orm import Session
 
-from src.data.chat_repository import insert_message
-from src.data.models.chat import Chat, ChatState, Message, MessageOutput, MessageRole
+from src.data.chat_repository import (
+    get_active_chat_async,
+    get_archived_chat_messages_page_async,
+    get_chat_by_id_async,
+    get_chat_messages_page_async,
+    insert_message,
+    insert_message_async,
+)
+from src.data.models.chat import (
+    Chat,
+    ChatState,
+    MessageOutput,
+    MessageRole,
+    messages_to_models,
+    messages_to_models_async,
+)
+from src.data.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageInfo
 from src.services.user_intent.user_intent_service import generate_intent_result, get_user_intent
-from src.utils.context import CurrentProfile, CurrentUser, SessionDep
+from src.utils.context import AsyncSessionDep, CurrentProfile, CurrentUser, ReadSessionDep, SessionDep
 
 chat_router = APIRouter()
 
@@ -22,39 +35,29 @@ class ChatOutput(BaseModel):
     created_at: datetime
 
 
-def get_active_chat(db: Session, profile_id: uuid.UUID) -> Chat | None:
-    return (
-        db.query(Chat)
-        .filter(Chat.profile_id == profile_id)
-        .filter(Chat.state == ChatState.ACTIVE.value)
-        .order_by(Chat.created_at.desc())
-        .first()
-    )
-
-
 class StartChatInput(BaseModel):
     user_message: str
     sherpa_message: str
 
 
 @chat_router.post("/start")
-async def start_chat(db: SessionDep, profile: CurrentProfile, input: StartChatInput) -> ChatOutput:
+async def start_chat(db: AsyncSessionDep, profile: CurrentProfile, input: StartChatInput) -> ChatOutput:
     chat = Chat(
         title="New Chat",
         profile_id=profile.id,
     )
     db.add(chat)
-    db.commit()
+    await db.flush()
 
     # Insert initial messages into the database
-    insert_message(
+    await insert_message_async(
         session=db,
         chat_id=chat.id,
         profile_id=profile.id,
         message=input.user_message,
         role=MessageRole.USER.value,
     )
-    insert_message(
+    await insert_message_async(
         session=db,
         chat_id=chat.id,
         profile_id=profile.id,
@@ -71,11 +74,12 @@ async def start_chat(db: SessionDep, profile: CurrentProfile, input: StartChatIn
 
 @chat_router.get("/active")
 async def get_active_chat_route(
-    db: SessionDep,
+    db: AsyncSessionDep,
+    read_db: ReadSessionDep,
     profile: CurrentProfile,
 ) -> ChatOutput | None:
     try:
-        chat = get_active_chat(db, profile.id)
+        chat = await get_active_chat_async(read_db, profile.id)
 
         if chat is None:
             chat = Chat(
@@ -83,8 +87,7 @@ async def get_active_chat_route(
                 profile_id=profile.id,
             )
             db.add(chat)
-            db.commit()
-            db.flush()
+            await db.flush()
 
         return ChatOutput(
             id=chat.id,
@@ -104,12 +107,13 @@ class EndChatPayload(BaseModel):
 
 
 @chat_router.post("/end")
-async def end_chat(db: SessionDep, user: CurrentUser, input: EndChatPayload) -> ChatOutput | None:
-    chat = db.query(Chat).filter(Chat.id == input.chat_id).first()
+async def end_chat(db: AsyncSessionDep, user: CurrentUser, input: EndChatPayload) -> ChatOutput | None:
+    chat = await get_chat_by_id_async(db, input.chat_id)
     if chat is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
 
     chat.state = ChatState.ENDED.value
+    chat.ended_at = datetime.utcnow()
     db.add(chat)
 
     new_chat = Chat(
@@ -117,7 +121,7 @@ async def end_chat(db: SessionDep, user: CurrentUser, input: EndChatPayload) ->
         profile_id=chat.profile_id,
     )
     db.add(new_chat)
-    db.commit()
+    await db.flush()
 
     return ChatOutput(
         id=new_chat.id,
@@ -126,15 +130,38 @@ async def end_chat(db: SessionDep, user: CurrentUser, input: EndChatPayload) ->
     )
 
 
+class ChatMessagesPage(BaseModel):
+    messages: List[MessageOutput]
+    page: PageInfo
+
+
 @chat_router.get("/{chat_id}")
-async def get_chat(db: SessionDep, user: CurrentUser, chat_id: UUID) -> list[MessageOutput] | None:
-    chat = db.query(Chat).filter(Chat.id == chat_id).first()
+async def get_chat(
+    db: ReadSessionDep,
+    user: CurrentUser,
+    chat_id: UUID,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(default=None, description="Return messages older than this cursor"),
+    after: Optional[str] = Query(default=None, description="Return messages newer than this cursor"),
+) -> ChatMessagesPage:
+    chat = await get_chat_by_id_async(db, chat_id)
     if chat is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat not found")
 
-    messages = db.query(Message).filter(Message.chat_id == chat_id).all()
+    if chat.state == ChatState.ARCHIVED.value:
+        get_messages_page = get_archived_chat_messages_page_async
+    else:
+        get_messages_page = get_chat_messages_page_async
+
+    try:
+        messages, page = await get_messages_page(db, chat_id=chat_id, limit=limit, before=before, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return [message.to_model(session=db) for message in messages]
+    return ChatMessagesPage(
+        messages=await messages_to_models_async(db, messages),
+        page=page,
+    )
 
 
 class ChatMessageInput(BaseModel):
@@ -146,8 +173,9 @@ class SendChatMessageOutput(BaseModel):
     function_calls: List[str]
 
 
+# A plain function, which FastAPI runs in its threadpool, as the agent and the sync session block
 @chat_router.post("/{chat_id}/messages")
-async def send_chat_message(
+def send_chat_message(
     db: SessionDep, profile: CurrentProfile, input: ChatMessageInput, request: Request, chat_id: UUID
 ) -> SendChatMessageOutput:
     # Insert new message into the database
@@ -185,9 +213,6 @@ async def send_chat_message(
     )
 
     return SendChatMessageOutput(
-        messages=[
-            user_message.to_model(session=db),
-            assistant_message.to_model(session=db),
-        ],
+        messages=messages_to_models(db, [user_message, assistant_message]),
         function_calls=function_calls,
     )
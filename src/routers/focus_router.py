@@ -1,85 +1,150 @@
+import uuid
 from datetime import datetime
 from typing import Annotated, Optional
 
 import pytz
-from fastapi import APIRouter, Query, status
+from fastapi import APIRouter, BackgroundTasks, Query, Request, status
 from fastapi.exceptions import HTTPException
 from pydantic import BaseModel, Field, StringConstraints
-from sqlalchemy.orm import Query as SQQuery
 
+from src.data.agenda_repository import (
+    get_profile_agenda_async,
+    is_agenda_current,
+    refresh_profile_agenda_async,
+    update_profile_agenda_async,
+)
+from src.data.focus_repository import delete_focus_item_async, get_focus_items_due_between_async
+from src.data.import_repository import (
+    ImportValidationError,
+    create_import_job_async,
+    embed_imported_focus_items,
+    parse_import_rows,
+    validate_import_rows,
+)
+from src.data.models.agenda import FocusAgenda
 from src.data.models.focus import (
-    Focus,
+    Category,
     FocusItem,
-    complete_focus,
-    get_focus_by_id,
+    complete_focus_async,
+    get_focus_by_id_async,
 )
-from src.utils.context import CurrentProfile, SessionDep
-from src.utils.date_tools import get_end_of_day, get_start_of_day
+from src.data.models.import_job import ImportJob, ImportJobOutput
+from src.data.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.utils.context import AsyncSessionDep, CurrentProfile, ReadSessionDep
+from src.utils.date_tools import to_utc
 from src.utils.logger import logger
 
 focus_router = APIRouter()
 
 
-def add_day_filter(query: SQQuery, timezone: str) -> SQQuery:
-    # Get start and end of today in the client's timezone
-    client_tz = pytz.timezone(timezone)
-    start_of_today = get_start_of_day(client_tz)
-    end_of_today = get_end_of_day(client_tz)
-
-    # Convert to UTC for database query
-    start_of_today_utc = start_of_today.astimezone(pytz.UTC)
-    end_of_today_utc = end_of_today.astimezone(pytz.UTC)
-
-    # Apply due date filter
-    return query.filter(Focus.due_date >= start_of_today_utc).filter(Focus.due_date <= end_of_today_utc)
-
-
 @focus_router.get("")
 async def get_focus_items(
     profile: CurrentProfile,
-    db: SessionDep,
-    category: Optional[str] = None,
+    db: ReadSessionDep,
+    category: Optional[Category] = None,
     timezone: str = Query(default="UTC", description="Timezone to use for date filtering"),
     start_date: Optional[str] = Query(
-        default=get_start_of_day().strftime("%Y-%m-%d %H:%M:%S"),
-        description="Return items after this datetime. Defaults to start of the current day.",
+        default=None,
+        description="Return items due from this datetime, read in `timezone` when it has no offset. "
+        "Defaults to the start of the current day.",
     ),
     end_date: Optional[str] = Query(
-        default=get_end_of_day().strftime("%Y-%m-%d %H:%M:%S"),
-        description="Return items before this datetime. Defaults to end of the current day.",
+        default=None,
+        description="Return items due until this datetime, read in `timezone` when it has no offset. "
+        "Defaults to the end of the current day.",
     ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = Query(default=None, description="Return items preceding this cursor"),
+    after: Optional[str] = Query(default=None, description="Return items following this cursor"),
 ):
-    print("start_date", start_date)
-    print("end_date", end_date)
-    query = db.query(Focus).filter(
-        Focus.profile_id == profile.id,
-        Focus.due_date.between(start_date, end_date),
-    )
+    if timezone not in pytz.all_timezones_set:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown timezone")
+
+    client_tz = pytz.timezone(timezone)
+    try:
+        start = to_utc(datetime.fromisoformat(start_date), client_tz) if start_date else None
+        end = to_utc(datetime.fromisoformat(end_date), client_tz) if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid date range")
+
+    try:
+        # Default windows are computed by Postgres, from its clock and the client's timezone
+        focus_items, page = await get_focus_items_due_between_async(
+            db,
+            profile_id=profile.id,
+            start_date=start,
+            end_date=end,
+            category=category,
+            limit=limit,
+            before=before,
+            after=after,
+            timezone=timezone,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {"items": focus_items, "page": page}
+
+
+@focus_router.get("/agenda")
+async def get_focus_agenda(
+    profile: CurrentProfile,
+    db: AsyncSessionDep,
+    read_db: ReadSessionDep,
+    timezone: str = Query(default="UTC", description="Timezone that decides where today begins and ends"),
+) -> FocusAgenda:
+    if timezone not in pytz.all_timezones_set:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid timezone")
+
+    agenda = await get_profile_agenda_async(read_db, profile.id)
+    # Rebuilt on the first read of a new day or in a different timezone, which keeps it for later writes
+    if not is_agenda_current(agenda, timezone):
+        agenda = await refresh_profile_agenda_async(db, profile.id, timezone)
+
+    return agenda.to_model()
+
+
+@focus_router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_focus_items(
+    request: Request, profile: CurrentProfile, db: AsyncSessionDep, background_tasks: BackgroundTasks
+) -> ImportJobOutput:
+    """
+    Imports focus items sent as CSV (`Content-Type: text/csv`) or as a JSON list. The items are
+    saved before this returns, and added to the vector store in the background. Poll
+    `GET /focus/import/{job_id}` for progress.
+    """
+    try:
+        rows = parse_import_rows(await request.body(), request.headers.get("content-type", ""))
+        items = validate_import_rows(rows)
+    except ImportValidationError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.errors)
 
-    # Apply category filter if provided
-    if category:
-        query = query.filter(Focus.category == category)
+    job, focus_ids = await create_import_job_async(db, profile.id, items)
+    # The background task reads the items from its own session, which only sees them once committed
+    await db.commit()
+    background_tasks.add_task(embed_imported_focus_items, job.id, focus_ids)
 
-    # Apply ordering
-    query = query.order_by(Focus.due_date.asc())
+    return job.to_model()
 
-    # Execute query
-    focus_items = query.all()
-    for item in focus_items:
-        if item.due_date:
-            item.due_date = pytz.utc.localize(item.due_date).astimezone(pytz.timezone(timezone))
 
-    return {"items": focus_items}
+@focus_router.get("/import/{job_id}")
+async def get_import_job(job_id: uuid.UUID, profile: CurrentProfile, db: ReadSessionDep) -> ImportJobOutput:
+    job = await db.get(ImportJob, job_id)
+    if not job or job.profile_id != profile.id:
+        raise HTTPException(status_code=404, detail="Import not found")
+
+    return job.to_model()
 
 
 @focus_router.put("/complete/{task_id}", status_code=status.HTTP_200_OK)
-async def complete_task(db: SessionDep, task_id: int):
-    focus_item = get_focus_by_id(db, task_id)
+async def complete_task(db: AsyncSessionDep, task_id: int):
+    focus_item = await get_focus_by_id_async(db, task_id)
     if not focus_item:
         raise HTTPException(status_code=404, detail="Task not found")
 
     try:
-        focus_item = complete_focus(db, focus_item.id)
+        focus_item = await complete_focus_async(db, focus_item.id)
+        await update_profile_agenda_async(db, focus_item.profile_id, [focus_item.due_date])
         return focus_item.to_json()
     except Exception as e:
         logger.error(f"Error updating task: {e}")
@@ -87,13 +152,12 @@ async def complete_task(db: SessionDep, task_id: int):
 
 
 @focus_router.delete("/{id}")
-async def delete_focus_item_route(id: int, db: SessionDep, profile: CurrentProfile) -> bool:
-    note = db.query(Focus).filter(Focus.id == id).first()
-    if not note:
+async def delete_focus_item_route(id: int, db: AsyncSessionDep, profile: CurrentProfile) -> bool:
+    focus_item = await delete_focus_item_async(db, profile.id, id)
+    if focus_item is None:
         return False
 
-    db.delete(note)
-    db.commit()
+    await update_profile_agenda_async(db, profile.id, [focus_item.due_date])
     return True
 
 
@@ -101,25 +165,30 @@ class FocusUpdateInput(BaseModel):
     id: int
     text: Annotated[str, StringConstraints(min_length=1)]
     due_date: Annotated[Optional[datetime], Field(default=None, description="Due date for the focus item")]
-    category: Annotated[Optional[str], Field(default=None, description="Category for the focus item")]
+    category: Annotated[Optional[Category], Field(default=None, description="Category for the focus item")]
     timezone: Annotated[Optional[str], Field(default=None, description="Timezone for the focus item")]
 
 
 @focus_router.put("/{id}")
 async def update_focus_item_route(
-    id: int, db: SessionDep, profile: CurrentProfile, input: FocusUpdateInput
+    id: int, db: AsyncSessionDep, profile: CurrentProfile, input: FocusUpdateInput
 ) -> FocusItem:
-    focus_item = get_focus_by_id(db, id)
+    focus_item = await get_focus_by_id_async(db, id)
     if not focus_item:
         raise HTTPException(status_code=404, detail="Focus item not found")
 
+    if input.timezone and input.timezone not in pytz.all_timezones_set:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown timezone")
+
+    previous_due_date = focus_item.due_date
     focus_item.text = input.text
     if input.due_date and input.timezone:
-        focus_item.due_date = input.due_date
+        # Due dates without an offset are local to the client
+        focus_item.due_date = to_utc(input.due_date, pytz.timezone(input.timezone))
 
     if input.category:
-        focus_item.category = input.category
+        focus_item.category = input.category.value
 
-    db.commit()
-    db.refresh(focus_item)
+    await db.flush()
+    await update_profile_agenda_async(db, focus_item.profile_id, [previous_due_date, focus_item.due_date])
     return focus_item.to_model()
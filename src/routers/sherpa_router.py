@@ -16,6 +16,8 @@ from src.services.user_intent.user_intent_service import (
 from src.utils.context import CurrentProfile, SessionDep
 from src.utils.logger import logger
 
+# Routes are plain functions, which FastAPI runs in its threadpool, as the intent agent and
+# transcription calls block until the model responds
 sherpa_router = APIRouter()
 
 
@@ -24,7 +26,7 @@ class GenerateTextIntentInput(BaseModel):
 
 
 @sherpa_router.post("/text")
-async def handle_text_input_route(
+def handle_text_input_route(
     session: SessionDep, profile: CurrentProfile, input: GenerateTextIntentInput
 ) -> GeneratedIntentsResponse:
     try:
@@ -48,7 +50,7 @@ class AudioUpload(BaseModel):
 
 
 @sherpa_router.post("/audio/transcribe")
-async def transcribe_audio(audio: AudioUpload, profile: CurrentProfile) -> str:
+def transcribe_audio(audio: AudioUpload, profile: CurrentProfile) -> str:
     try:
         with tempfile.TemporaryDirectory() as temp_dir:
             temp_file_path = os.path.join(temp_dir, "temp_audio.m4a")
@@ -83,7 +85,7 @@ async def transcribe_audio(audio: AudioUpload, profile: CurrentProfile) -> str:
 
 
 @sherpa_router.post("/voice")
-async def handle_audio_upload_route(
+def handle_audio_upload_route(
     session: SessionDep, audio: AudioUpload, profile: CurrentProfile
 ) -> GeneratedIntentsResponse:
     try:
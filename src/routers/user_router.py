@@ -2,10 +2,13 @@ import uuid
 
 from fastapi import APIRouter, status
 from fastapi.exceptions import HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from src.data.models.user import Profile, User, create_profile, create_user
-from src.utils.context import CurrentProfile, SessionDep
+from src.data.db import AsyncSessionLocal, ReplicaAsyncSessionLocal
+from src.data.export_repository import stream_profile_export
+from src.data.models.user import Profile, User, create_profile, create_user, get_profile_by_user_id_async
+from src.utils.context import AsyncSessionDep, CurrentProfile, CurrentUser, ReadSessionDep, SessionDep
 
 user_router = APIRouter()
 
@@ -26,7 +29,11 @@ class ProfileOutput(BaseModel):
 
 
 @user_router.get("/profile")
-async def get_profile(profile: CurrentProfile) -> ProfileOutput:
+async def get_profile(db: ReadSessionDep, user: CurrentUser) -> ProfileOutput:
+    profile = await get_profile_by_user_id_async(db, user.id)
+    if not profile:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+
     return ProfileOutput(
         id=profile.id,
         email=profile.user.email,
@@ -40,15 +47,17 @@ class UpdateProfileInput(BaseModel):
 
 
 @user_router.put("/profile")
-async def update_profile(profile: CurrentProfile, db: SessionDep, input: UpdateProfileInput) -> ProfileOutput:
-    profile = db.query(Profile).filter(Profile.user_id == profile.user.id).first()
+async def update_profile(
+    profile: CurrentProfile, db: AsyncSessionDep, input: UpdateProfileInput
+) -> ProfileOutput:
+    profile = await get_profile_by_user_id_async(db, profile.user.id)
     if not profile:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile does not exist")
 
     if input.full_name:
         setattr(profile, "full_name", input.full_name)
 
-    db.commit()
+    await db.flush()
 
     return ProfileOutput(
         id=profile.id,
@@ -58,6 +67,24 @@ async def update_profile(profile: CurrentProfile, db: SessionDep, input: UpdateP
     )
 
 
+@user_router.get("/export")
+async def export_profile(profile: CurrentProfile) -> StreamingResponse:
+    profile_id = profile.id
+
+    async def stream():
+        # The request's sessions may be closed before the body is sent, so the export opens its own.
+        # It is read-only and long running, which makes it a job for the replica when there is one.
+        async with (ReplicaAsyncSessionLocal or AsyncSessionLocal)() as session:
+            async for chunk in stream_profile_export(session, profile_id):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="export.ndjson"'},
+    )
+
+
 @user_router.post("/create")
 def create_user_and_profile(db: SessionDep, input: CreateUserInput) -> ProfileOutput:
     user = db.query(User).filter(User.email == input.email).first()
@@ -1,4 +1,6 @@
-from fastapi import FastAPI, status
+import time
+
+from fastapi import FastAPI, Request, status
 from fastapi.concurrency import asynccontextmanager
 from fastapi.exceptions import RequestValidationError, ResponseValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,6 +8,9 @@ from fastapi.openapi.utils import get_openapi
 from fastapi.responses import JSONResponse
 
 from src.crons import shutdown_scheduler, start_scheduler
+from src.data.query_stats import format_server_timing, track_queries
+from src.data.replica import read_your_writes, track_request_writes
+from src.data.slow_queries import track_route
 from src.routers.admin_router import admin_router
 from src.routers.chat_router import chat_router
 from src.routers.focus_router import focus_router
@@ -33,6 +38,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    start = time.perf_counter()
+    with track_queries() as stats, track_route(request.scope):
+        response = await call_next(request)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    response.headers["Server-Timing"] = format_server_timing(stats, total_ms)
+    logger.info(
+        "Request completed",
+        {
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "duration_ms": round(total_ms, 2),
+            "db_queries": stats.count,
+            "db_duration_ms": round(stats.duration_ms, 2),
+        },
+    )
+    return response
+
+
+@app.middleware("http")
+async def remember_committed_writes(request: Request, call_next):
+    # Keeps the client's next reads on the primary until the replica has replayed its writes
+    with track_request_writes() as writes:
+        response = await call_next(request)
+
+    if writes.committed:
+        response.set_cookie(**read_your_writes.cookie())
+    return response
+
+
 # Routers
 app.include_router(admin_router, prefix="/admin")
 app.include_router(sherpa_router, prefix="/sherpa")
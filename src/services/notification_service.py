@@ -20,7 +20,9 @@ def send_push_notification(push_token, message):
 
 def notify_due_tasks(db: Session):
     now = datetime.now(timezone.utc)
-    upcoming_tasks = db.query(Focus).filter(Focus.due_date <= now + timedelta(hours=1)).all()
+    upcoming_tasks = (
+        db.query(Focus).filter(Focus.due_date <= now + timedelta(hours=1), Focus.deleted_at.is_(None)).all()
+    )
 
     for task in upcoming_tasks:
         # Assume the task object has a `user.push_token`
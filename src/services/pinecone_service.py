@@ -15,21 +15,20 @@ vector_store = PineconeVectorStore(index=focus_index, embedding=openai_embedding
 
 
 def upsert_focus_to_pinecone():
-    session = SessionLocal()
-    focus_items = session.query(Focus).filter(Focus.in_vector_store.is_(False)).all()
+    with SessionLocal() as session:
+        focus_items = (
+            session.query(Focus).filter(Focus.in_vector_store.is_(False), Focus.deleted_at.is_(None)).all()
+        )
 
-    documents = get_focus_vector_documents(focus_items)
-    data = [{"id": str(focus_item.id), "text": focus_item.text} for focus_item in focus_items]
+        documents = get_focus_vector_documents(focus_items)
+        data = [{"id": str(focus_item.id), "text": focus_item.text} for focus_item in focus_items]
 
-    if len(data) == 0:
-        return
+        if len(data) == 0:
+            return
 
-    vector_store.add_documents(documents=documents, ids=[d["id"] for d in data])
+        vector_store.add_documents(documents=documents, ids=[d["id"] for d in data])
 
-    for focus_item in focus_items:
-        focus_item.in_vector_store = True
+        for focus_item in focus_items:
+            focus_item.in_vector_store = True
 
-    session.add_all(focus_items)
-    session.commit()
-    session.flush()
-    session.close()
+        session.commit()
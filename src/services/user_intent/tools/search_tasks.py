@@ -1,4 +1,3 @@
-import uuid
 from datetime import datetime
 from typing import List, Optional, Tuple
 
@@ -8,6 +7,7 @@ from langchain_core.tools import tool
 
 from src.data.focus_repository import search_focus_items
 from src.data.models.focus import FocusItem, FocusState
+from src.data.session_context import request_profile_id, request_session
 from src.utils.date_tools import get_datetime_from_string
 
 
@@ -15,7 +15,6 @@ from src.utils.date_tools import get_datetime_from_string
 def search_tasks(
     keyword: str,
     search_title: str,
-    profile_id: uuid.UUID,
     due_on: Optional[datetime | None] = None,
     due_after: Optional[datetime | None] = None,
     due_before: Optional[datetime | None] = None,
@@ -27,7 +26,6 @@ def search_tasks(
     Args:
         keyword: The keyword to search for tasks
         search_title: A user-friendly title for the search
-        profile_id: The user's Profile ID
         due_on: The due date in ISO Date Time Format for the task. Example: "2023-01-01T12:00" | None
         due_after: A ISO Date Time Format date used when the users wants to search for tasks after a specific date. Example: "2023-01-01T12:00" | None
         due_before: A ISO Date Time Format date used when the users wants to search for tasks before a specific date. Example: "2023-01-01T12:00" | None
@@ -38,21 +36,23 @@ def search_tasks(
     due_after = get_datetime_from_string(due_after)
     due_before = get_datetime_from_string(due_before)
 
-    focus_items = search_focus_items(
-        keyword=keyword,
-        due_on=due_on,
-        due_after=due_after,
-        due_before=due_before,
-        status=status,
-        profile_id=profile_id,
-    )
-
-    return [focus_item.to_model() for focus_item in focus_items]
+    # Only ever the tasks of the profile making the request, whatever the model asks for
+    profile_id = request_profile_id()
+    with request_session() as session:
+        focus_items = search_focus_items(
+            session,
+            keyword=keyword,
+            due_on=due_on,
+            due_after=due_after,
+            due_before=due_before,
+            status=status,
+            profile_id=profile_id,
+        )
+        return [focus_item.to_model() for focus_item in focus_items]
 
 
 class SearchIntentParameters(pydantic.BaseModel):
     keyword: str
-    profile_id: uuid.UUID
     due_on: Optional[datetime] | None = pydantic.Field(
         None, description="The due date in ISO Date Time Format for the task"
     )
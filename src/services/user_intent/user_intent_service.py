@@ -17,9 +17,9 @@ from sqlalchemy.orm import Session
 from typing_extensions import Dict, TypedDict
 
 from src.data.chat_repository import get_chat_history
-from src.data.db import SessionLocal
-from src.data.focus_repository import create_focus_items
-from src.data.models.focus import FocusItem, FocusItemBase, UserIntentTask
+from src.data.focus_repository import create_focus_items, edit_focus_item
+from src.data.models.focus import FocusItem, FocusItemBase, FocusState, UserIntentTask
+from src.data.session_context import bind_request_session, request_profile_id, request_session
 from src.services.file_service import get_file_contents
 from src.services.openai_service import openai_chat
 from src.services.user_intent.tools.search_tasks import (
@@ -27,6 +27,7 @@ from src.services.user_intent.tools.search_tasks import (
     format_search_tool_calls,
     search_tasks,
 )
+from src.utils.date_tools import parse_due_date
 
 
 class IntentOutput(pydantic.BaseModel):
@@ -36,23 +37,28 @@ class IntentOutput(pydantic.BaseModel):
 
 @tool("task_record")
 def task_record(
-    profile_id: uuid.UUID,
     tasks: List[UserIntentTask],
 ) -> List[FocusItem]:
     """
     This tool is used to keep a record of actions the user has done or has to do in the future.
 
     Args:
-        profile_id (uuid.UUID): The user's Profile ID
         tasks (List[FocusItemBase]): An array of tasks to be added to the list
     """
-    session = SessionLocal()
-    created_items = create_focus_items(focus_items=tasks, session=session, profile_id=profile_id)
-    return [item.to_model() for item in created_items]
+    # Only ever for the profile making the request, whatever the model asks for
+    profile_id = request_profile_id()
+    with request_session() as session:
+        created_items = create_focus_items(focus_items=tasks, session=session, profile_id=profile_id)
+        return [item.to_model() for item in created_items]
 
 
 @tool("edit_task")
-def edit_task(task_query: str, new_task_name: str, new_due_date: str, new_status: str) -> str:
+def edit_task(
+    task_query: str,
+    new_task_name: Optional[str] = None,
+    new_due_date: Optional[str] = None,
+    new_status: Optional[FocusState] = None,
+) -> str:
     """
     Edit an existing task in a task list
 
@@ -60,9 +66,29 @@ def edit_task(task_query: str, new_task_name: str, new_due_date: str, new_status
         task_query (str): The task query to search for the task to be edited
         new_task_name (str): The new name or description of the task
         new_due_date (str): The new due date in ISO Date Time Format for the task
-        new_status (str): The updated status of the task
+        new_status (FocusState): The updated status of the task
     """
-    return "This feature is not yet implemented."
+    values: Dict[str, Any] = {}
+    if new_task_name:
+        values["text"] = new_task_name
+    if new_due_date:
+        try:
+            values["due_date"] = parse_due_date(new_due_date)
+        except ValueError:
+            return f"Invalid due date: {new_due_date}"
+    if new_status:
+        values["state"] = FocusState(new_status).value
+    if not values:
+        return "Nothing to change."
+
+    # Only ever the tasks of the profile making the request, whatever the model asks for
+    profile_id = request_profile_id()
+    with request_session() as session:
+        focus_item = edit_focus_item(session, profile_id=profile_id, task_query=task_query, values=values)
+        if not focus_item:
+            return f"No task matching '{task_query}' was found."
+
+        return f"Task updated: {focus_item.to_model().model_dump_json()}"
 
 
 @tool("chat")
@@ -79,7 +105,6 @@ def start_chat(user_message: str) -> str:
 
 
 class CreateTasksParameters(TypedDict):
-    profile_id: uuid.UUID
     tasks: List[FocusItemBase]
 
 
@@ -103,7 +128,6 @@ def format_create_tool_calls(intermediate_steps) -> CreateIntentsResponse | None
     return CreateIntentsResponse(
         input={
             "tasks": create_task[0].tool_input["tasks"],  # type: ignore
-            "profile_id": create_task[0].tool_input["profile_id"],  # type: ignore
         },
         output=task_record[0][1],
     )
@@ -201,12 +225,14 @@ def get_user_intent(
             elif message.role == "assistant":
                 messages.append(AIMessage(content=message.message))
 
-    result = agent_executor.invoke(
-        {
-            "profile_id": profile_id,
-            "user_input": user_input,
-            "current_date": datetime.now().strftime("%Y-%m-%d"),
-            "messages": messages,
-        }
-    )
+    # Tools write through the request's session, so their changes commit or roll back with the request
+    with bind_request_session(session, profile_id):
+        result = agent_executor.invoke(
+            {
+                "profile_id": profile_id,
+                "user_input": user_input,
+                "current_date": datetime.now().strftime("%Y-%m-%d"),
+                "messages": messages,
+            }
+        )
     return result
@@ -29,6 +29,35 @@ class _Settings(BaseSettings, extra="allow"):
     ENVIRONMENT: Literal["local", "staging", "production", "test"] = "local"
     SENTRY_DSN: HttpUrl | None = None
     DATABASE_URL: str
+    # Connection pool, applied to both the sync and async engines
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    # Optional read replica for read-only routes. A user's reads stay on the primary for this many
+    # seconds after they commit a write, so they always see their own changes.
+    DATABASE_REPLICA_URL: Optional[str] = None
+    DATABASE_REPLICA_READ_YOUR_WRITES_SECONDS: float = 5
+    # Monthly `messages` partitions. Partitions older than the retention period are detached,
+    # and also dropped when MESSAGES_RETENTION_DROP is set. Messages are kept forever by default.
+    MESSAGES_PARTITION_MONTHS_AHEAD: int = 3
+    MESSAGES_RETENTION_MONTHS: Optional[int] = None
+    MESSAGES_RETENTION_DROP: bool = False
+    # Ended chats older than this are moved into `chat_archives`, a batch at a time until none are left
+    CHAT_ARCHIVE_AFTER_DAYS: int = 30
+    CHAT_ARCHIVE_BATCH_SIZE: int = 100
+    # Deleted focus items are kept as tombstones for this long, then purged a batch at a time
+    FOCUS_PURGE_AFTER_HOURS: int = 24
+    FOCUS_PURGE_BATCH_SIZE: int = 500
+    # Focus searches give up on the vector store after this long and use full-text search instead
+    VECTOR_SEARCH_TIMEOUT_SECONDS: float = 2
+    # Statements slower than this are logged and kept for /admin/db/slow-queries, the most recent
+    # SLOW_QUERY_LOG_SIZE of them. This share of the slow reads is run again with EXPLAIN ANALYZE to
+    # capture its plan. Unset the threshold to stop logging.
+    SLOW_QUERY_THRESHOLD_MS: Optional[float] = 500
+    SLOW_QUERY_LOG_SIZE: int = 200
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.1
     JWT_SECRET: str
     SUPABASE_URL: str
     SUPABASE_KEY: str
@@ -2,20 +2,54 @@ from typing import Annotated
 
 from fastapi import HTTPException, Request, status
 from fastapi.params import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.data.db import get_db
-from src.data.models.user import Profile, User
+from src.data.db import ReplicaAsyncSessionLocal, get_async_db, get_db
+from src.data.models.user import Profile, User, get_profile_by_user_id_async
+from src.data.replica import read_your_writes
 from src.data.users_repository import get_user_by_token
 from src.utils.config import settings
 
-SessionDep = Annotated[Session, Depends(get_db)]
+# Function scoped, so the session commits before the response is sent and a failed commit reaches
+# the client as an error
+SessionDep = Annotated[Session, Depends(get_db, scope="function")]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db, scope="function")]
 # TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(db: SessionDep, request: Request) -> User:
+def reads_from_replica(request: Request) -> bool:
+    """
+    Whether the request's reads go to the replica: it must be configured, the request must be a read,
+    and the client must not have committed a write within the read-your-writes window.
+    """
+    return (
+        ReplicaAsyncSessionLocal is not None
+        and request.method in ("GET", "HEAD")
+        and not read_your_writes.wrote_recently(request.cookies.get(read_your_writes.cookie_name))
+    )
+
+
+async def get_read_db(db: AsyncSessionDep, request: Request):
+    """
+    Sends read-only routes, and the user and profile lookups they make, to the replica. The request's
+    primary session is reused when `reads_from_replica` says so.
+    """
+    if not reads_from_replica(request):
+        yield db
+        return
+
+    async with ReplicaAsyncSessionLocal() as replica_db:
+        yield replica_db
+
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db, scope="function")]
+
+
+async def get_current_user(db: AsyncSessionDep, read_db: ReadSessionDep, request: Request) -> User:
     if settings.ENVIRONMENT == "local" and request.query_params.get("dev"):
-        user = db.query(User).first()
+        user = await read_db.scalar(select(User).limit(1))
         if not user:
             raise HTTPException(status_code=400, detail="User not found")
         return user
@@ -30,7 +64,12 @@ def get_current_user(db: SessionDep, request: Request) -> User:
 
     token = authorization.split(" ")[1]
 
-    user = get_user_by_token(db, token)
+    # A user the replica does not have yet is looked up, or created, on the primary
+    user = None
+    if read_db is not db:
+        user = await get_user_by_token(read_db, token, create_missing=False)
+    if not user:
+        user = await get_user_by_token(db, token)
     if not user:
         raise HTTPException(status_code=400, detail="User not found")
 
@@ -46,8 +85,11 @@ def get_current_active_superuser(current_user: CurrentUser) -> User:
     return current_user
 
 
-def get_profile(db: SessionDep, user: CurrentUser) -> Profile:
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+async def get_profile(db: AsyncSessionDep, read_db: ReadSessionDep, user: CurrentUser) -> Profile:
+    profile = await get_profile_by_user_id_async(read_db, user.id)
+    if not profile and read_db is not db:
+        # Created on the primary since the replica last caught up
+        profile = await get_profile_by_user_id_async(db, user.id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     return profile
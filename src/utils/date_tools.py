@@ -61,12 +61,30 @@ def is_date_today(d: datetime):
 
 def get_datetime_from_string(date_string: datetime | str | None) -> Optional[datetime]:
     if isinstance(date_string, datetime):
-        return date_string
+        return to_utc(date_string)
 
     if not date_string or not isinstance(date_string, str):
         return None
 
     try:
-        return datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S")
+        return to_utc(datetime.strptime(date_string, "%Y-%m-%dT%H:%M:%S"))
     except ValueError:
         return None
+
+
+def to_utc(date: datetime, assume_tz: pytz.BaseTzInfo = pytz.UTC) -> datetime:
+    """
+    Converts a datetime to UTC, for `timestamptz` columns like `Focus.due_date`.
+    Naive datetimes are taken to be in `assume_tz`.
+    """
+    if date.tzinfo is None:
+        date = assume_tz.localize(date)
+
+    return date.astimezone(pytz.UTC)
+
+
+def parse_due_date(due_date: Optional[str]) -> Optional[datetime]:
+    """
+    Parses an ISO 8601 due date to UTC. Raises `ValueError` when it is not a valid date.
+    """
+    return to_utc(datetime.fromisoformat(due_date)) if due_date else None
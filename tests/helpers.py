@@ -0,0 +1,63 @@
+import re
+from typing import Dict
+
+from httpx import Response
+from sqlalchemy import Engine, event
+
+from src.data import db
+
+_DB_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def assert_max_queries(response: Response, max_queries: int):
+    """
+    Fails if serving `response` ran more than `max_queries` SQL statements, as reported in its `Server-Timing` header.
+    """
+    match = _DB_TIMING.search(response.headers.get("Server-Timing", ""))
+    assert match, f"Response has no database timing: {response.headers.get('Server-Timing')}"
+
+    count = int(match.group(1))
+    route = f"{response.request.method} {response.request.url.path}"
+    assert count <= max_queries, f"{route} ran {count} queries, expected at most {max_queries}"
+
+
+# Connections checked out of engines whose pool does not count them, like `NullPool`, by pool
+_checked_out: Dict[int, int] = {}
+
+
+def count_checked_out_connections(engine: Engine):
+    """
+    Counts the connections checked out of `engine` for `assert_no_checked_out_connections`, which pools
+    like `NullPool` do not do themselves.
+    """
+    key = id(engine.pool)
+    _checked_out[key] = 0
+
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        _checked_out[key] += 1
+
+    def checkin(dbapi_connection, connection_record):
+        _checked_out[key] -= 1
+
+    event.listen(engine, "checkout", checkout)
+    event.listen(engine, "checkin", checkin)
+
+
+def _checked_out_connections(engine: Engine) -> int:
+    if id(engine.pool) in _checked_out:
+        return _checked_out[id(engine.pool)]
+    return engine.pool.checkedout()  # type: ignore[attr-defined]
+
+
+def assert_no_checked_out_connections(**engines: Engine):
+    """
+    Fails if any of the app's engines, or of `engines`, has a connection checked out, which means a
+    session was left open. Leaked connections only go back to the pool once the garbage collector
+    finds their session.
+    """
+    engines = {"sync": db.engine, "async": db.async_engine.sync_engine, **engines}
+    if db.replica_async_engine is not None:
+        engines["replica"] = db.replica_async_engine.sync_engine
+
+    checked_out = {name: _checked_out_connections(engine) for name, engine in engines.items()}
+    assert not any(checked_out.values()), f"Connections left checked out: {checked_out}"
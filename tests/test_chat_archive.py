@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from src.crons.chat_crons import archive_ended_chats
+from src.data.chat_repository import archive_chat
+from src.data.models.chat import Chat, ChatArchive, ChatState, Message
+from src.data.models.focus import Focus
+from src.utils.config import settings
+
+
+def add_chat(db_session, profile, ended_days_ago: int) -> Chat:
+    chat = Chat(
+        profile_id=profile.id,
+        title="Old Chat",
+        state=ChatState.ENDED.value,
+        ended_at=datetime.utcnow() - timedelta(days=ended_days_ago),
+    )
+    db_session.add(chat)
+    db_session.flush()
+    return chat
+
+
+def test_archived_chat_is_served_from_archive(client, db_session, profile, auth_headers, user):
+    focus_item = Focus(text="Task", profile_id=profile.id)
+    db_session.add(focus_item)
+    old_chat = add_chat(db_session, profile, ended_days_ago=60)
+    recent_chat = add_chat(db_session, profile, ended_days_ago=1)
+    start = datetime(2024, 1, 1)
+    db_session.add_all(
+        Message(
+            chat_id=chat.id,
+            profile_id=profile.id,
+            role="user",
+            message=f"Message {i}",
+            created_at=start + timedelta(minutes=i),
+            focus_ids=[focus_item.id] if i == 4 else None,
+        )
+        for chat in (old_chat, recent_chat)
+        for i in range(5)
+    )
+    db_session.commit()
+    old_chat_id, recent_chat_id = old_chat.id, recent_chat.id
+
+    assert archive_ended_chats() == 1
+
+    db_session.expire_all()
+    assert db_session.get(Chat, old_chat_id).state == ChatState.ARCHIVED.value
+    assert db_session.get(Chat, recent_chat_id).state == ChatState.ENDED.value
+    assert db_session.query(Message).filter(Message.chat_id == old_chat_id).count() == 0
+    assert db_session.get(ChatArchive, old_chat_id).message_count == 5
+
+    response = client.get(f"/chat/{old_chat_id}", params={"limit": 3}, headers=auth_headers)
+    assert response.status_code == 200
+    page = response.json()
+    assert [message["message"] for message in page["messages"]] == ["Message 2", "Message 3", "Message 4"]
+    assert [item["id"] for item in page["messages"][2]["focus_items"]] == [focus_item.id]
+    assert page["page"]["has_more"]
+
+    response = client.get(
+        f"/chat/{old_chat_id}", params={"limit": 3, "before": page["page"]["before"]}, headers=auth_headers
+    )
+    page = response.json()
+    assert [message["message"] for message in page["messages"]] == ["Message 0", "Message 1"]
+    assert not page["page"]["has_more"]
+
+
+def test_every_ended_chat_is_archived_in_batches(db_session, profile, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_ARCHIVE_BATCH_SIZE", 2)
+    chat_ids = [add_chat(db_session, profile, ended_days_ago=60).id for _ in range(5)]
+    db_session.commit()
+
+    assert archive_ended_chats() == 5
+
+    db_session.expire_all()
+    assert {db_session.get(Chat, chat_id).state for chat_id in chat_ids} == {ChatState.ARCHIVED.value}
+
+
+def test_ended_chats_are_archived_oldest_first(db_session, profile, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_ARCHIVE_BATCH_SIZE", 2)
+    chat_ids = [add_chat(db_session, profile, ended_days_ago=days).id for days in (40, 90, 60, 120)]
+    db_session.commit()
+    archived_ids = []
+
+    def record_archive(session, chat):
+        archived_ids.append(chat.id)
+        return archive_chat(session, chat)
+
+    monkeypatch.setattr("src.crons.chat_crons.archive_chat", record_archive)
+    assert archive_ended_chats() == 4
+    assert archived_ids == [chat_ids[3], chat_ids[1], chat_ids[2], chat_ids[0]]
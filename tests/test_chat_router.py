@@ -1,5 +1,12 @@
 import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
 
+from tests.helpers import assert_max_queries
+
+from src.data.models.chat import Message
+from src.data.models.focus import Focus
+from src.main import app
 from src.utils.logger import logger
 
 
@@ -67,3 +74,66 @@ def test_get_active_chat(client, db_session, profile, auth_headers, user, active
 #         response = client.get(endpoint)
 #         assert response.status_code == 401
 #         assert "Unauthorized" in response.json()["detail"]
+
+
+def test_get_chat_query_count(client, db_session, profile, auth_headers, user, active_chat):
+    focus_item = Focus(text="Task", profile_id=profile.id)
+    db_session.add(focus_item)
+    db_session.flush()
+    db_session.add_all(
+        Message(
+            chat_id=active_chat.id,
+            profile_id=profile.id,
+            role="assistant",
+            message=f"Message {i}",
+            focus_ids=[focus_item.id],
+        )
+        for i in range(20)
+    )
+    db_session.commit()
+
+    response = client.get(f"/chat/{active_chat.id}", headers=auth_headers)
+    assert response.status_code == 200
+    # User, chat, message page and focus items
+    assert_max_queries(response, 4)
+
+
+def test_start_chat_commits_once(client, db_session, profile, auth_headers, async_db_engine):
+    commits = []
+
+    def count(conn):
+        commits.append(conn)
+
+    event.listen(async_db_engine.sync_engine, "commit", count)
+    try:
+        response = client.post(
+            "/chat/start",
+            json={"user_message": "Hello", "sherpa_message": "Hi, how can I help?"},
+            headers=auth_headers,
+        )
+    finally:
+        event.remove(async_db_engine.sync_engine, "commit", count)
+
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert db_session.query(Message).filter(Message.chat_id == response.json()["id"]).count() == 2
+
+
+def test_failed_commit_is_not_reported_as_success(client, profile, auth_headers, async_db_engine):
+    def fail(conn):
+        raise RuntimeError("Commit failed")
+
+    # Returns server errors as responses, as a real client would see them
+    app_client = TestClient(app, raise_server_exceptions=False)
+    event.listen(async_db_engine.sync_engine, "commit", fail)
+    try:
+        response = app_client.post(
+            "/chat/start",
+            json={"user_message": "Hello", "sherpa_message": "Hi, how can I help?"},
+            headers=auth_headers,
+        )
+    finally:
+        event.remove(async_db_engine.sync_engine, "commit", fail)
+
+    # The request commits before its response is sent, so the failure reaches the client
+    assert response.status_code == 500
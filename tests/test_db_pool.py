@@ -0,0 +1,97 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.data import db
+from src.data.db import get_pool_stats
+from src.data.pool import CheckoutWaitHistogram, InstrumentedQueuePool
+from src.utils.config import settings
+
+
+def test_checkout_wait_histogram():
+    histogram = CheckoutWaitHistogram(buckets=(1, 10))
+    for wait_ms in (0.5, 1, 4, 50):
+        histogram.observe(wait_ms)
+    histogram.record_timeout()
+
+    assert histogram.snapshot() == {
+        "count": 4,
+        "timeouts": 1,
+        "mean_ms": 13.875,
+        "max_ms": 50,
+        # Each bucket counts the waits up to and including its bound
+        "buckets": {"1": 2, "10": 1, "+Inf": 1},
+    }
+    assert CheckoutWaitHistogram().snapshot()["mean_ms"] == 0.0
+
+
+def test_pool_stats_count_checked_out_connections():
+    before = get_pool_stats()["engines"]["sync"]
+
+    with db.engine.connect():
+        stats = get_pool_stats()
+        engine_stats = stats["engines"]["sync"]
+        assert engine_stats["checked_out"] == before["checked_out"] + 1
+        assert engine_stats["size"] == stats["pool_size"] == settings.DATABASE_POOL_SIZE
+
+        wait = engine_stats["checkout_wait_ms"]
+        assert wait["count"] == before["checkout_wait_ms"]["count"] + 1
+        assert sum(wait["buckets"].values()) == wait["count"]
+        assert list(wait["buckets"])[-1] == "+Inf"
+
+    after = get_pool_stats()["engines"]["sync"]
+    assert after["checked_out"] == before["checked_out"]
+    assert after["checked_in"] >= 1
+
+
+def test_pool_stats_count_overflow_and_timeouts():
+    engine = create_engine(
+        settings.DATABASE_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    try:
+        with engine.connect(), engine.connect():
+            stats = engine.pool.stats()  # type: ignore[attr-defined]
+            assert (stats["checked_out"], stats["overflow"]) == (2, 1)
+
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+
+        wait = engine.pool.stats()["checkout_wait_ms"]  # type: ignore[attr-defined]
+        assert (wait["count"], wait["timeouts"]) == (3, 1)
+        # The timed out checkout waited for the whole pool timeout
+        assert wait["max_ms"] >= 100
+        assert sum(count for bound, count in wait["buckets"].items() if bound in ("250", "500")) == 1
+    finally:
+        engine.dispose()
+
+
+def test_pool_stats_endpoint(client, auth_headers):
+    admin_headers = {"Authorization": f"Bearer {settings.ADMIN_TOKEN}"}
+
+    # Released before the request, which fails on connections left checked out
+    with db.engine.connect():
+        pass
+    response = client.get("/admin/db/pool", headers=admin_headers)
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["pool_size"] == settings.DATABASE_POOL_SIZE
+    assert payload["max_overflow"] == settings.DATABASE_MAX_OVERFLOW
+    assert payload["pool_timeout"] == settings.DATABASE_POOL_TIMEOUT
+    assert {"sync", "async"} <= set(payload["engines"])
+    assert payload["engines"]["sync"]["checked_in"] >= 1
+    assert payload["engines"]["sync"]["checkout_wait_ms"]["count"] >= 1
+    assert set(payload["engines"]["async"]["checkout_wait_ms"]) == {
+        "count",
+        "timeouts",
+        "mean_ms",
+        "max_ms",
+        "buckets",
+    }
+
+    # Neither anonymous callers nor signed in users
+    assert client.get("/admin/db/pool").status_code == 401
+    assert client.get("/admin/db/pool", headers=auth_headers).status_code == 401
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import event
+
+from src.data.focus_repository import edit_focus_item
+from src.data.models.focus import Focus, FocusState
+from src.data.session_context import bind_request_session
+from src.services.user_intent.user_intent_service import edit_task
+
+
+def add_items(db_session, profile) -> list[Focus]:
+    items = [
+        Focus(text="Book the dentist appointment", profile_id=profile.id),
+        Focus(text="Pay the electricity bill", profile_id=profile.id),
+    ]
+    db_session.add_all(items)
+    db_session.commit()
+    return items
+
+
+def test_edit_focus_item_resolves_and_updates_in_one_statement(db_engine, db_session, profile):
+    _, bill = add_items(db_session, profile)
+    profile_id = profile.id
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        # Misspelled, as users often do
+        values = {"state": FocusState.completed.value}
+        focus_item = edit_focus_item(db_session, profile_id, "electricty bill", values)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+
+    assert focus_item.id == bill.id
+    assert focus_item.state == FocusState.completed.value
+    # Followed by the agenda refresh
+    assert statements[0].startswith("UPDATE focus SET")
+
+    assert edit_focus_item(db_session, profile_id, "gym membership", {"text": "Cancel it"}) is None
+
+
+def test_edit_task_tool(db_session, profile):
+    dentist, _ = add_items(db_session, profile)
+    # The profile is the request's, never one the model passes
+    assert "profile_id" not in edit_task.args
+
+    # Outside of a request session, with one of its own
+    with bind_request_session(None, profile.id):
+        result = edit_task.invoke(
+            {
+                "task_query": "dentist",
+                "new_task_name": "Book the dentist for a cleaning",
+                "new_due_date": "2030-03-01T10:00:00+01:00",
+            }
+        )
+        assert result.startswith("Task updated")
+        assert edit_task.invoke({"task_query": "dentist"}) == "Nothing to change."
+
+    db_session.refresh(dentist)
+    assert dentist.text == "Book the dentist for a cleaning"
+    assert dentist.due_date.isoformat() == "2030-03-01T09:00:00+00:00"
+
+    with pytest.raises(RuntimeError):
+        edit_task.invoke({"task_query": "dentist", "new_task_name": "Cancel the dentist"})
+
+
+def test_edit_task_writes_through_the_request_session(db_session, profile):
+    dentist, _ = add_items(db_session, profile)
+
+    with bind_request_session(db_session, profile.id):
+        result = edit_task.invoke({"task_query": "dentist", "new_task_name": "Cancel the dentist"})
+    assert result.startswith("Task updated")
+
+    # Left for the request to commit, so it is undone with the rest of a failed request
+    db_session.rollback()
+    db_session.refresh(dentist)
+    assert dentist.text == "Book the dentist appointment"
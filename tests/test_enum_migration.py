@@ -0,0 +1,88 @@
+import importlib.util
+import uuid
+from pathlib import Path
+
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import insert, text
+
+from src.data.models.chat import Chat, Message
+from src.data.models.focus import Focus
+
+VERSIONS = Path(__file__).parent.parent / "alembic" / "versions"
+ENDED_CHATS_INDEX = "ix_chats_ended_at_ended"
+
+
+def load_revision(revision: str):
+    [path] = VERSIONS.glob(f"*{revision}_*.py")
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_values_outside_the_enums_are_normalised(db_engine, db_session, profile):
+    migration = load_revision("b57e0f161225")
+    profile_id = profile.id
+    # The migration rewrites the tables, so nothing else may hold a lock on them
+    db_session.close()
+
+    chats = {"Active": uuid.uuid4(), "ended": uuid.uuid4(), "paused": uuid.uuid4()}
+    messages = {"User": uuid.uuid4(), "ASSISTANT": uuid.uuid4(), "human": uuid.uuid4()}
+
+    # Postgres runs DDL in transactions, so the test schema is restored by rolling back
+    with db_engine.connect() as connection, connection.begin() as transaction:
+        connection.execute(insert(Focus).values(text="Call mom", profile_id=profile_id))
+        connection.execute(
+            insert(Chat),
+            [{"id": chat_id, "title": "Chat", "profile_id": profile_id} for chat_id in chats.values()],
+        )
+        connection.execute(
+            insert(Message),
+            [
+                {
+                    "id": message_id,
+                    "message": "Hi",
+                    "role": "user",
+                    "chat_id": chats["ended"],
+                    "profile_id": profile_id,
+                }
+                for message_id in messages.values()
+            ],
+        )
+
+        with Operations.context(MigrationContext.configure(connection)):
+            # Added by a later migration, whose downgrade drops it before this one runs
+            connection.execute(text(f"DROP INDEX {ENDED_CHATS_INDEX}"))
+            migration.downgrade()
+            # What the models let through while the columns were strings
+            connection.execute(text("UPDATE focus SET state = 'Done', category = 'Home'"))
+            for state, chat_id in chats.items():
+                connection.execute(
+                    text("UPDATE chats SET state = :state WHERE id = :id"), {"state": state, "id": chat_id}
+                )
+            for role, message_id in messages.items():
+                connection.execute(
+                    text("UPDATE messages SET role = :role WHERE id = :id"), {"role": role, "id": message_id}
+                )
+
+            migration.upgrade()
+            connection.execute(
+                text(f"CREATE INDEX {ENDED_CHATS_INDEX} ON chats (ended_at, id) WHERE state = 'ENDED'")
+            )
+
+        assert connection.execute(text("SELECT state::text, category::text FROM focus")).one() == (
+            "backlog",
+            "home",
+        )
+        chat_states = dict(connection.execute(text("SELECT id, state::text FROM chats")).all())
+        # Matched ignoring case, or else ended rather than made active
+        assert chat_states == {chats["Active"]: "ACTIVE", chats["ended"]: "ENDED", chats["paused"]: "ENDED"}
+        roles = dict(connection.execute(text("SELECT id, role::text FROM messages")).all())
+        assert roles == {
+            messages["User"]: "user",
+            messages["ASSISTANT"]: "assistant",
+            messages["human"]: "user",
+        }
+
+        transaction.rollback()
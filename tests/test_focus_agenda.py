@@ -0,0 +1,164 @@
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from tests.helpers import assert_max_queries
+
+from src.data.agenda_repository import AGENDA_OVERDUE_LIMIT, AGENDA_UNDATED_LIMIT, refresh_profile_agenda
+from src.data.focus_repository import edit_focus_item
+from src.data.models.agenda import ProfileAgenda
+from src.data.models.focus import Focus, FocusState
+from src.data.users_repository import get_user_context
+
+
+def test_agenda_is_kept_up_to_date_by_focus_writes(client, db_session, profile, auth_headers):
+    now = datetime.utcnow()
+    items = {
+        "overdue": Focus(text="Overdue", profile_id=profile.id, due_date=now - timedelta(days=2)),
+        "today": Focus(text="Today", profile_id=profile.id, due_date=now),
+        "week": Focus(text="This week", profile_id=profile.id, due_date=now + timedelta(days=3)),
+        "later": Focus(text="Next month", profile_id=profile.id, due_date=now + timedelta(days=30)),
+        "undated": Focus(text="Someday", profile_id=profile.id),
+        "done": Focus(text="Done", profile_id=profile.id, due_date=now, state=FocusState.completed.value),
+    }
+    db_session.add_all(items.values())
+    db_session.commit()
+
+    # Built on the first read
+    response = client.get("/focus/agenda", headers=auth_headers)
+    assert response.status_code == 200
+    agenda = response.json()
+    assert [item["text"] for item in agenda["due_today"]] == ["Today"]
+    assert [item["text"] for item in agenda["due_this_week"]] == ["This week"]
+    assert [item["text"] for item in agenda["overdue"]] == ["Overdue"]
+    assert agenda["overdue_count"] == 1
+    assert [item["text"] for item in agenda["undated"]] == ["Someday"]
+    assert agenda["undated_count"] == 1
+
+    # Read from the stored row afterwards
+    response = client.get("/focus/agenda", headers=auth_headers)
+    assert_max_queries(response, 3)
+    assert response.json() == agenda
+
+    response = client.put(f"/focus/complete/{items['today'].id}", headers=auth_headers)
+    assert response.status_code == 200
+    response = client.delete(f"/focus/{items['overdue'].id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    agenda = client.get("/focus/agenda", headers=auth_headers).json()
+    assert agenda["due_today"] == []
+    assert agenda["overdue"] == []
+    assert agenda["overdue_count"] == 0
+
+    db_session.expire_all()
+    context = get_user_context(db_session, profile_id=profile.id)
+    assert context.focus_items == [
+        "Due this week: This week - State: backlog",
+        "No due date: Someday - State: backlog",
+    ]
+
+
+def test_agenda_keeps_the_latest_overdue_and_undated_items(db_session, profile):
+    now = datetime.utcnow()
+    db_session.add_all(
+        Focus(text=f"Overdue {n}", profile_id=profile.id, due_date=now - timedelta(days=n + 1))
+        for n in range(AGENDA_OVERDUE_LIMIT + 5)
+    )
+    db_session.add_all(
+        Focus(text=f"Someday {n}", profile_id=profile.id, created_at=now - timedelta(minutes=n))
+        for n in range(AGENDA_UNDATED_LIMIT + 3)
+    )
+    db_session.commit()
+
+    agenda = refresh_profile_agenda(db_session, profile.id).to_model()
+    assert [item.text for item in agenda.overdue] == [f"Overdue {n}" for n in range(AGENDA_OVERDUE_LIMIT)]
+    assert agenda.overdue_count == AGENDA_OVERDUE_LIMIT + 5
+    assert [item.text for item in agenda.undated] == [f"Someday {n}" for n in range(AGENDA_UNDATED_LIMIT)]
+    assert agenda.undated_count == AGENDA_UNDATED_LIMIT + 3
+
+    context = get_user_context(db_session, profile_id=profile.id)
+    assert context.focus_items[-2:] == ["5 more overdue items", "3 more items without a due date"]
+
+
+def test_agenda_follows_the_requested_timezone(client, db_session, profile, auth_headers):
+    response = client.get("/focus/agenda", params={"timezone": "Pacific/Kiritimati"}, headers=auth_headers)
+    assert response.json()["timezone"] == "Pacific/Kiritimati"
+    assert db_session.get(ProfileAgenda, profile.id).timezone == "Pacific/Kiritimati"
+
+    response = client.get("/focus/agenda", params={"timezone": "Not/AZone"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_agenda_is_only_rebuilt_by_writes_that_can_change_it(db_engine, db_session, profile):
+    later = Focus(text="Next month", profile_id=profile.id, due_date=datetime.utcnow() + timedelta(days=30))
+    db_session.add(later)
+    db_session.commit()
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def edit(values) -> list[str]:
+        statements.clear()
+        event.listen(db_engine, "before_cursor_execute", capture)
+        try:
+            edit_focus_item(db_session, profile.id, "next month", values)
+        finally:
+            event.remove(db_engine, "before_cursor_execute", capture)
+        return [statement for statement in statements if "INTO profile_agendas" in statement]
+
+    # Without an agenda, which is built on the next read
+    assert edit({"text": "Next month's task"}) == []
+    assert db_session.get(ProfileAgenda, profile.id) is None
+
+    refresh_profile_agenda(db_session, profile.id)
+    # Due after the end of the week, before and after
+    assert edit({"due_date": datetime.utcnow() + timedelta(days=40)}) == []
+    # Moved into the week
+    assert len(edit({"due_date": datetime.utcnow() + timedelta(days=2)})) == 1
+    assert [item.text for item in db_session.get(ProfileAgenda, profile.id).to_model().due_this_week] == [
+        "Next month's task"
+    ]
+    # And back out of it
+    assert len(edit({"due_date": datetime.utcnow() + timedelta(days=40)})) == 1
+    assert db_session.get(ProfileAgenda, profile.id).due_this_week == []
+
+
+def test_concurrent_writes_both_end_up_on_the_agenda(db_engine, db_session, profile):
+    refresh_profile_agenda(db_session, profile.id)
+    db_session.commit()
+    now = datetime.utcnow()
+
+    # The first write rebuilds the agenda but has not committed yet
+    db_session.add(Focus(text="From the import", profile_id=profile.id, due_date=now))
+    db_session.flush()
+    refresh_profile_agenda(db_session, profile.id)
+
+    errors = []
+
+    def second_write():
+        try:
+            with Session(bind=db_engine) as session:
+                session.add(Focus(text="From the chat", profile_id=profile.id, due_date=now))
+                session.flush()
+                refresh_profile_agenda(session, profile.id)
+                session.commit()
+        except Exception as error:
+            errors.append(error)
+
+    writer = threading.Thread(target=second_write)
+    writer.start()
+    # Waits for the first write's transaction
+    writer.join(timeout=1)
+    assert writer.is_alive()
+
+    db_session.commit()
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert errors == []
+
+    db_session.expire_all()
+    agenda = db_session.get(ProfileAgenda, profile.id).to_model()
+    assert sorted(item.text for item in agenda.due_today) == ["From the chat", "From the import"]
@@ -0,0 +1,47 @@
+from datetime import datetime, time, timedelta
+
+import pytz
+
+from src.data.models.focus import Focus
+
+
+def test_default_window_is_the_clients_day(client, db_session, profile, auth_headers):
+    tokyo = pytz.timezone("Asia/Tokyo")
+    today = datetime.now(tokyo).date()
+
+    def at(day, hour: int) -> datetime:
+        return tokyo.localize(datetime.combine(day, time(hour)))
+
+    db_session.add_all(
+        [
+            Focus(text="Late yesterday", profile_id=profile.id, due_date=at(today - timedelta(days=1), 23)),
+            Focus(text="Early today", profile_id=profile.id, due_date=at(today, 0)),
+            Focus(text="Late today", profile_id=profile.id, due_date=at(today, 23)),
+            Focus(text="Tomorrow", profile_id=profile.id, due_date=at(today + timedelta(days=1), 0)),
+        ]
+    )
+    db_session.commit()
+
+    response = client.get("/focus", params={"timezone": "Asia/Tokyo"}, headers=auth_headers)
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["text"] for item in items] == ["Early today", "Late today"]
+    assert datetime.fromisoformat(items[0]["due_date"]) == at(today, 0)
+
+
+def test_dates_without_an_offset_are_local_to_the_client(client, db_session, profile, auth_headers):
+    due_date = datetime(2030, 1, 1, 17, tzinfo=pytz.UTC)
+    db_session.add(Focus(text="Standup", profile_id=profile.id, due_date=due_date))
+    db_session.commit()
+
+    def texts(timezone: str) -> list[str]:
+        params = {"start_date": "2030-01-01T08:00:00", "end_date": "2030-01-01T10:00:00"}
+        response = client.get("/focus", params={**params, "timezone": timezone}, headers=auth_headers)
+        return [item["text"] for item in response.json()["items"]]
+
+    # 17:00 UTC is 09:00 in Los Angeles
+    assert texts("America/Los_Angeles") == ["Standup"]
+    assert texts("UTC") == []
+
+    response = client.get("/focus", params={"timezone": "Mars/Olympus_Mons"}, headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+import tests.mocks.mock_chroma_service
+
+from src.crons.import_crons import resume_imports
+from src.data.models.focus import Focus
+
+
+def import_items(client, headers, **kwargs):
+    vector_store = tests.mocks.mock_chroma_service.vector_store
+    vector_store.reset_mock()
+    vector_store.add_documents.side_effect = lambda documents, ids: ids
+    with (
+        patch("src.data.focus_repository.chroma_service", tests.mocks.mock_chroma_service),
+        patch("src.data.import_repository.IMPORT_EMBED_BATCH_SIZE", 2),
+    ):
+        response = client.post("/focus/import", headers=headers, **kwargs)
+
+    vector_store.add_documents.side_effect = None
+    return response, vector_store
+
+
+def test_import_csv(client, db_session, profile, auth_headers):
+    body = (
+        "text,category,due_date\n"
+        "Buy milk,shopping,2030-01-01T09:00:00+02:00\n"
+        "Call mom,,\n"
+        "File taxes,finance,\n"
+    )
+    response, vector_store = import_items(client, {**auth_headers, "Content-Type": "text/csv"}, content=body)
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+
+    items = db_session.query(Focus).filter(Focus.profile_id == profile.id).order_by(Focus.id).all()
+    assert [(item.text, item.category) for item in items] == [
+        ("Buy milk", "shopping"),
+        ("Call mom", "general"),
+        ("File taxes", "finance"),
+    ]
+    assert items[0].due_date.isoformat() == "2030-01-01T07:00:00+00:00"
+    assert all(item.in_vector_store for item in items)
+    # Embedded in batches of two
+    assert [len(call.kwargs["ids"]) for call in vector_store.add_documents.call_args_list] == [2, 1]
+
+    response = client.get(f"/focus/import/{job_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["state"] == "completed"
+    assert response.json()["total"] == response.json()["embedded"] == 3
+
+
+def test_import_rejects_invalid_rows(client, db_session, profile, auth_headers):
+    response, vector_store = import_items(
+        client,
+        auth_headers,
+        json={
+            "items": [
+                {"text": "Fine"},
+                {"priority": 2},
+                {"text": "Bad date", "due_date": "soon"},
+                {"text": "Bad category", "category": "errands"},
+            ]
+        },
+    )
+    assert response.status_code == 422
+    assert [error["row"] for error in response.json()["detail"]] == [2, 3, 4]
+    assert db_session.query(Focus).count() == 0
+    vector_store.add_documents.assert_not_called()
+
+
+def test_failed_import_is_resumed(client, db_session, profile, auth_headers):
+    vector_store = tests.mocks.mock_chroma_service.vector_store
+    vector_store.reset_mock()
+    # The second batch fails, after the first was embedded
+    vector_store.add_documents.side_effect = [["1", "2"], RuntimeError("Vector store unavailable")]
+    with (
+        patch("src.data.focus_repository.chroma_service", tests.mocks.mock_chroma_service),
+        patch("src.data.import_repository.IMPORT_EMBED_BATCH_SIZE", 2),
+    ):
+        response = client.post(
+            "/focus/import", headers=auth_headers, json=[{"text": f"Task {n}"} for n in range(3)]
+        )
+        job_id = response.json()["id"]
+        assert client.get(f"/focus/import/{job_id}", headers=auth_headers).json()["state"] == "failed"
+        # Created since the import, but not by it, so it is not resumed with it
+        other = Focus(text="Added in the meantime", profile_id=profile.id)
+        db_session.add(other)
+        db_session.commit()
+
+        vector_store.reset_mock()
+        vector_store.add_documents.side_effect = lambda documents, ids: ids
+        assert resume_imports() == 1
+
+    vector_store.add_documents.side_effect = None
+    # Only the item that was left out
+    assert [len(call.kwargs["ids"]) for call in vector_store.add_documents.call_args_list] == [1]
+    job = client.get(f"/focus/import/{job_id}", headers=auth_headers).json()
+    assert job["state"] == "completed"
+    assert job["embedded"] == 3
+    assert job["error"] is None
+    imported = db_session.query(Focus).filter(Focus.import_job_id == job_id).all()
+    assert len(imported) == 3
+    assert all(item.in_vector_store for item in imported)
+    db_session.refresh(other)
+    assert not other.in_vector_store
+    # Nothing left to resume
+    assert resume_imports() == 0
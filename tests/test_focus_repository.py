@@ -0,0 +1,120 @@
+import re
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+import tests.mocks.mock_chroma_service
+
+from src.data.agenda_repository import refresh_profile_agenda
+from src.data.focus_repository import create_focus_items
+from src.data.models.focus import Category, Focus, FocusState, UserIntentTask
+from src.data.session_context import bind_request_session
+from src.services.user_intent.user_intent_service import task_record
+
+
+def make_task(text: str, category: str = "career") -> UserIntentTask:
+    return UserIntentTask(
+        id=text,
+        category=category,
+        priority=3,
+        state=FocusState.backlog,
+        location=None,
+        keywords=[f"{text} keyword"],
+        sentiment="neutral",
+        task_size="small",
+        text=text,
+        type="task",
+    )
+
+
+def test_unknown_task_categories_fall_back_to_general():
+    assert make_task("Plan the trip", "Adventure").category == Category.adventure
+    assert make_task("Water the plants", "gardening").category == Category.general
+
+
+def test_create_focus_items_inserts_in_one_statement(db_engine, db_session, profile):
+    tasks = [make_task(f"Task {i}") for i in range(100)]
+    # Not a task, so it must not be inserted or shift the pairing of later rows with their tasks
+    chat = make_task("Just chatting")
+    chat.type = "chat"
+    tasks.insert(50, chat)
+
+    # Items without a due date are on the agenda, so it is rebuilt
+    refresh_profile_agenda(db_session, profile.id)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    vector_store = tests.mocks.mock_chroma_service.vector_store
+    vector_store.reset_mock()
+    event.listen(db_engine, "before_cursor_execute", capture)
+    try:
+        with patch("src.data.focus_repository.chroma_service", tests.mocks.mock_chroma_service):
+            created_items = create_focus_items(focus_items=tasks, profile_id=profile.id, session=db_session)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", capture)
+
+    assert [item.text for item in created_items] == [f"Task {i}" for i in range(100)]
+    # One INSERT for the items, then the agenda refresh reads the previous agenda, takes the profile's
+    # agenda lock, reads the items due this week, the latest overdue and undated items and how many
+    # there are, and upserts the new one
+    tables = [
+        re.match(r"(\w+) (?:.*?(?:INTO|FROM) )?(\w+)", statement, re.S).groups() for statement in statements
+    ]
+    assert tables == [
+        ("INSERT", "focus"),
+        ("SELECT", "profile_agendas"),
+        ("SELECT", "pg_advisory_xact_lock"),
+        ("SELECT", "focus"),
+        ("SELECT", "focus"),
+        ("SELECT", "focus"),
+        ("SELECT", "focus"),
+        ("INSERT", "profile_agendas"),
+    ]
+
+    # Items only go to the vector store once they are committed
+    vector_store.add_documents.assert_not_called()
+    with patch("src.data.focus_repository.chroma_service", tests.mocks.mock_chroma_service):
+        db_session.commit()
+
+    documents = vector_store.add_documents.call_args.kwargs["documents"]
+    for item, document in zip(created_items, documents):
+        assert document.metadata["id"] == str(item.id)
+        assert document.page_content.endswith(f"{item.text} keyword")
+    assert all(item.in_vector_store for item in created_items)
+
+
+def test_rolled_back_focus_items_never_reach_the_vector_store(db_session, profile):
+    vector_store = tests.mocks.mock_chroma_service.vector_store
+    vector_store.reset_mock()
+
+    with patch("src.data.focus_repository.chroma_service", tests.mocks.mock_chroma_service):
+        created_items = create_focus_items(
+            focus_items=[make_task("Book the venue")], profile_id=profile.id, session=db_session
+        )
+        focus_id = created_items[0].id
+        db_session.rollback()
+        # Nor does a later commit of the same session send them
+        db_session.commit()
+
+    vector_store.add_documents.assert_not_called()
+    assert db_session.get(Focus, focus_id) is None
+
+
+def test_task_record_tool_creates_items_for_the_request_profile(db_session, profile):
+    # The profile is the request's, never one the model passes
+    assert "profile_id" not in task_record.args
+    tasks = [make_task("Renew the passport")]
+
+    with patch("src.data.focus_repository.chroma_service", tests.mocks.mock_chroma_service):
+        with bind_request_session(db_session, profile.id):
+            created_items = task_record.invoke({"tasks": tasks, "profile_id": str(uuid.uuid4())})
+
+        with pytest.raises(RuntimeError):
+            task_record.invoke({"tasks": tasks})
+
+    assert [item.text for item in created_items] == ["Renew the passport"]
+    assert db_session.get(Focus, created_items[0].id).profile_id == profile.id
@@ -0,0 +1,125 @@
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.documents import Document
+from sqlalchemy import text
+
+from src.data.focus_repository import is_literal_keyword, search_focus_items
+from src.data.models.focus import Focus
+from src.data.models.user import Profile, User
+from src.data.session_context import bind_request_session
+from src.services.user_intent.tools.search_tasks import search_tasks
+
+
+@pytest.fixture(scope="function")
+def focus_items(db_session, profile):
+    items = [
+        Focus(text="Book the dentist appointment", profile_id=profile.id),
+        Focus(text="Call the dentists about the bill", profile_id=profile.id),
+        Focus(text="Plan the summer holiday", profile_id=profile.id),
+    ]
+    db_session.add_all(items)
+    db_session.commit()
+    return items
+
+
+@pytest.fixture(scope="function")
+def vector_store():
+    vector_store = MagicMock()
+    with patch("src.data.focus_repository.chroma_service.vector_store", vector_store):
+        yield vector_store
+
+
+def search(db_session, profile, keyword: str) -> list[str]:
+    items = search_focus_items(
+        db_session,
+        keyword=keyword,
+        due_on=None,
+        due_after=None,
+        due_before=None,
+        status=None,
+        profile_id=profile.id,
+    )
+    return [item.text for item in items]
+
+
+def test_is_literal_keyword():
+    assert is_literal_keyword("dentist")
+    assert is_literal_keyword("dentist appointment")
+    assert not is_literal_keyword("what do I have to do before my trip next week")
+    assert not is_literal_keyword("")
+
+
+def test_literal_keyword_uses_full_text_search(db_session, profile, focus_items, vector_store):
+    # Stemming matches "dentists" too
+    assert search(db_session, profile, "dentist") == [
+        "Book the dentist appointment",
+        "Call the dentists about the bill",
+    ]
+    vector_store.similarity_search_with_relevance_scores.assert_not_called()
+
+
+def test_literal_keyword_without_matches_uses_vector_store(db_session, profile, focus_items, vector_store):
+    holiday = focus_items[2]
+    vector_store.similarity_search_with_relevance_scores.return_value = [
+        (Document(page_content=holiday.text, metadata=holiday.to_json()), 0.8)
+    ]
+    assert search(db_session, profile, "vacation") == ["Plan the summer holiday"]
+
+
+@pytest.mark.parametrize("slow", [False, True])
+def test_full_text_search_stands_in_for_vector_store(
+    db_session, profile, focus_items, vector_store, slow, monkeypatch
+):
+    def fail(**kwargs):
+        if slow:
+            time.sleep(0.5)
+            return []
+        raise ConnectionError("Vector store is down")
+
+    monkeypatch.setattr("src.data.focus_repository.settings.VECTOR_SEARCH_TIMEOUT_SECONDS", 0.1)
+    vector_store.similarity_search_with_relevance_scores.side_effect = fail
+    # Any of the words will do, best matches first
+    assert search(db_session, profile, "which dentist bills are due?") == [
+        "Call the dentists about the bill",
+        "Book the dentist appointment",
+    ]
+
+
+def test_failed_search_leaves_the_session_usable(db_session, profile, focus_items, vector_store, monkeypatch):
+    def failing_search(query, keyword, match_any=False):
+        return query.filter(text("1 / 0 = 1"))
+
+    monkeypatch.setattr("src.data.focus_repository._full_text_search", failing_search)
+    # Written earlier in the same transaction, as a tool would within a request
+    db_session.add(Focus(text="Renew the passport", profile_id=profile.id))
+
+    assert search(db_session, profile, "dentist") == []
+
+    db_session.commit()
+    assert db_session.query(Focus).filter(Focus.text == "Renew the passport").count() == 1
+
+
+def test_search_tasks_tool_searches_the_request_profile(db_session, profile, focus_items, vector_store):
+    other_user = User(id=uuid.uuid4(), email="other@example.com", provider="apple")
+    other_profile = Profile(id=uuid.uuid4(), user_id=other_user.id, provider="apple")
+    db_session.add(other_user)
+    db_session.flush()
+    db_session.add(other_profile)
+    db_session.flush()
+    db_session.add(Focus(text="Pay the dentist", profile_id=other_profile.id))
+    db_session.commit()
+
+    # The profile is the request's, never one the model passes
+    assert "profile_id" not in search_tasks.args
+    with bind_request_session(db_session, profile.id):
+        items = search_tasks.invoke(
+            {"keyword": "dentist", "search_title": "Dentist", "profile_id": str(other_profile.id)}
+        )
+
+    assert [item.text for item in items] == [
+        "Book the dentist appointment",
+        "Call the dentists about the bill",
+    ]
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+from src.crons.focus_crons import purge_deleted_focus
+from src.data.focus_repository import search_focus_items
+from src.data.models.focus import Focus, FocusState
+from src.data.models.user import Profile, User
+
+
+def test_deleted_item_is_tombstoned_and_hidden(client, db_session, profile, auth_headers):
+    now = datetime.utcnow()
+    kept = Focus(text="Water the plants", profile_id=profile.id, due_date=now)
+    deleted = Focus(text="Water the lawn", profile_id=profile.id, due_date=now)
+    db_session.add_all([kept, deleted])
+    db_session.commit()
+
+    response = client.delete(f"/focus/{deleted.id}", headers=auth_headers)
+    assert response.json() is True
+    # Already deleted
+    assert client.delete(f"/focus/{deleted.id}", headers=auth_headers).json() is False
+
+    db_session.refresh(deleted)
+    assert deleted.state == FocusState.deleted.value
+    assert deleted.deleted_at is not None
+
+    response = client.get("/focus", headers=auth_headers)
+    assert [item["text"] for item in response.json()["items"]] == ["Water the plants"]
+    agenda = client.get("/focus/agenda", headers=auth_headers).json()
+    assert [item["text"] for item in agenda["due_today"]] == ["Water the plants"]
+    items = search_focus_items(
+        db_session,
+        keyword="water",
+        due_on=None,
+        due_after=None,
+        due_before=None,
+        status=None,
+        profile_id=profile.id,
+    )
+    assert [item.text for item in items] == ["Water the plants"]
+
+
+def test_cannot_delete_another_profiles_item(client, db_session, profile, auth_headers):
+    other_user = User(id=uuid.uuid4(), email="other@example.com", provider="apple")
+    other_profile = Profile(id=uuid.uuid4(), user=other_user, provider="apple")
+    db_session.add(other_profile)
+    db_session.flush()
+    focus_item = Focus(text="Not yours", profile_id=other_profile.id)
+    db_session.add(focus_item)
+    db_session.commit()
+
+    assert client.delete(f"/focus/{focus_item.id}", headers=auth_headers).json() is False
+    db_session.refresh(focus_item)
+    assert focus_item.deleted_at is None
+
+
+def test_purge_removes_old_tombstones_in_batches(db_session, profile, monkeypatch):
+    now = datetime.utcnow()
+    old = [
+        Focus(
+            text=f"Old {number}",
+            profile_id=profile.id,
+            state=FocusState.deleted.value,
+            deleted_at=now - timedelta(days=2),
+            in_vector_store=number != 0,
+        )
+        for number in range(5)
+    ]
+    recent = Focus(text="Recent", profile_id=profile.id, state=FocusState.deleted.value, deleted_at=now)
+    live = Focus(text="Live", profile_id=profile.id)
+    db_session.add_all([*old, recent, live])
+    db_session.commit()
+
+    monkeypatch.setattr("src.crons.focus_crons.settings.FOCUS_PURGE_BATCH_SIZE", 2)
+    vector_store = MagicMock()
+    with patch("src.data.focus_repository.chroma_service.vector_store", vector_store):
+        assert purge_deleted_focus() == 5
+
+    # Items never embedded have no vector to delete
+    assert [len(call.kwargs["ids"]) for call in vector_store.delete.call_args_list] == [1, 2, 1]
+    db_session.expire_all()
+    assert [item.text for item in db_session.query(Focus).order_by(Focus.id)] == ["Recent", "Live"]
+
+
+def test_purge_keeps_tombstones_when_vector_store_fails(db_session, profile):
+    focus_item = Focus(
+        text="Old",
+        profile_id=profile.id,
+        state=FocusState.deleted.value,
+        deleted_at=datetime.utcnow() - timedelta(days=2),
+        in_vector_store=True,
+    )
+    db_session.add(focus_item)
+    db_session.commit()
+
+    vector_store = MagicMock()
+    vector_store.delete.side_effect = ConnectionError("Vector store is down")
+    with patch("src.data.focus_repository.chroma_service.vector_store", vector_store):
+        assert purge_deleted_focus() == 0
+
+    db_session.expire_all()
+    assert db_session.query(Focus).count() == 1
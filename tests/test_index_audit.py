@@ -0,0 +1,23 @@
+from sqlalchemy import text
+
+from src.data.index_audit import DuplicateIndexes, find_duplicate_indexes, find_unused_indexes
+
+
+def test_schema_has_no_duplicate_indexes(db_engine):
+    with db_engine.connect() as connection:
+        assert find_duplicate_indexes(connection) == []
+
+
+def test_reports_an_index_duplicating_a_primary_key(db_engine):
+    with db_engine.connect() as connection:
+        connection.execute(text("CREATE INDEX ix_users_id_copy ON users (id)"))
+        try:
+            assert find_duplicate_indexes(connection) == [
+                DuplicateIndexes(table_name="users", kept="users_pkey", redundant=["ix_users_id_copy"])
+            ]
+
+            unused = [index.index_name for index in find_unused_indexes(connection)]
+            assert "ix_users_id_copy" in unused
+            assert "users_pkey" not in unused
+        finally:
+            connection.rollback()
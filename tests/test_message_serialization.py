@@ -0,0 +1,42 @@
+from sqlalchemy import event
+
+from src.data.chat_repository import get_chat_history
+from src.data.models.chat import Message, messages_to_models
+from src.data.models.focus import Focus
+
+
+def test_serializing_chat_costs_two_queries(db_engine, db_session, profile, active_chat):
+    focus_items = [Focus(text=f"Task {i}", profile_id=profile.id) for i in range(50)]
+    db_session.add_all(focus_items)
+    db_session.flush()
+
+    db_session.add_all(
+        Message(
+            chat_id=active_chat.id,
+            profile_id=profile.id,
+            role="assistant",
+            message=f"Message {i}",
+            focus_ids=[focus_items[i % 50].id, focus_items[(i + 1) % 50].id] if i % 2 else None,
+        )
+        for i in range(500)
+    )
+    db_session.commit()
+    chat_id = active_chat.id
+    db_session.expunge_all()
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine, "before_cursor_execute", count)
+    try:
+        messages = get_chat_history(db_session, chat_id)
+        outputs = messages_to_models(db_session, messages)
+    finally:
+        event.remove(db_engine, "before_cursor_execute", count)
+
+    assert len(outputs) == 500
+    assert len(statements) == 2, statements
+    for message, output in zip(messages, outputs):
+        assert [item.id for item in output.focus_items] == (message.focus_ids or [])
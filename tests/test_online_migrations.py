@@ -0,0 +1,121 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, text
+
+from src.data.models.chat import Message
+from src.data.models.focus import Focus
+from src.data.online_migrations import backfill, create_index_concurrently, drop_index_concurrently
+
+LIVE = "deleted_at IS NULL"
+
+
+@pytest.fixture(scope="function")
+def autocommit_connection(db_engine):
+    with db_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        yield connection
+
+
+def index_state(connection, name: str) -> tuple[bool, bool] | None:
+    """
+    Returns whether the index `name` is valid and ready, or None when there is no such index.
+    """
+    row = connection.execute(
+        text("SELECT indisvalid, indisready FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).first()
+    return tuple(row) if row else None
+
+
+def test_index_is_built_concurrently_and_rebuilt_when_invalid(autocommit_connection):
+    connection = autocommit_connection
+    try:
+        create_index_concurrently(connection, "ix_focus_priority", "focus", "priority", where=LIVE)
+        assert index_state(connection, "ix_focus_priority") == (True, True)
+        definition = connection.scalar(text("SELECT pg_get_indexdef('ix_focus_priority'::regclass)"))
+        assert definition.endswith("USING btree (priority) WHERE (deleted_at IS NULL)")
+
+        # What an interrupted build leaves behind
+        connection.execute(
+            text("UPDATE pg_index SET indisvalid = false WHERE indexrelid = 'ix_focus_priority'::regclass")
+        )
+        create_index_concurrently(connection, "ix_focus_priority", "focus", "priority", where=LIVE)
+        assert index_state(connection, "ix_focus_priority") == (True, True)
+    finally:
+        drop_index_concurrently(connection, "ix_focus_priority")
+
+    assert index_state(connection, "ix_focus_priority") is None
+    # Already dropped
+    drop_index_concurrently(connection, "ix_focus_priority")
+
+
+def test_partitioned_index_is_built_partition_by_partition(autocommit_connection):
+    connection = autocommit_connection
+    try:
+        create_index_concurrently(connection, "ix_messages_role", "messages", "role")
+        # Already built
+        create_index_concurrently(connection, "ix_messages_role", "messages", "role")
+
+        assert index_state(connection, "ix_messages_role") == (True, True)
+        partitions = connection.scalar(
+            text("SELECT count(*) FROM pg_inherits WHERE inhparent = 'messages'::regclass")
+        )
+        attached = connection.scalars(
+            text(
+                "SELECT inhrelid::regclass::text FROM pg_inherits "
+                "WHERE inhparent = 'ix_messages_role'::regclass"
+            )
+        ).all()
+        assert len(attached) == partitions
+        assert "messages_default_ix_messages_role" in attached
+    finally:
+        drop_index_concurrently(connection, "ix_messages_role")
+
+    assert index_state(connection, "ix_messages_role") is None
+
+
+def test_backfill_updates_in_batches(autocommit_connection, db_session, profile, active_chat):
+    db_session.add_all([Focus(text=f"Task {n}", profile_id=profile.id, priority=4) for n in range(25)])
+    # Spread over the default partition and a monthly one, with random ids
+    db_session.add_all(
+        [
+            Message(
+                chat_id=active_chat.id,
+                profile_id=profile.id,
+                role="user",
+                message=f"message {n}",
+                created_at=datetime(1990, 1, 1) if n % 2 else datetime.utcnow(),
+            )
+            for n in range(7)
+        ]
+    )
+    db_session.commit()
+
+    connection = autocommit_connection
+    updates = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            updates.append(statement)
+
+    event.listen(connection, "before_cursor_execute", capture)
+    updated = backfill(connection, "focus", "priority = 2", where="priority <> 2", batch_size=10, pause=0)
+    event.remove(connection, "before_cursor_execute", capture)
+
+    assert updated == 25
+    # Three batches of up to ten rows, and the empty one that ends the backfill
+    assert len(updates) == 4
+    assert connection.scalar(text("SELECT count(*) FROM focus WHERE priority <> 2")) == 0
+    # Nothing left to do
+    assert backfill(connection, "focus", "priority = 2", where="priority <> 2", pause=0) == 0
+
+    updated = backfill(
+        connection,
+        "messages",
+        "message = upper(message)",
+        where="message <> upper(message)",
+        batch_size=3,
+        pause=0,
+    )
+    assert updated == 7
+    assert connection.scalar(text("SELECT count(*) FROM messages WHERE message <> upper(message)")) == 0
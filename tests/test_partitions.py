@@ -0,0 +1,53 @@
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from src.data.models.chat import Message
+from src.data.partitions import (
+    add_months,
+    create_message_partitions,
+    expire_message_partitions,
+    get_message_partitions,
+)
+
+
+def test_add_months():
+    assert add_months(date(2024, 11, 1), 1) == date(2024, 12, 1)
+    assert add_months(date(2024, 12, 1), 1) == date(2025, 1, 1)
+    assert add_months(date(2025, 1, 1), -13) == date(2023, 12, 1)
+
+
+def test_message_partition_lifecycle(db_engine, db_session, profile, active_chat):
+    with db_engine.begin() as connection:
+        created = create_message_partitions(connection, start=date(2030, 1, 15), months_ahead=2)
+        assert created == ["messages_2030_01", "messages_2030_02", "messages_2030_03"]
+        assert create_message_partitions(connection, start=date(2030, 1, 1), months_ahead=2) == []
+
+    db_session.add(
+        Message(
+            chat_id=active_chat.id,
+            profile_id=profile.id,
+            role="user",
+            message="Hello from the future",
+            created_at=datetime(2030, 2, 10),
+        )
+    )
+    db_session.commit()
+
+    try:
+        with db_engine.begin() as connection:
+            partition = connection.scalar(text("SELECT tableoid::regclass::text FROM messages"))
+            assert partition == "messages_2030_02"
+
+            expired = expire_message_partitions(connection, before=date(2030, 2, 20), drop=True)
+            assert expired == ["messages_2030_01"]
+            assert connection.scalar(text("SELECT to_regclass('messages_2030_01')")) is None
+            assert [name for name, _ in get_message_partitions(connection)] == [
+                "messages_2030_02",
+                "messages_2030_03",
+            ]
+    finally:
+        with db_engine.begin() as connection:
+            connection.execute(
+                text("DROP TABLE IF EXISTS messages_2030_01, messages_2030_02, messages_2030_03")
+            )
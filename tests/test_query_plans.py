@@ -0,0 +1,128 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.data.chat_repository import (
+    get_active_chat_async,
+    get_chat_history_async,
+    get_chat_messages_page_async,
+    get_user_chat_messages_async,
+)
+from src.data.focus_repository import get_focus_items_due_between_async
+from src.data.models.user import get_profile_by_user_id_async
+
+PROFILE_ID = uuid.uuid4()
+NOW = datetime.utcnow()
+
+# Query name -> (query, index it is expected to use)
+HOT_QUERIES = {
+    "get_active_chat": (
+        lambda session: get_active_chat_async(session, PROFILE_ID),
+        "ix_chats_profile_id_created_at_active",
+    ),
+    "get_chat_history": (
+        lambda session: get_chat_history_async(session, uuid.uuid4()),
+        "ix_messages_chat_id_created_at",
+    ),
+    "get_chat_messages_page": (
+        lambda session: get_chat_messages_page_async(session, uuid.uuid4(), limit=50),
+        "ix_messages_chat_id_created_at",
+    ),
+    "get_user_chat_messages": (
+        lambda session: get_user_chat_messages_async(session, PROFILE_ID),
+        "ix_messages_profile_id_created_at",
+    ),
+    "get_profile": (
+        lambda session: get_profile_by_user_id_async(session, uuid.uuid4()),
+        "ix_profiles_user_id",
+    ),
+    "get_focus_items": (
+        lambda session: get_focus_items_due_between_async(
+            session, profile_id=PROFILE_ID, start_date=NOW, end_date=NOW + timedelta(days=1), limit=50
+        ),
+        "ix_focus_profile_id_due_date",
+    ),
+    # The bounds of the client's day are computed by Postgres
+    "get_focus_items_today": (
+        lambda session: get_focus_items_due_between_async(
+            session, profile_id=PROFILE_ID, start_date=None, end_date=None, limit=50, timezone="Asia/Tokyo"
+        ),
+        "ix_focus_profile_id_due_date",
+    ),
+}
+
+
+def explain_query(async_db_engine, run_query, index_name: str) -> tuple[list[str], set[str]]:
+    """
+    Returns the plans of the statements `run_query` runs, and the names `index_name` goes by in them.
+    Indexes on partitioned tables appear in plans under the names of their per-partition indexes.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async def explain():
+        async with async_db_engine.connect() as connection:
+            # Tables are near empty in tests, so force the planner to show whether an index path exists
+            await connection.exec_driver_sql("SET enable_seqscan = off")
+            event.listen(connection.sync_connection, "before_cursor_execute", capture)
+            await run_query(AsyncSession(bind=connection))
+            event.remove(connection.sync_connection, "before_cursor_execute", capture)
+
+            plans = []
+            for statement, parameters in statements:
+                result = await connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                plans.append("\n".join(row[0] for row in result))
+
+            partition_indexes = await connection.scalars(
+                text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                    "WHERE parent.relname = :index_name"
+                ),
+                {"index_name": index_name},
+            )
+            return plans, {index_name, *partition_indexes}
+
+    return asyncio.run(explain())
+
+
+@pytest.fixture(scope="function")
+def focus_rows(db_session, profile):
+    """
+    Gives the planner statistics to go by. On empty tables, indexes sharing a leading column cost
+    about the same, and which one wins is arbitrary.
+    """
+    db_session.execute(
+        text(
+            "INSERT INTO focus (profile_id, text, category, priority, sentiment, state, task_size, type, "
+            "in_vector_store, created_at, updated_at, due_date, deleted_at) "
+            "SELECT :profile_id, 'Task', 'general', 4, 'neutral', "
+            "(ARRAY['backlog', 'active', 'completed']::focusstate[])[n % 3 + 1], 'medium', 'task', false, "
+            "now(), now(), "
+            "now() + n * interval '2 hours', CASE WHEN n % 20 = 0 THEN now() END "
+            "FROM generate_series(1, 5000) AS n"
+        ),
+        {"profile_id": profile.id},
+    )
+    db_session.commit()
+    db_session.execute(text("ANALYZE focus"))
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES.keys())
+def test_hot_query_uses_index(db_session, async_db_engine, focus_rows, name):
+    run_query, index_name = HOT_QUERIES[name]
+    plans, index_names = explain_query(async_db_engine, run_query, index_name)
+
+    assert plans, f"{name} did not run any statements"
+    for plan in plans:
+        assert "Seq Scan" not in plan, f"{name} regressed to a sequential scan:\n{plan}"
+    assert any(
+        candidate in plan for plan in plans for candidate in index_names
+    ), f"{name} no longer uses {index_name}:\n{plans}"
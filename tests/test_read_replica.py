@@ -0,0 +1,96 @@
+import time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.data.db import get_async_database_url
+from src.data.replica import read_your_writes
+from src.utils.config import settings
+
+
+def capture_statements(engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+@pytest.fixture(scope="function")
+def replica_statements(monkeypatch):
+    # The test database stands in for the replica, on an engine of its own so its queries can be told apart
+    replica_engine = create_async_engine(get_async_database_url(settings.DATABASE_URL), poolclass=NullPool)
+    monkeypatch.setattr(
+        "src.utils.context.ReplicaAsyncSessionLocal",
+        async_sessionmaker(bind=replica_engine, expire_on_commit=False),
+    )
+    yield from capture_statements(replica_engine.sync_engine)
+
+
+@pytest.fixture(scope="function")
+def primary_statements(async_db_engine):
+    yield from capture_statements(async_db_engine.sync_engine)
+
+
+def test_reads_go_to_replica(
+    client, db_session, profile, auth_headers, replica_statements, primary_statements
+):
+    response = client.get("/user/profile", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == str(profile.id)
+    # The user lookup and the route's own query
+    assert len(replica_statements) == 2
+    assert primary_statements == []
+
+
+def test_user_and_profile_lookups_go_to_replica(
+    client, db_session, profile, auth_headers, replica_statements, primary_statements
+):
+    response = client.get("/focus", headers=auth_headers)
+    assert response.status_code == 200
+    assert replica_statements
+    assert primary_statements == []
+
+
+def test_reads_follow_own_writes_to_primary(
+    client, db_session, profile, auth_headers, replica_statements, monkeypatch
+):
+    response = client.post(
+        "/chat/start",
+        json={"user_message": "Hello", "sherpa_message": "Hi, how can I help?"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert read_your_writes.cookie_name in response.cookies
+    chat_id = response.json()["id"]
+
+    response = client.get(f"/chat/{chat_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()["messages"]) == 2
+    assert replica_statements == []
+
+    # Once the window has passed, reads go back to the replica
+    monkeypatch.setattr(read_your_writes, "window_seconds", 0)
+    response = client.get(f"/chat/{chat_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert replica_statements
+
+
+def test_own_writes_are_remembered_by_the_client_not_the_process(
+    client, db_session, profile, auth_headers, replica_statements
+):
+    # The cookie of a write served by another worker
+    client.cookies.set(read_your_writes.cookie_name, str(time.time()))
+    response = client.get("/user/profile", headers=auth_headers)
+    assert response.status_code == 200
+    assert replica_statements == []
+
+    client.cookies.clear()
+    response = client.get("/user/profile", headers=auth_headers)
+    assert response.status_code == 200
+    assert replica_statements
@@ -0,0 +1,36 @@
+import threading
+from unittest.mock import patch
+
+
+def test_intent_calls_do_not_block_other_requests(client, profile, auth_headers, active_chat):
+    started, finished = threading.Event(), threading.Event()
+    released = []
+
+    def slow_intent(user_input, profile_id, session):
+        started.set()
+        # Until the other request is served, which never happens while this blocks the event loop
+        released.append(finished.wait(timeout=2))
+        return {"intermediate_steps": [], "output": "Done", "user_input": user_input}
+
+    responses = []
+    # The intent request holds its connections while the other one is served, so leaks are only
+    # checked once both are done
+    client.event_hooks["response"] = []
+    with patch("src.routers.sherpa_router.get_user_intent", slow_intent):
+        intent_request = threading.Thread(
+            target=lambda: responses.append(
+                client.post("/sherpa/text", json={"content": "Plan my week"}, headers=auth_headers)
+            )
+        )
+        intent_request.start()
+        assert started.wait(timeout=5)
+
+        response = client.get("/chat/active", headers=auth_headers)
+        finished.set()
+        intent_request.join()
+
+    # Served while the intent call was still running
+    assert released == [True]
+    assert response.status_code == 200
+    assert responses[0].status_code == 200
+    assert responses[0].json()["output"] == "Done"
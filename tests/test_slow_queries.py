@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from src.data import slow_queries
+from src.data.models.focus import Focus
+from src.data.slow_queries import clear_slow_queries, get_slow_queries, is_explainable, redact_parameters
+from src.utils.config import settings
+
+
+@pytest.fixture(scope="function")
+def log_every_query(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1)
+    monkeypatch.setattr(slow_queries, "MAX_PENDING_EXPLAINS", 1000)
+    clear_slow_queries()
+
+    yield
+
+    # Plans are captured one at a time, so this returns once every pending one is
+    slow_queries._explain_executor.submit(lambda: None).result(timeout=30)
+    clear_slow_queries()
+
+
+def test_redact_parameters():
+    profile_id = uuid.uuid4()
+    parameters = {"profile_id": profile_id, "text": "Call mom", "limit": 5, "due": datetime(2030, 1, 1)}
+    assert redact_parameters(parameters) == {
+        "profile_id": str(profile_id),
+        "text": "<str of length 8>",
+        "limit": 5,
+        "due": "2030-01-01T00:00:00",
+    }
+    assert redact_parameters((["a", 1], None)) == [["<str of length 1>", 1], None]
+    assert redact_parameters([{"text": "a"}, {"text": "b"}], executemany=True) == "<2 parameter sets>"
+
+
+def test_slow_queries_are_logged_with_route_and_plan(
+    client, db_session, profile, auth_headers, log_every_query
+):
+    db_session.add(Focus(text="Call mom", profile_id=profile.id, due_date=datetime.utcnow()))
+    db_session.commit()
+
+    response = client.get("/focus", params={"timezone": "UTC"}, headers=auth_headers)
+    assert response.status_code == 200
+    # Outside of a request, through the sync engine
+    db_session.execute(text("SELECT count(*) FROM focus WHERE text <> :text"), {"text": "Call mom"}).scalar()
+    slow_queries._explain_executor.submit(lambda: None).result(timeout=30)
+
+    admin_headers = {"Authorization": f"Bearer {settings.ADMIN_TOKEN}"}
+    response = client.get("/admin/db/slow-queries", headers=admin_headers)
+    assert response.status_code == 200
+    queries = response.json()["queries"]
+
+    # The async engine, whose statements use numbered placeholders
+    [focus_query] = [
+        query for query in queries if query["route"] == "GET /focus" and "FROM focus" in query["statement"]
+    ]
+    assert str(profile.id) in focus_query["parameters"]
+    assert "Execution Time" in focus_query["plan"]
+    assert "Buffers" in focus_query["plan"]
+
+    # Newest first
+    sync_query = queries[0]
+    assert sync_query["route"] is None
+    assert sync_query["parameters"] == {"text": "<str of length 8>"}
+    assert "Execution Time" in sync_query["plan"]
+
+    assert client.delete("/admin/db/slow-queries", headers=admin_headers).json() is True
+    assert get_slow_queries() == []
+
+
+def test_only_plain_reads_are_explained(db_session, profile, log_every_query):
+    db_session.add(Focus(text="Call mom", profile_id=profile.id))
+    db_session.commit()
+
+    db_session.execute(text("SELECT id FROM focus FOR UPDATE")).all()
+    db_session.execute(
+        text("WITH done AS (UPDATE focus SET text = 'Called mom' RETURNING id) SELECT * FROM done")
+    )
+    db_session.execute(text("SELECT pg_advisory_xact_lock(1)"))
+    db_session.rollback()
+    slow_queries._explain_executor.submit(lambda: None).result(timeout=30)
+
+    plans = {query["statement"]: query["plan"] for query in get_slow_queries()}
+    assert plans["SELECT id FROM focus FOR UPDATE"] is None
+    assert plans["SELECT pg_advisory_xact_lock(1)"] is None
+    [plan] = [plan for statement, plan in plans.items() if statement.startswith("WITH done")]
+    assert plan is None
+    assert db_session.query(Focus).one().text == "Call mom"
+
+
+def test_is_explainable():
+    assert is_explainable("  select id from focus where profile_id = %(profile_id)s")
+    assert not is_explainable("SELECT pg_advisory_xact_lock(hashtextextended(CAST($1 AS TEXT), 1))")
+    assert not is_explainable("SELECT pg_try_advisory_lock(1)")
+    assert not is_explainable("SELECT nextval('focus_id_seq')")
+    assert not is_explainable("WITH ids AS (SELECT id FROM focus) SELECT * FROM ids")
+    assert not is_explainable("UPDATE focus SET text = 'a'")
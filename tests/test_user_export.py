@@ -0,0 +1,85 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from src.data.chat_repository import archive_chat
+from src.data.models.chat import Chat, ChatState, Message
+from src.data.models.focus import Focus
+from src.data.models.memory import Memory
+from src.data.models.note import Note
+from src.data.models.user import Profile, User
+
+
+def add_chat(db_session, profile, title: str, count: int) -> Chat:
+    chat = Chat(profile_id=profile.id, title=title, state=ChatState.ENDED.value)
+    db_session.add(chat)
+    db_session.flush()
+    start = datetime.utcnow() - timedelta(days=1)
+    db_session.add_all(
+        Message(
+            chat_id=chat.id,
+            profile_id=profile.id,
+            role="user",
+            message=f"{title} {i}",
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    )
+    db_session.flush()
+    return chat
+
+
+def test_export_streams_all_profile_data(
+    client, db_session, async_db_engine, profile, auth_headers, monkeypatch
+):
+    monkeypatch.setattr(
+        "src.routers.user_router.AsyncSessionLocal",
+        async_sessionmaker(bind=async_db_engine, expire_on_commit=False),
+    )
+    db_session.add_all(
+        [
+            Focus(text="Task", profile_id=profile.id),
+            Note(content="Note", profile_id=profile.id),
+            Memory(content="Memory", profile_id=profile.id),
+        ]
+    )
+    add_chat(db_session, profile, "Live", 3)
+    archive_chat(db_session, add_chat(db_session, profile, "Archived", 2))
+
+    # Someone else's data must stay out of the export
+    other_user = User(id=uuid.uuid4(), email="other@example.com", provider="apple")
+    other_profile = Profile(id=uuid.uuid4(), user_id=other_user.id, provider="apple")
+    db_session.add_all([other_user, other_profile])
+    db_session.flush()
+    db_session.add(Focus(text="Not mine", profile_id=other_profile.id))
+    add_chat(db_session, other_profile, "Not mine", 1)
+    db_session.commit()
+
+    response = client.get("/user/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [record["type"] for record in records] == [
+        "focus",
+        "chat",
+        "chat",
+        "message",
+        "message",
+        "message",
+        "note",
+        "memory",
+        "message",
+        "message",
+    ]
+    assert records[0]["data"]["text"] == "Task"
+    assert [record["data"]["message"] for record in records if record["type"] == "message"] == [
+        "Live 0",
+        "Live 1",
+        "Live 2",
+        "Archived 0",
+        "Archived 1",
+    ]
+    assert {record["data"]["profile_id"] for record in records} == {str(profile.id)}
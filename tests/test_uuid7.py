@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.data.models.chat import Chat, ChatState
+from src.utils.ids import uuid7, uuid7_datetime
+
+
+def test_uuid7_layout():
+    before = datetime.now(timezone.utc)
+    id = uuid7()
+
+    assert id.version == 7
+    assert id.variant == "specified in RFC 4122"
+    assert before - timedelta(milliseconds=1) <= uuid7_datetime(id) <= datetime.now(timezone.utc)
+
+
+def test_uuid7_is_ordered_within_a_millisecond():
+    ids = [uuid7() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_uuid7_datetime_rejects_other_versions():
+    with pytest.raises(ValueError):
+        uuid7_datetime(uuid.uuid4())
+
+
+def test_chats_get_time_ordered_ids(db_session, profile):
+    chats = [Chat(profile_id=profile.id, title=f"Chat {n}", state=ChatState.ACTIVE.value) for n in range(3)]
+    db_session.add_all(chats)
+    db_session.commit()
+
+    assert all(chat.id.version == 7 for chat in chats)
+    assert [chat.id for chat in chats] == sorted(chat.id for chat in chats)